@@ -0,0 +1,80 @@
+"""Benchmark of the slotted structure classes.
+
+Per object memory and access time of the derived properties of
+:py:class:`fvr.structure.Beam` and :py:class:`fvr.structure.Plate` compared
+to classes with instance dictionaries and uncached properties.
+
+Usage::
+
+  python benchmarks/structure.py
+"""
+import timeit
+import tracemalloc
+import fvr.structure
+
+class Beam:
+  """Reference beam with instance dictionary and uncached properties."""
+
+  def __init__(self, E, I, A, L, rho):
+    self.E = E
+    self.I = I
+    self.A = A
+    self.L = L
+    self.rho = rho
+
+  @property
+  def mu(self):
+    return self.rho * self.A
+
+  @property
+  def m(self):
+    return self.mu * self.L
+
+class Plate:
+  """Reference plate with instance dictionary and uncached properties."""
+
+  def __init__(self, E, nu, ra, h):
+    self.E = E
+    self.nu = nu
+    self.ra = ra
+    self.h = h
+
+  @property
+  def D(self):
+    return self.E * self.h**3 / (12 * (1 - self.nu**2))
+
+  def deflection_clamped(self, q):
+    return q * self.ra**4 / (64 * self.D)
+
+def memory(cls, args, n=100_000) -> float:
+  """Allocated bytes per object."""
+  tracemalloc.start()
+  objects = [cls(*args) for _ in range(n)]
+  size = tracemalloc.get_traced_memory()[0]
+  tracemalloc.stop()
+  del objects
+  return size / n
+
+def access(obj, statement: str, number=1_000_000) -> float:
+  """Time per access in nanoseconds."""
+  return min(timeit.repeat(
+    statement, globals={'obj': obj}, number=number, repeat=5)) / number * 1e9
+
+def main():
+  cases = [
+    ('Beam', Beam, fvr.structure.Beam, (210e9, 1e-8, 1e-4, 1., 7850.),
+      'obj.m'),
+    ('Plate', Plate, fvr.structure.Plate, (210e9, 0.3, 0.1, 2e-3),
+      'obj.deflection_clamped(1e5)'),
+  ]
+  print(f"{'':8}{'bytes/object':>26}{'ns/access':>26}")
+  print(f"{'':8}{'dict':>10}{'slots':>10}{'ratio':>6}"
+    f"{'uncached':>10}{'cached':>10}{'ratio':>6}  property")
+  for name, reference, cls, args, statement in cases:
+    mem = memory(reference, args), memory(cls, args)
+    time = access(reference(*args), statement), access(cls(*args), statement)
+    print(f"{name:8}{mem[0]:10.0f}{mem[1]:10.0f}{mem[0] / mem[1]:6.2f}"
+      f"{time[0]:10.1f}{time[1]:10.1f}{time[0] / time[1]:6.2f}  {statement}")
+
+if __name__ == '__main__':
+  main()
@@ -1,7 +1,15 @@
+import math
+import os
+import xml.sax.saxutils
+import numpy as np
 import ezdxf
+import ezdxf.bbox
+import ezdxf.colors
+import ezdxf.lldxf.validator
 import ezdxf.addons.drawing
 import ezdxf.addons.drawing.svg
 import ezdxf.addons.drawing.properties
+from fvr.geom2d import PolygonSet
 
 # dxfattribs={'color': 1}
 # color
@@ -57,6 +65,7 @@ class doc:
     #self.sd = self._sd*sd*scale/sc
     #self.sd = sc/(self._sd*sd)*scale
     self.dims = []
+    self._rendered = {}  # dimension: state after its last rendering
     self._dimstyle()
 
   def _dimstyle(self):
@@ -81,6 +90,19 @@ class doc:
       #'dimlfac': 100*self._sdc*self.sd,
     }
 
+  @staticmethod
+  def _dxfattribs(
+      color=None, lineweight=None, linetype='CONTINUOUS', layer=None,
+      dxfattribs=None):
+    """Attributes of contour entities, one dict shared by bulk calls."""
+    if dxfattribs is not None:
+      return dxfattribs
+    _dxfattribs={'layer': 'con', 'linetype': linetype}
+    if layer is not None: _dxfattribs.update({'layer': layer})
+    if color is not None: _dxfattribs.update({'color': color})
+    if lineweight is not None: _dxfattribs.update({'lineweight': lineweight})
+    return _dxfattribs
+
   def line(
       self, p1, p2, color=None, lineweight=None, linetype='CONTINUOUS',
       layer=None, dxfattribs=None, shift=(0, 0)):
@@ -93,12 +115,8 @@ class doc:
       linetype: 'DASHED2'
       leyer: e.g. 'con' for contour, 'dim' dimension
     """
-    _dxfattribs={'layer': 'con', 'linetype': linetype}
-    if layer is not None: _dxfattribs.update({'layer': layer})
-    if color is not None: _dxfattribs.update({'color': color})
-    if lineweight is not None: _dxfattribs.update({'lineweight': lineweight})
-    if dxfattribs is not None:
-      _dxfattribs = dxfattribs
+    _dxfattribs = self._dxfattribs(
+      color, lineweight, linetype, layer, dxfattribs)
     p1 = ((p1[0]+shift[0])*self.sc, (p1[1]+shift[1])*self.sc)
     p2 = ((p2[0]+shift[0])*self.sc, (p2[1]+shift[1])*self.sc)
     self.msp.add_line(p1, p2, dxfattribs=_dxfattribs)
@@ -110,12 +128,8 @@ class doc:
     Args:
       pts: [(x1, y1), (x2, y2), ...]
     """
-    _dxfattribs={'layer': 'con', 'linetype': linetype}
-    if layer is not None: _dxfattribs.update({'layer': layer})
-    if color is not None: _dxfattribs.update({'color': color})
-    if lineweight is not None: _dxfattribs.update({'lineweight': lineweight})
-    if dxfattribs is not None:
-      _dxfattribs = dxfattribs
+    _dxfattribs = self._dxfattribs(
+      color, lineweight, linetype, layer, dxfattribs)
     pts = [((x+shift[0])*self.sc, (y+shift[1])*self.sc) for x, y in pts]
     self.msp.add_lwpolyline(pts, close=close, dxfattribs=_dxfattribs)
 
@@ -127,16 +141,72 @@ class doc:
       pt: (x, y)
       radius:
     """
-    _dxfattribs={'layer': 'con', 'linetype': linetype}
-    if layer is not None: _dxfattribs.update({'layer': layer})
-    if color is not None: _dxfattribs.update({'color': color})
-    if lineweight is not None: _dxfattribs.update({'lineweight': lineweight})
-    if dxfattribs is not None:
-      _dxfattribs = dxfattribs
+    _dxfattribs = self._dxfattribs(
+      color, lineweight, linetype, layer, dxfattribs)
     pt = [i*self.sc for i in pt]
     radius *= self.sc
     self.msp.add_circle(pt, radius=radius, dxfattribs=_dxfattribs)
 
+  def lines(
+      self, segments, color=None, lineweight=None, linetype='CONTINUOUS',
+      layer=None, dxfattribs=None, shift=(0, 0)):
+    """Bulk version of :py:meth:`line`.
+
+    Args:
+      segments: array of shape (N, 2, 2), [((x1, y1), (x2, y2)), ...]
+    """
+    _dxfattribs = self._dxfattribs(
+      color, lineweight, linetype, layer, dxfattribs)
+    segments = (np.asarray(segments, dtype=float).reshape(-1, 2, 2) +
+      shift) * self.sc
+    add_line = self.msp.add_line
+    for p1, p2 in segments.tolist():
+      add_line(p1, p2, dxfattribs=_dxfattribs)
+
+  def polylines(
+      self, pts, offsets=None, close=False, color=None, lineweight=None,
+      linetype='CONTINUOUS', layer=None, dxfattribs=None, shift=(0, 0)):
+    """Bulk version of :py:meth:`polyline`.
+
+    Args:
+      pts: all points, array of shape (M, 2), or a
+        :py:class:`fvr.geom2d.PolygonSet` providing points and offsets
+      offsets: start of each polyline in pts and the end, shape (N+1,),
+        None for the offsets of a PolygonSet or one polyline of all points
+      close: close the polylines, e.g. the polygons of a PolygonSet
+    """
+    if isinstance(pts, PolygonSet):
+      if offsets is None:
+        offsets = pts.offsets
+      pts = pts.coords
+    elif offsets is None:
+      offsets = [0, len(pts)]
+    _dxfattribs = self._dxfattribs(
+      color, lineweight, linetype, layer, dxfattribs)
+    pts = ((np.asarray(pts, dtype=float).reshape(-1, 2) + shift) *
+      self.sc).tolist()
+    offsets = np.asarray(offsets).tolist()
+    add_lwpolyline = self.msp.add_lwpolyline
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+      add_lwpolyline(pts[start:stop], close=close, dxfattribs=_dxfattribs)
+
+  def circles(
+      self, circles, color=None, lineweight=None, linetype='CONTINUOUS',
+      layer=None, dxfattribs=None, shift=(0, 0)):
+    """Bulk version of :py:meth:`circle`.
+
+    Args:
+      circles: array of shape (N, 3), [(x, y, radius), ...]
+    """
+    _dxfattribs = self._dxfattribs(
+      color, lineweight, linetype, layer, dxfattribs)
+    circles = np.asarray(circles, dtype=float).reshape(-1, 3)
+    circles = np.column_stack([circles[:, :2] + shift, circles[:, 2]]) * \
+      self.sc
+    add_circle = self.msp.add_circle
+    for x, y, radius in circles.tolist():
+      add_circle((x, y), radius=radius, dxfattribs=_dxfattribs)
+
   def linear_dim(self, base, p1, p2, text, dim_shift=None):
     """
     Args:
@@ -240,11 +310,37 @@ class doc:
       align=ezdxf.enums.TextEntityAlignment.LEFT,
     )
 
+  @staticmethod
+  def _dim_state(dim):
+    """Style overrides and DXF attributes of a dimension."""
+    return (
+      repr(sorted(dim.dimstyle_attribs.items())),
+      repr(sorted(dim.dimension.dxf.all_existing_dxf_attribs().items())))
+
   def render_dims(self):
+    """Render new and changed dimensions.
+
+    Dimensions unchanged since their last rendering keep their geometry
+    block, the block of a changed dimension is replaced. Rendering stays
+    sequential, ezdxf renders in Python into the shared block table.
+
+    Returns:
+      number of rendered dimensions
+    """
     # Necessary second step to create the BLOCK entity with the dimension geometry.
     # Additional processing of the DIMENSION entity could happen between adding
     # the entity and the rendering call.
-    [dim.render() for dim in self.dims]
+    count = 0
+    for dim in self.dims:
+      state = self._rendered.get(dim)
+      if state is not None:
+        if state == self._dim_state(dim):
+          continue
+        self.doc.blocks.delete_block(dim.dimension.dxf.geometry, safe=False)
+      dim.render()
+      self._rendered[dim] = self._dim_state(dim)
+      count += 1
+    return count
 
   def save_dxf(self, filename="output.dxf"):
     self.render_dims()
@@ -273,9 +369,195 @@ class doc:
       page, settings=ezdxf.addons.drawing.layout.Settings(scale=20/1, fit_page=False))
     return svg_string
 
-  def export_svg(self, filename="output.svg"):
-    doc = self.doc
-    svg_string = export_svg_string(doc)
+  def _svg_style(self, background):
+    """CSS classes of the layers and the foreground of ACI 7."""
+    rgba = background.lstrip('#')
+    rgb = ezdxf.colors.RGB.from_hex(rgba[:6])
+    alpha = int(rgba[6:8], 16)/255 if len(rgba) > 6 else 1.
+    white = '#000000' if ezdxf.colors.luminance(rgb) > 0.5 else '#ffffff'
+    def color(aci):
+      if aci in (0, 7):  # 0 as layer color, see layer "con"
+        return white
+      return ezdxf.colors.RGB(*ezdxf.colors.aci2rgb(aci)).to_hex()
+    layers = {}
+    for i, layer in enumerate(self.doc.layers):
+      name = layer.dxf.name
+      cls = name if name.isidentifier() else f"layer{i}"
+      lineweight = layer.dxf.lineweight
+      width = (
+        ezdxf.lldxf.validator.fix_lineweight(lineweight)/100
+        if lineweight >= 0 else 0.25)
+      layers[name.lower()] = (cls, abs(layer.color), width)
+    return rgb.to_hex(), alpha, color, layers
+
+  def _svg_elements(
+      self, entities, transform, scale, color, layers, parent=None):
+    """SVG elements of entities, block references are resolved.
+
+    Args:
+      entities: DXF entities
+      transform: function mapping drawing to page coordinates
+      scale: page mm per drawing unit
+      color: function mapping ACI to a hex color
+      layers: layer name: (CSS class, ACI, stroke width in mm)
+      parent: (layer, ACI) of the block reference, layer "0" and BYBLOCK
+        resolve to it
+
+    Yields:
+      one SVG element string per entity
+    """
+    num = lambda v: f"{v:.3f}".rstrip('0').rstrip('.')
+    pt = lambda p: ' '.join(num(i) for i in transform(p[0], p[1]))
+    for e in entities:
+      layer = e.dxf.layer
+      if parent is not None and layer == '0':
+        layer = parent[0]
+      if layer.lower() == 'defpoints':  # not plotted
+        continue
+      cls, aci_layer, width = layers.get(layer.lower(), layers['0'])
+      aci = e.dxf.get('color', ezdxf.colors.BYLAYER)
+      if aci == ezdxf.colors.BYBLOCK and parent is not None:
+        aci = parent[1]
+      if aci in (ezdxf.colors.BYLAYER, ezdxf.colors.BYBLOCK):
+        aci = aci_layer
+      dxftype = e.dxftype()
+      if dxftype in ('DIMENSION', 'LEADER', 'INSERT'):
+        yield from self._svg_elements(
+          e.virtual_entities(), transform, scale, color, layers, (layer, aci))
+        continue
+      style = []
+      if aci != aci_layer:
+        style.append(f"color: {color(aci)}")
+      lineweight = e.dxf.get('lineweight', -1)  # default BYLAYER
+      if lineweight >= 0:
+        lineweight = ezdxf.lldxf.validator.fix_lineweight(lineweight)/100
+        if lineweight != width:
+          style.append(f"stroke-width: {lineweight}")
+      style = f' style="{"; ".join(style)}"' if style else ''
+      if dxftype == 'LINE':
+        d = f"M {pt(e.dxf.start)} L {pt(e.dxf.end)}"
+      elif dxftype == 'LWPOLYLINE':
+        points = list(e.get_points('xyb'))
+        if e.closed:
+          points.append(points[0])
+        d = f"M {pt(points[0])}"
+        for (x1, y1, b), (x2, y2, _) in zip(points[:-1], points[1:]):
+          if b:
+            # bulge = tan(angle/4), counterclockwise for positive bulge,
+            # clockwise on the page due to the flipped y axis
+            r = math.hypot(x2-x1, y2-y1)*(1 + b*b)/(4*abs(b))*scale
+            d += f" A {num(r)} {num(r)} 0 {int(abs(b) > 1)} {int(b < 0)} {pt((x2, y2))}"
+          else:
+            d += f" L {pt((x2, y2))}"
+        if e.closed:
+          d += " Z"
+      elif dxftype in ('CIRCLE', 'ARC'):
+        c, r = e.dxf.center, e.dxf.radius
+        if dxftype == 'CIRCLE':
+          start, end = 0, 360
+        else:
+          start, end = e.dxf.start_angle, e.dxf.end_angle
+        sweep = (end - start) % 360 or 360
+        rs = num(r*scale)
+        p = lambda a: pt((
+          c[0] + r*math.cos(math.radians(a)), c[1] + r*math.sin(math.radians(a))))
+        d = f"M {p(start)}"
+        if sweep == 360:  # full circle as two half arcs
+          d += f" A {rs} {rs} 0 1 0 {p(start + 180)} A {rs} {rs} 0 1 0 {p(start)} Z"
+        else:
+          d += f" A {rs} {rs} 0 {int(sweep > 180)} 0 {p(start + sweep)}"
+      elif dxftype in ('SOLID', 'TRACE'):
+        # vertex order of a quadrilateral SOLID is 0, 1, 3, 2
+        d = f"M {' L '.join(pt(e.dxf.get(f'vtx{i}')) for i in (0, 1, 3, 2))} Z"
+        yield f'<path d="{d}" class="{cls} fill"{style}/>\n'
+        continue
+      elif dxftype in ('TEXT', 'MTEXT'):
+        if dxftype == 'TEXT':
+          text, height = e.dxf.text, e.dxf.height
+          halign, valign = e.dxf.get('halign', 0), e.dxf.get('valign', 0)
+          insert = e.dxf.insert if halign in (0, 3, 5) and valign == 0 else e.dxf.align_point
+          if halign == 4:  # MIDDLE
+            halign, valign = 1, 2
+          anchor = ('start', 'middle', 'end')[halign] if halign < 3 else 'start'
+          baseline = ('auto', 'text-after-edge', 'central', 'text-before-edge')[valign]
+        else:
+          text, height = e.plain_text(), e.dxf.char_height
+          insert = e.dxf.insert
+          attachment = e.dxf.get('attachment_point', 1) - 1
+          anchor = ('start', 'middle', 'end')[attachment % 3]
+          baseline = ('text-before-edge', 'central', 'text-after-edge')[attachment//3]
+        x, y = pt(insert).split()
+        rotation = e.dxf.get('rotation', 0)
+        rotate = f' transform="rotate({num(-rotation)} {x} {y})"' if rotation else ''
+        # DXF text height is the cap height, about 0.7 em
+        yield (
+          f'<text x="{x}" y="{y}" font-size="{num(height*scale/0.7)}" '
+          f'text-anchor="{anchor}" dominant-baseline="{baseline}"{rotate} '
+          f'class="{cls} fill"{style}>{xml.sax.saxutils.escape(text)}</text>\n')
+        continue
+      else:  # POINT and entity types not created by doc
+        continue
+      yield f'<path d="{d}" class="{cls}"{style}/>\n'
+
+  def write_svg(self, fp, background="#21283000", scale=20, margin=2):
+    """Stream the drawing as SVG, without the ezdxf drawing frontend.
+
+    Supports the entity types created by doc: lines, polylines, circles,
+    arcs, text and the rendered dimension and leader blocks. The layers
+    become CSS classes, e.g. "con" and "dim". Page size, colors and line
+    widths follow :meth:`export_svg_string`, text is written as SVG text
+    instead of glyph outlines.
+
+    Args:
+      fp: filename or file-like object with a write method, e.g.
+        ``socket.makefile('w')``
+      background: background color, transparent "#21283000", default
+        "#212830"
+      scale: page mm per drawing unit
+      margin: page margin in mm
+    """
+    if isinstance(fp, (str, os.PathLike)):
+      with open(fp, "wt", encoding="utf8") as fh:
+        return self.write_svg(fh, background, scale, margin)
+    self.render_dims()
+    bbox = ezdxf.bbox.extents(self.msp)
+    if bbox.has_data:
+      (x0, y0, _), (x1, y1, _) = bbox.extmin, bbox.extmax
+    else:
+      x0 = y0 = x1 = y1 = 0
+    transform = lambda x, y: ((x - x0)*scale + margin, (y1 - y)*scale + margin)
+    width, height = (x1 - x0)*scale + 2*margin, (y1 - y0)*scale + 2*margin
+    rgb, alpha, color, layers = self._svg_style(background)
+    w, h = f"{width:.3f}".rstrip('0').rstrip('.'), f"{height:.3f}".rstrip('0').rstrip('.')
+    fp.write(
+      "<?xml version='1.0' encoding='utf-8'?>\n"
+      f'<svg xmlns="http://www.w3.org/2000/svg" width="{w}mm" height="{h}mm" '
+      f'viewBox="0 0 {w} {h}">\n<defs><style>\n')
+    for cls, aci, lineweight in layers.values():
+      fp.write(
+        f".{cls} {{color: {color(aci)}; stroke: currentColor; "
+        f"stroke-width: {lineweight}; fill: none;}}\n")
+    fp.write(".fill {fill: currentColor; stroke: none;}\n</style></defs>\n")
+    fp.write(
+      f'<rect fill="{rgb}" x="0" y="0" width="{w}" height="{h}" '
+      f'fill-opacity="{alpha:.3f}"/>\n'
+      '<g stroke-linecap="round" stroke-linejoin="round" fill-rule="evenodd">\n')
+    for element in self._svg_elements(
+        self.msp, transform, scale, color, layers):
+      fp.write(element)
+    fp.write("</g>\n</svg>\n")
+
+  def export_svg(self, filename="output.svg", native=False):
+    """Write the drawing as SVG file.
+
+    Args:
+      filename: SVG file
+      native: use :meth:`write_svg` instead of the ezdxf drawing frontend
+    """
+    if native:
+      self.write_svg(filename)
+      return
+    svg_string = self.export_svg_string()
     with open(filename, "wt", encoding="utf8") as fh:
       fh.write(svg_string)
 
@@ -1,5 +1,11 @@
+import io
+import pathlib
 import re
+import warnings
+from collections.abc import Iterable
+from typing import Literal
 import numpy as np
+import numpy.typing as npt
 from fvr.typing import FloatArray
 
 class Vertex(np.ndarray):
@@ -22,8 +28,611 @@ class Vertex(np.ndarray):
     return self[2]
 
 
+class VertexArray:
+  r"""Points in 2d space using homogeneous coordinates, shape ``(n, 3)``.
+
+  Transformations are composed into one pending :math:`3\times3` matrix and
+  applied to all points with a single matmul when the coordinates are read.
+  The points are transformed in place in blocks, so no per step or per point
+  arrays are created.
+
+  Example:
+    >>> va = VertexArray([[1, 0], [2, 0]])
+    >>> va.rotate(np.pi / 2).translate(1, 0).scale(2).xy.round(12)
+    array([[2., 2.],
+           [2., 4.]])
+    >>> va[1].y
+    np.float64(4.0)
+  """
+
+  _block = 4096  # rows transformed per matmul call
+
+  def __init__(self, points: FloatArray):
+    r"""
+    Args:
+      points: List of points, pair of x and y or homogeneous x, y and w:
+        ``[[x1, y1], [x2, y2], ...]``
+    """
+    points = np.asarray(points, dtype=np.float64)
+    points = points.reshape(-1, points.shape[-1] if points.ndim else 2)
+    self._data = np.ones((len(points), 3))
+    self._data[:, :points.shape[1]] = points
+    self._matrix = np.eye(3)  # pending transformation
+    self._op = np.eye(3)  # scratch of a single operation
+    self._scratch = np.empty((min(len(points), self._block), 3))
+    self._pending = False
+
+  def __len__(self) -> int:
+    return len(self._data)
+
+  def __getitem__(self, i: int) -> Vertex:
+    return self.data[i].view(Vertex)
+
+  def __iter__(self):
+    for i in range(len(self)):
+      yield self[i]
+
+  def __array__(self, dtype=None, copy=None):
+    if copy is False:
+      return self.data if dtype is None else self.data.astype(dtype, copy=False)
+    return np.array(self.data, dtype=dtype)
+
+  @property
+  def data(self) -> FloatArray:
+    """Transformed homogeneous coordinates, shape ``(n, 3)``."""
+    if self._pending:
+      mt = self._matrix.T
+      for i in range(0, len(self._data), self._block):
+        block = self._data[i:i + self._block]
+        out = self._scratch[:len(block)]
+        np.matmul(block, mt, out=out)
+        block[...] = out
+      self._matrix[...] = np.eye(3)
+      self._pending = False
+    return self._data
+
+  @property
+  def xy(self) -> FloatArray:
+    """Transformed x and y coordinates, shape ``(n, 2)``."""
+    return self.data[:, :2]
+
+  @property
+  def x(self) -> FloatArray:
+    return self.data[:, 0]
+
+  @property
+  def y(self) -> FloatArray:
+    return self.data[:, 1]
+
+  @property
+  def w(self) -> FloatArray:
+    return self.data[:, 2]
+
+  @property
+  def matrix(self) -> FloatArray:
+    """Pending transformation, not yet applied to the points."""
+    return self._matrix.copy()
+
+  def transform(self, matrix: FloatArray) -> 'VertexArray':
+    r"""Compose a homogeneous transformation after the pending ones.
+
+    Args:
+      matrix: :math:`3\times3` transformation matrix
+    """
+    self._op[...] = matrix
+    np.matmul(self._op, self._matrix, out=self._matrix)
+    self._pending = True
+    return self
+
+  def _affine(
+      self, a, b, c, d, center=(0, 0), dx=0, dy=0) -> 'VertexArray':
+    """Compose the linear map ``[[a, b], [c, d]]`` about ``center`` followed
+    by the translation ``(dx, dy)``."""
+    cx, cy = center
+    op = self._op
+    op[0, 0], op[0, 1], op[0, 2] = a, b, cx - a * cx - b * cy + dx
+    op[1, 0], op[1, 1], op[1, 2] = c, d, cy - c * cx - d * cy + dy
+    op[2, 0], op[2, 1], op[2, 2] = 0, 0, 1
+    np.matmul(op, self._matrix, out=self._matrix)
+    self._pending = True
+    return self
+
+  def translate(self, dx: float = 0, dy: float = 0) -> 'VertexArray':
+    """Move the points by ``(dx, dy)``."""
+    return self._affine(1, 0, 0, 1, dx=dx, dy=dy)
+
+  def rotate(self, angle: float, center=(0, 0)) -> 'VertexArray':
+    """Rotate the points counterclockwise.
+
+    Args:
+      angle: Rotation angle in radian
+      center: (x, y) center of the rotation
+    """
+    c, s = np.cos(angle), np.sin(angle)
+    return self._affine(c, -s, s, c, center)
+
+  def scale(
+      self, sx: float, sy: float | None = None,
+      center=(0, 0)) -> 'VertexArray':
+    """Scale the points.
+
+    Args:
+      sx: Scale factor in x direction
+      sy: Scale factor in y direction, defaults to ``sx``
+      center: (x, y) fixed point of the scaling
+    """
+    return self._affine(sx, 0, 0, sx if sy is None else sy, center)
+
+  def mirror(self, angle: float = 0, center=(0, 0)) -> 'VertexArray':
+    r"""Mirror the points about a line.
+
+    Args:
+      angle: Direction of the mirror line in radian, 0 mirrors about the
+        x axis and :math:`\pi/2` about the y axis
+      center: (x, y) point on the mirror line
+    """
+    c, s = np.cos(2 * angle), np.sin(2 * angle)
+    return self._affine(c, s, s, -c, center)
+
+
+_WKT = re.compile(r'\s*POLYGON\s*\(\s*\((?P<ring>[^()]*)\)\s*\)\s*$', re.I)
+_CHARS = re.compile(r'[\s\d.eE+\-,;\[\]()]*')
+_SEPARATORS = str.maketrans('[](),;', '      ')
+
+def parse_vertices(text: str) -> FloatArray:
+  r"""Parse the corners of one polygon without evaluating the text.
+
+  Accepted formats:
+
+  - nested lists: ``[[x1, y1], [x2, y2], ...]``
+  - WKT: ``POLYGON((x1 y1, x2 y2, ...))``, the closing corner is dropped
+  - whitespace or CSV separated values: ``x1 y1 x2 y2 ...``, ``x1,y1\n...``
+
+  Args:
+    text: Vertex string
+
+  Returns:
+    Corners, array of shape ``(n, 2)``
+
+  Raises:
+    ValueError: Unsupported characters, polygons with holes or an odd number
+      of coordinates.
+
+  Example:
+    >>> parse_vertices('[[0, 0], [0, 1], [1, 1.5e0]]')
+    array([[0. , 0. ],
+           [0. , 1. ],
+           [1. , 1.5]])
+    >>> parse_vertices('POLYGON((0 0, 0 1, 1 1, 0 0))').tolist()
+    [[0.0, 0.0], [0.0, 1.0], [1.0, 1.0]]
+  """
+  wkt = _WKT.match(text)
+  if wkt:
+    text = wkt.group('ring')
+  elif 'POLYGON' in text.upper():
+    raise ValueError("only WKT polygons without holes are supported.")
+  if not _CHARS.fullmatch(text):
+    raise ValueError("vertices contain unsupported characters.")
+  text = text.translate(_SEPARATORS)
+  if not text.strip():  # blank or brackets only
+    return np.zeros((0, 2))
+  with warnings.catch_warnings():
+    # older numpy only warns about trailing unparsable data
+    warnings.simplefilter('error', DeprecationWarning)
+    try:
+      values = np.fromstring(text, sep=' ')
+    except (ValueError, DeprecationWarning) as e:
+      raise ValueError(f"vertices could not be parsed: {e}") from None
+  if len(values) % 2:
+    raise ValueError("odd number of coordinates.")
+  vertices = values.reshape(-1, 2)
+  if wkt and len(vertices) > 1 and np.array_equal(vertices[0], vertices[-1]):
+    vertices = vertices[:-1]
+  return vertices
+
+def parse_polygons(
+    lines: str | Iterable[str],
+    dtype: npt.DTypeLike = np.float64) -> 'PolygonSet':
+  r"""Parse a stream of polygons, one polygon per line.
+
+  Each line is parsed by :py:func:`parse_vertices`, blank lines are skipped.
+  The corners are written into one growing coordinate buffer, so large
+  files are read line by line without building intermediate lists.
+
+  Args:
+    lines: Text or iterable of lines, e.g. an open file
+    dtype: Storage type of the coordinates, see :py:class:`PolygonSet`
+
+  Example:
+    >>> ps = parse_polygons('''POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))
+    ... [[0, 0], [2, 0], [0, 2]]
+    ...
+    ... 0,0,3,0,0,1''')
+    >>> ps.areas
+    array([1. , 2. , 1.5])
+  """
+  if isinstance(lines, str):
+    lines = io.StringIO(lines)
+  coords = np.empty((1024, 2), dtype=dtype)
+  offsets = [0]
+  size = 0
+  for line in lines:
+    if not line.strip():
+      continue
+    vertices = parse_vertices(line)
+    if size + len(vertices) > len(coords):
+      grown = np.empty((max(2 * len(coords), size + len(vertices)), 2),
+        dtype=dtype)
+      grown[:size] = coords[:size]
+      coords = grown
+    coords[size:size + len(vertices)] = vertices
+    size += len(vertices)
+    offsets.append(size)
+  coords.resize((size, 2), refcheck=False)
+  return PolygonSet(coords, offsets, dtype=dtype)
+
+def _green(x0, y0, x1, y1) -> FloatArray:
+  r"""Edge integrals of Green's theorem for the section properties.
+
+  Args:
+    x0, y0: Start points of the edges
+    x1, y1: End points of the edges
+
+  Returns:
+    Array of shape ``(6, n)`` with the contributions of each edge to
+    :math:`A`, :math:`\int x\,\mathrm{d}A`, :math:`\int y\,\mathrm{d}A`,
+    :math:`\int y^2\,\mathrm{d}A`, :math:`\int x^2\,\mathrm{d}A` and
+    :math:`\int xy\,\mathrm{d}A`, positive for counterclockwise polygons.
+  """
+  c = x0 * y1 - x1 * y0
+  return np.stack([
+    c / 2,
+    (x0 + x1) * c / 6,
+    (y0 + y1) * c / 6,
+    (y0 * y0 + y0 * y1 + y1 * y1) * c / 12,
+    (x0 * x0 + x0 * x1 + x1 * x1) * c / 12,
+    (x0 * y1 + 2 * x0 * y0 + 2 * x1 * y1 + x1 * y0) * c / 24])
+
+def _section(sums: FloatArray, origin: FloatArray, mean: FloatArray) -> dict:
+  r"""Section properties from the summed edge integrals of :py:func:`_green`.
+
+  Args:
+    sums: Summed edge integrals, shape ``(6, ...)``, relative to ``origin``
+    origin: Origin of the local coordinates, shape ``(..., 2)``
+    mean: Local mean of the corners, used as centroid of polygons without
+      area, shape ``(..., 2)``
+
+  Returns:
+    Area, centroid and the second moments about the centroid.
+  """
+  sums = sums * np.where(sums[0] < 0, -1.0, 1.0)
+  A, Qy, Qx, Ix, Iy, Ixy = sums
+  with np.errstate(divide='ignore', invalid='ignore'):
+    cx = np.where(A != 0, Qy / A, mean[..., 0])
+    cy = np.where(A != 0, Qx / A, mean[..., 1])
+  Ix = Ix - A * cy**2
+  Iy = Iy - A * cx**2
+  Ixy = Ixy - A * cx * cy
+  avg = (Ix + Iy) / 2
+  rad = np.hypot((Ix - Iy) / 2, Ixy)
+  return {
+    'area': A,
+    'centroid': np.stack([cx, cy], axis=-1) + origin,
+    'Ix': Ix, 'Iy': Iy, 'Ixy': Ixy,
+    'I1': avg + rad, 'I2': avg - rad, 'Ip': Ix + Iy,
+  }
+
+
+_CHUNK = 1 << 20  # elements of temporary point x edge arrays
+
+def _points(points: FloatArray) -> FloatArray:
+  """Query points as float64 array of shape ``(n, 2)``."""
+  points = np.asarray(points, dtype=np.float64)
+  return np.atleast_2d(points)[:, :2]
+
+def _inside(corners: FloatArray, points: FloatArray) -> npt.NDArray[np.bool_]:
+  r"""Crossing number test of points against the edges of one polygon.
+
+  Args:
+    corners: Corners of the polygon, shape ``(m, 2)``
+    points: Query points, shape ``(n, 2)``
+
+  Returns:
+    True for points inside the polygon, shape ``(n,)``
+  """
+  inside = np.zeros(len(points), dtype=bool)
+  if len(corners) < 3:
+    return inside
+  x0, y0 = corners[:, 0], corners[:, 1]
+  x1, y1 = np.roll(x0, -1), np.roll(y0, -1)
+  step = max(1, _CHUNK // len(corners))
+  for i in range(0, len(points), step):
+    px = points[i:i + step, 0, None]
+    py = points[i:i + step, 1, None]
+    # horizontal edges never straddle, their division result is masked
+    with np.errstate(divide='ignore', invalid='ignore'):
+      cross = ((y0 > py) != (y1 > py)) & \
+        (px < x0 + (x1 - x0) * (py - y0) / (y1 - y0))
+    inside[i:i + step] = np.count_nonzero(cross, axis=1) % 2 == 1
+  return inside
+
+
+def _segment_distance(p: FloatArray, a: FloatArray, b: FloatArray) -> FloatArray:
+  """Distances of points ``p`` to the segments from ``a`` to ``b``, all of
+  shape ``(n, 2)`` or broadcastable."""
+  d = b - a
+  dd = np.einsum('...i,...i->...', d, d)
+  with np.errstate(divide='ignore', invalid='ignore'):
+    t = np.clip(np.einsum('...i,...i->...', p - a, d) / dd, 0, 1)
+  t = np.where(dd == 0, 0, t)
+  return np.hypot(*np.moveaxis(a + t[..., None] * d - p, -1, 0))
+
+def _argmax_at(values: FloatArray, starts: npt.NDArray[np.int64]):
+  """Maximum and first index of the maximum of each contiguous segment of
+  ``values`` beginning at ``starts``, segments must not be empty."""
+  vmax = np.maximum.reduceat(values, starts)
+  lengths = np.diff(np.append(starts, len(values)))
+  pos = np.arange(len(values))
+  hit = np.where(values == np.repeat(vmax, lengths), pos, len(values))
+  return vmax, np.minimum.reduceat(hit, starts)
+
+def _douglas_peucker(
+    coords: FloatArray, offsets: npt.NDArray[np.int64], tolerance: float,
+    closed: bool) -> npt.NDArray[np.bool_]:
+  r"""Corners kept by the Douglas-Peucker algorithm for all polygons.
+
+  The recursion is unrolled: each round handles all open segments of all
+  polygons at once and splits those with corners farther than
+  ``tolerance`` at the farthest corner. Segments use local corner indices,
+  index ``count`` of a closed polygon is its first corner again.
+  """
+  counts = np.diff(offsets)
+  keep = np.zeros(len(coords), dtype=bool)
+  small = counts <= (3 if closed else 2)
+  keep[np.repeat(small, counts)] = True
+  pid = np.flatnonzero(~small)
+  if len(pid) == 0:
+    return keep
+  first = offsets[pid]
+  if closed:
+    # anchors: first corner, corner farthest from it and corner farthest
+    # from the segment between both
+    ids = np.repeat(np.arange(len(pid)), counts[pid])
+    rows = np.flatnonzero(np.repeat(~small, counts))
+    starts = np.concatenate([[0], np.cumsum(counts[pid])[:-1]])
+    a = coords[first][ids]
+    _, far = _argmax_at(np.hypot(*(coords[rows] - a).T), starts)
+    b = coords[rows[far]][ids]
+    _, third = _argmax_at(_segment_distance(coords[rows], a, b), starts)
+    far, third = far - starts, third - starts
+    anchors = np.sort(
+      np.stack([np.zeros_like(far), far, third, counts[pid]]), axis=0)
+    seg_pid = np.tile(pid, 3)
+    seg_start, seg_end = anchors[:-1].ravel(), anchors[1:].ravel()
+  else:
+    seg_pid, seg_start, seg_end = pid, np.zeros_like(pid), counts[pid] - 1
+  keep[offsets[seg_pid] + seg_start % counts[seg_pid]] = True
+  keep[offsets[seg_pid] + seg_end % counts[seg_pid]] = True
+  while len(seg_pid):
+    lengths = seg_end - seg_start - 1
+    inner = lengths > 0
+    seg_pid, seg_start, seg_end, lengths = (
+      seg_pid[inner], seg_start[inner], seg_end[inner], lengths[inner])
+    if len(seg_pid) == 0:
+      break
+    starts = np.concatenate([[0], np.cumsum(lengths)[:-1]])
+    local = np.arange(lengths.sum()) - np.repeat(starts - seg_start - 1,
+      lengths)
+    cnt = np.repeat(counts[seg_pid], lengths)
+    off = np.repeat(offsets[seg_pid], lengths)
+    a = coords[offsets[seg_pid] + seg_start % counts[seg_pid]]
+    b = coords[offsets[seg_pid] + seg_end % counts[seg_pid]]
+    dist = _segment_distance(
+      coords[off + local % cnt], np.repeat(a, lengths, axis=0),
+      np.repeat(b, lengths, axis=0))
+    dmax, at = _argmax_at(dist, starts)
+    split = dmax > tolerance
+    mid = local[at[split]]
+    keep[offsets[seg_pid[split]] + mid % counts[seg_pid[split]]] = True
+    seg_pid = np.tile(seg_pid[split], 2)
+    seg_start = np.concatenate([seg_start[split], mid])
+    seg_end = np.concatenate([mid, seg_end[split]])
+  return keep
+
+def _ring(ids: npt.NDArray[np.int64], n: int):
+  """Previous and next position of each position within the contiguous
+  groups ``ids``, wrapping around at the group ends."""
+  pos = np.arange(len(ids))
+  counts = np.bincount(ids, minlength=n)
+  offsets = np.concatenate([[0], np.cumsum(counts)])
+  prev, nxt = pos - 1, pos + 1
+  nonempty = counts > 0
+  prev[offsets[:-1][nonempty]] = offsets[1:][nonempty] - 1
+  nxt[offsets[1:][nonempty] - 1] = offsets[:-1][nonempty]
+  return prev, nxt, offsets
+
+def _visvalingam(
+    coords: FloatArray, offsets: npt.NDArray[np.int64], tolerance: float,
+    closed: bool) -> npt.NDArray[np.bool_]:
+  r"""Corners kept by the Visvalingam-Whyatt algorithm for all polygons.
+
+  Each round removes every corner with an effective triangle area below
+  ``tolerance`` that is smaller than the areas of both neighbours, ties
+  broken by index. No two neighbours are removed in the same round, so the
+  result matches the sequential algorithm closely.
+  """
+  n = len(offsets) - 1
+  minimum = 3 if closed else 2
+  keep = np.ones(len(coords), dtype=bool)
+  ids_all = np.repeat(np.arange(n), np.diff(offsets))
+  while True:
+    rows = np.flatnonzero(keep)
+    ids = ids_all[rows]
+    prev, nxt, local = _ring(ids, n)
+    p = coords[rows]
+    u, v = p[nxt] - p, p[prev] - p
+    area = np.abs(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]) / 2
+    if not closed:
+      nonempty = np.diff(local) > 0
+      area[local[:-1][nonempty]] = np.inf
+      area[local[1:][nonempty] - 1] = np.inf
+    pos = np.arange(len(rows))
+    smaller = lambda j: (area < area[j]) | ((area == area[j]) & (pos < j))
+    candidate = (area < tolerance) & smaller(prev) & smaller(nxt)
+    # keep at least `minimum` corners, removing the smallest areas first
+    order = np.lexsort((area, ids))
+    rank = np.empty(len(rows), dtype=np.int64)
+    rank[order] = pos - local[:-1][ids[order]]
+    remaining = np.diff(local)
+    candidate &= rank < remaining[ids] - minimum
+    if not np.any(candidate):
+      return keep
+    keep[rows[candidate]] = False
+
+def _deviation(
+    coords: FloatArray, offsets: npt.NDArray[np.int64],
+    keep: npt.NDArray[np.bool_], closed: bool) -> FloatArray:
+  """Largest distance of each polygon's corners to the simplified polygon
+  segment replacing them."""
+  n = len(offsets) - 1
+  ids = np.repeat(np.arange(n), np.diff(offsets))
+  pos = np.arange(len(coords))
+  first_kept = np.full(n + 1, len(coords))
+  last_kept = np.full(n + 1, -1)
+  np.minimum.at(first_kept, ids[keep], pos[keep])
+  np.maximum.at(last_kept, ids[keep], pos[keep])
+  before = np.maximum.accumulate(np.where(keep, pos, -1))
+  after = np.minimum.accumulate(
+    np.where(keep, pos, len(coords))[::-1])[::-1]
+  own = offsets[:-1][ids]
+  before = np.where(before >= own, before, last_kept[ids])
+  after = np.where(after < offsets[1:][ids], after, first_kept[ids])
+  dist = np.zeros(len(coords))
+  inner = ~keep & (before >= 0) & (after < len(coords))
+  dist[inner] = _segment_distance(
+    coords[inner], coords[before[inner]], coords[after[inner]])
+  error = np.zeros(n)
+  np.maximum.at(error, ids, dist)
+  return error
+
+
+def _chain(p: FloatArray, ids: npt.NDArray[np.int64]) -> npt.NDArray[np.bool_]:
+  r"""Lower convex chain of each group of points sorted by x and y.
+
+  Andrew's monotone chain pops corners without a left turn one at a time.
+  Here every such corner is removed at once per round, which is safe for
+  distinct points as each one lies on or above a segment between two other
+  points of its group. A round is :math:`O(n)`. Few rounds suffice for
+  typical polygons, but points on a convex arc drop one per round, so the
+  worst case is :math:`O(n^2)`.
+  """
+  keep = np.ones(len(p), dtype=bool)
+  while True:
+    rows = np.flatnonzero(keep)
+    q, g = p[rows], ids[rows]
+    inner = np.zeros(len(rows), dtype=bool)
+    inner[1:-1] = (g[1:-1] == g[:-2]) & (g[1:-1] == g[2:])
+    i = np.flatnonzero(inner)
+    u, v = q[i] - q[i - 1], q[i + 1] - q[i - 1]
+    drop = i[u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0] <= 0]
+    if len(drop) == 0:
+      return keep
+    keep[rows[drop]] = False
+
+def _hull(
+    coords: FloatArray,
+    offsets: npt.NDArray[np.int64]) -> tuple[FloatArray, npt.NDArray[np.int64]]:
+  r"""Convex hulls of all polygons, counterclockwise.
+
+  Sorting is :math:`O(n \log n)`, the chains are :math:`O(n^2)` in the
+  worst case, see :py:func:`_chain`.
+
+  Returns:
+    Coordinates and offsets of the hulls, see :py:class:`PolygonSet`
+  """
+  n = len(offsets) - 1
+  counts = np.diff(offsets)
+  ids = np.repeat(np.arange(n), counts)
+  order = np.lexsort((coords[:, 1], coords[:, 0], ids))
+  # without duplicates, the simultaneous removals of _chain are safe
+  unique = np.ones(len(order), dtype=bool)
+  unique[1:] = np.any(coords[order[1:]] != coords[order[:-1]], axis=1) | \
+    (ids[1:] != ids[:-1])
+  order, ids = order[unique], ids[unique]
+  counts = np.bincount(ids, minlength=n)
+  p = coords[order]
+  lower = np.flatnonzero(_chain(p, ids))
+  upper = len(p) - 1 - np.flatnonzero(_chain(p[::-1], ids[::-1]))
+  without_last = lambda rows: rows[:-1][ids[rows][1:] == ids[rows][:-1]]
+  # chains without their last point, lower chain first
+  rows = np.concatenate([
+    without_last(lower), without_last(upper),
+    np.flatnonzero(np.repeat(counts == 1, counts))])
+  rows = rows[np.argsort(ids[rows], kind='stable')]
+  hull_offsets = np.zeros(n + 1, dtype=np.int64)
+  np.cumsum(np.bincount(ids[rows], minlength=n), out=hull_offsets[1:])
+  return p[rows], hull_offsets
+
+def _min_area_rectangle(
+    coords: FloatArray, offsets: npt.NDArray[np.int64]) -> FloatArray:
+  r"""Minimum-area enclosing rectangles of convex counterclockwise polygons.
+
+  Rotating calipers: one rectangle side is collinear with a hull edge. The
+  edge angles of a convex polygon increase monotonically, so the extreme
+  corners of all edge directions of all polygons are found with one
+  :py:func:`numpy.searchsorted` on the unwrapped angles.
+
+  Returns:
+    Corners of the rectangles, counterclockwise, shape ``(n, 4, 2)``, NaN
+    for empty polygons
+  """
+  n = len(offsets) - 1
+  counts = np.diff(offsets)
+  res = np.full((n, 4, 2), np.nan)
+  if len(coords) == 0:
+    return res
+  ids = np.repeat(np.arange(n), counts)
+  first = offsets[:-1][ids]
+  nxt = np.arange(1, len(coords) + 1)
+  nxt[offsets[1:][counts > 0] - 1] = offsets[:-1][counts > 0]
+  edge = coords[nxt] - coords
+  angle = np.arctan2(edge[:, 1], edge[:, 0])
+  turn = np.mod(angle - np.roll(angle, 1), 2 * np.pi)
+  turn[first == np.arange(len(coords))] = 0
+  # unwrapped angles, shifted per polygon to one increasing sequence
+  unwrapped = np.cumsum(turn)
+  unwrapped -= unwrapped[first]
+  unwrapped += angle[first]
+  key = unwrapped + 8 * np.pi * ids
+
+  def support(phi):
+    """Corner extreme in direction ``phi``, one per edge."""
+    target = angle[first] + np.mod(phi + np.pi / 2 - angle[first], 2 * np.pi)
+    j = np.searchsorted(key, target + 8 * np.pi * ids)
+    return np.where(j >= offsets[1:][ids], first, j)
+
+  u = np.stack([np.cos(angle), np.sin(angle)], axis=-1)
+  v = np.stack([-u[:, 1], u[:, 0]], axis=-1)  # inward normal
+  dot = lambda a, b: np.einsum('ij,ij->i', a, b)
+  umax = dot(coords[support(angle)], u)
+  umin = dot(coords[support(angle + np.pi)], u)
+  vmin = dot(coords, v)
+  vmax = dot(coords[support(angle + np.pi / 2)], v)
+  area = (umax - umin) * (vmax - vmin)
+  nonempty = counts > 0
+  _, best = _argmax_at(-area, offsets[:-1][nonempty])
+  u, v = u[best, None], v[best, None]
+  a = np.stack([umin[best], umax[best], umax[best], umin[best]], axis=-1)
+  b = np.stack([vmin[best], vmin[best], vmax[best], vmax[best]], axis=-1)
+  res[nonempty] = a[..., None] * u + b[..., None] * v
+  return res
+
+
 class Polygon:
   r"""Properties of a simple polygon.
+
+  Derived properties are cached and recalculated after :py:attr:`vertices`
+  is reassigned. Modify the vertices by assignment, not in place.
   """
 
   def __init__(self, vertices: FloatArray | str):
@@ -35,12 +644,44 @@ class Polygon:
       vertices = self.str2arr(vertices)
     self.vertices = vertices
 
+  @property
+  def vertices(self) -> FloatArray:
+    """Corners of the polygon, pair of x and y."""
+    return self._vertices
+
+  @vertices.setter
+  def vertices(self, vertices: FloatArray):
+    self._vertices = np.asarray(vertices, dtype=np.float64)
+    self._cache: dict = {}
+
+  @property
+  def _corners(self) -> FloatArray:
+    """Corners as array of shape ``(n, 2)``, also for homogeneous input."""
+    v = self.vertices
+    return v.reshape(len(v), -1)[:, :2] if v.size else np.zeros((0, 2))
+
   @staticmethod
   def str2arr(vertices: str) -> FloatArray:
-    strm = re.match(r'\[.*\]', ''.join(vertices))
-    if strm and strm.group():
-      return eval(strm.group())
-    return np.array([])
+    """Parse a vertex string, see :py:func:`parse_vertices`."""
+    return parse_vertices(''.join(vertices))
+
+  def _section(self) -> dict:
+    """Section properties of one Green's theorem pass, cached."""
+    if 'section' not in self._cache:
+      v = self._corners
+      if len(v):
+        # shift to the first corner to limit cancellation for far off origins
+        origin = v[0]
+        x, y = (v - origin).T
+        mean = np.array([x.mean(), y.mean()])
+      else:
+        origin = mean = np.zeros(2)
+        x = y = np.zeros(0)
+      sums = _green(x, y, np.roll(x, -1), np.roll(y, -1)).sum(axis=1)
+      self._cache['section'] = {
+        k: float(v) if np.ndim(v) == 0 else v
+        for k, v in _section(sums, origin, mean).items()}
+    return self._cache['section']
 
   @property
   def area(self) -> float:
@@ -56,11 +697,765 @@ class Polygon:
 
     https://en.wikipedia.org/wiki/Shoelace_formula
     """
-    count = len(self.vertices)  # of corners
-    result = 0.0
-    for i in range(count):
-      j = (i + 1) % count
-      result += self.vertices[i][0] * self.vertices[j][1] - \
-        self.vertices[i][1] * self.vertices[j][0]
-    result = abs(result) / 2.0
-    return result
+    return self._section()['area']
+
+  @property
+  def centroid(self) -> FloatArray:
+    r"""Centroid of the polygon area.
+
+    .. math::
+
+      x_\text{c} = \frac{1}{A} \int x \,\mathrm{d}A \quad,\quad
+      y_\text{c} = \frac{1}{A} \int y \,\mathrm{d}A
+
+    Example:
+      >>> Polygon([[0, 0], [2, 0], [2, 1], [0, 1]]).centroid
+      array([1. , 0.5])
+    """
+    return self._section()['centroid']
+
+  @property
+  def Ix(self) -> float:
+    r"""Second moment of area about the centroidal x axis.
+
+    .. math::
+
+      I_x = \int y^2 \,\mathrm{d}A
+
+    Example:
+      >>> b, h = 2, 1
+      >>> round(Polygon([[0, 0], [b, 0], [b, h], [0, h]]).Ix, 6)  # b h^3/12
+      0.166667
+    """
+    return self._section()['Ix']
+
+  @property
+  def Iy(self) -> float:
+    r"""Second moment of area about the centroidal y axis.
+
+    .. math::
+
+      I_y = \int x^2 \,\mathrm{d}A
+    """
+    return self._section()['Iy']
+
+  @property
+  def Ixy(self) -> float:
+    r"""Product of inertia about the centroidal axes.
+
+    .. math::
+
+      I_{xy} = \int xy \,\mathrm{d}A
+    """
+    return self._section()['Ixy']
+
+  @property
+  def I1(self) -> float:
+    r"""Major principal second moment of area.
+
+    .. math::
+
+      I_{1,2} = \frac{I_x + I_y}{2} \pm
+        \sqrt{\left(\frac{I_x - I_y}{2}\right)^2 + I_{xy}^2}
+    """
+    return self._section()['I1']
+
+  @property
+  def I2(self) -> float:
+    r"""Minor principal second moment of area, see :py:attr:`I1`."""
+    return self._section()['I2']
+
+  @property
+  def Ip(self) -> float:
+    r"""Polar second moment of area about the centroid.
+
+    .. math::
+
+      I_\text{p} = I_x + I_y
+    """
+    return self._section()['Ip']
+
+  @property
+  def bounds(self) -> FloatArray:
+    """Axis-aligned bounding box ``[xmin, ymin, xmax, ymax]``, cached."""
+    if 'bounds' not in self._cache:
+      v = self._corners
+      if len(v):
+        self._cache['bounds'] = np.concatenate([v.min(axis=0), v.max(axis=0)])
+      else:
+        self._cache['bounds'] = np.full(4, np.nan)
+    return self._cache['bounds']
+
+  @property
+  def hull(self) -> 'Polygon':
+    r"""Convex hull, counterclockwise, cached.
+
+    Vectorized monotone chain algorithm, :math:`O(n \log n)` for typical
+    polygons and :math:`O(n^2)` in the worst case of many corners on a
+    convex arc.
+
+    Example:
+      >>> Polygon([[0, 0], [1, 1], [2, 0], [2, 2], [0, 2]]).hull.vertices
+      array([[0., 0.],
+             [2., 0.],
+             [2., 2.],
+             [0., 2.]])
+    """
+    if 'hull' not in self._cache:
+      corners = self._corners
+      coords, _ = _hull(corners, np.array([0, len(corners)]))
+      self._cache['hull'] = Polygon(coords)
+    return self._cache['hull']
+
+  @property
+  def obb(self) -> FloatArray:
+    r"""Minimum-area oriented bounding box, cached.
+
+    Rotating calipers over the edges of the convex :py:attr:`hull`.
+
+    Returns:
+      Corners of the rectangle, counterclockwise, shape ``(4, 2)``
+
+    Example:
+      >>> Polygon([[0, 0], [2, 2], [1, 3], [-1, 1]]).obb.round(12)
+      array([[-1.,  1.],
+             [ 0.,  0.],
+             [ 2.,  2.],
+             [ 1.,  3.]])
+    """
+    if 'obb' not in self._cache:
+      corners = self.hull._corners
+      self._cache['obb'] = _min_area_rectangle(
+        corners, np.array([0, len(corners)]))[0]
+    return self._cache['obb']
+
+  def contains(self, points: FloatArray) -> npt.NDArray[np.bool_]:
+    r"""Test which points lie inside the polygon.
+
+    Points outside of :py:attr:`bounds` are rejected before the vectorized
+    crossing number (even-odd) test. Points on the boundary may be
+    classified either way.
+
+    Args:
+      points: Pairs of x and y: ``[[x1, y1], [x2, y2], ...]``
+
+    Returns:
+      True for each point inside the polygon
+
+    Example:
+      >>> Polygon([[0, 0], [0, 1], [1, 1], [1, 0]]).contains(
+      ...   [[0.5, 0.5], [1.5, 0.5], [0.2, 0.9]])
+      array([ True, False,  True])
+    """
+    points = _points(points)
+    xmin, ymin, xmax, ymax = self.bounds
+    candidates = np.flatnonzero(
+      (points[:, 0] >= xmin) & (points[:, 0] <= xmax) &
+      (points[:, 1] >= ymin) & (points[:, 1] <= ymax))
+    inside = np.zeros(len(points), dtype=bool)
+    inside[candidates] = _inside(self._corners, points[candidates])
+    return inside
+
+  def simplify(
+      self, tolerance: float,
+      method: str = 'douglas-peucker') -> tuple['Polygon', float]:
+    r"""Reduce the number of corners, see :py:meth:`PolygonSet.simplify`.
+
+    Returns:
+      The simplified polygon and the achieved error bound
+    """
+    res, error = PolygonSet.from_polygons([self]).simplify(tolerance, method)
+    return res[0], float(error[0])
+
+
+class PolygonSet:
+  r"""Collection of simple polygons stored in one flat coordinate buffer.
+
+  Polygon ``i`` consists of the corners ``coords[offsets[i]:offsets[i+1]]``,
+  so ragged polygons share one contiguous array and batch properties are
+  evaluated for all polygons in a single pass.
+
+  The set is treated as immutable, derived properties are cached. Sets are
+  stored with :py:meth:`save` and memory-mapped with :py:meth:`load`.
+  """
+
+  def __init__(
+      self, coords: FloatArray, offsets: npt.ArrayLike,
+      dtype: npt.DTypeLike = np.float64):
+    r"""
+    Args:
+      coords: All corners, pair of x and y: ``[[x1, y1], [x2, y2], ...]``
+      offsets: Start index of each polygon in ``coords`` followed by the
+        total number of corners, ``len(offsets) == len(polygons) + 1``
+      dtype: Storage type of the coordinates, e.g. ``np.float32`` to halve
+        the memory of large catalogs. Properties are accumulated in float64.
+    """
+    self.coords = np.ascontiguousarray(coords, dtype=dtype).reshape(-1, 2)
+    self.offsets = np.ascontiguousarray(offsets, dtype=np.int64)
+    if (len(self.offsets) == 0 or self.offsets[0] != 0 or
+        self.offsets[-1] != len(self.coords) or
+        np.any(np.diff(self.offsets) < 0)):
+      raise ValueError("offsets do not match coords.")
+    self._cache: dict = {}
+
+  @classmethod
+  def from_polygons(
+      cls, polygons, dtype: npt.DTypeLike = np.float64) -> 'PolygonSet':
+    r"""Pack single polygons into one set.
+
+    Args:
+      polygons: Iterable of :py:class:`Polygon` objects or vertex lists
+
+    Example:
+      >>> ps = PolygonSet.from_polygons([
+      ...   [[0, 0], [0, 1], [1, 1], [1, 0]],
+      ...   [[0, 0], [2, 0], [0, 2]]])
+      >>> ps.areas
+      array([1., 2.])
+    """
+    arrs = [
+      np.asarray(
+        i._corners if isinstance(i, Polygon) else i, dtype=dtype
+      ).reshape(-1, 2)
+      for i in polygons]
+    offsets = np.zeros(len(arrs) + 1, dtype=np.int64)
+    np.cumsum([len(i) for i in arrs], out=offsets[1:])
+    coords = np.concatenate(arrs) if arrs else np.empty((0, 2), dtype=dtype)
+    return cls(coords, offsets, dtype=dtype)
+
+  def __len__(self) -> int:
+    return len(self.offsets) - 1
+
+  def __getitem__(self, i: int) -> Polygon:
+    if i < 0:
+      i += len(self)
+    if not 0 <= i < len(self):
+      raise IndexError("polygon index out of range")
+    polygon = Polygon(self.coords[self.offsets[i]:self.offsets[i + 1]])
+    # hand over already known properties, e.g. memory-mapped ones
+    if 'section' in self._cache:
+      polygon._cache['section'] = {
+        k: float(v[i]) if v.ndim == 1 else np.array(v[i])
+        for k, v in self._cache['section'].items()}
+    if 'bounds' in self._cache:
+      polygon._cache['bounds'] = np.array(self._cache['bounds'][i])
+    return polygon
+
+  def __iter__(self):
+    for i in range(len(self)):
+      yield self[i]
+
+  def take(self, indices: npt.ArrayLike) -> 'PolygonSet':
+    """New set of the selected polygons, with their cached properties.
+
+    Args:
+      indices: Polygon indices
+    """
+    indices = np.asarray(indices, dtype=np.int64).reshape(-1)
+    starts, stops = self.offsets[indices], self.offsets[indices + 1]
+    offsets = np.zeros(len(indices) + 1, dtype=np.int64)
+    np.cumsum(stops - starts, out=offsets[1:])
+    # corner index of each selected corner
+    rows = np.arange(offsets[-1]) - np.repeat(offsets[:-1] - starts,
+      stops - starts)
+    res = type(self)(self.coords[rows], offsets, dtype=self.coords.dtype)
+    if 'section' in self._cache:
+      res._cache['section'] = {
+        k: np.asarray(v[indices]) for k, v in self._cache['section'].items()}
+    if 'bounds' in self._cache:
+      res._cache['bounds'] = np.asarray(self._cache['bounds'][indices])
+    return res
+
+  def save(self, path: str | pathlib.Path, properties: bool = True):
+    r"""Store the set as directory of ``.npy`` files.
+
+    Layout: ``coords.npy`` and ``offsets.npy``, with ``properties`` also the
+    per polygon properties ``bounds.npy`` and ``section_<name>.npy``, e.g.
+    ``section_area.npy``.
+
+    Args:
+      path: Directory, created if missing
+      properties: Compute and store the properties
+    """
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    np.save(path / 'coords.npy', self.coords)
+    np.save(path / 'offsets.npy', self.offsets)
+    if properties:
+      np.save(path / 'bounds.npy', self.bounds)
+      for k, v in self._section().items():
+        np.save(path / f'section_{k}.npy', v)
+
+  @classmethod
+  def load(
+      cls, path: str | pathlib.Path,
+      mmap_mode: Literal['r', 'r+', 'w+', 'c'] | None = 'r') -> 'PolygonSet':
+    r"""Load a set stored with :py:meth:`save`.
+
+    The arrays are memory-mapped by default: processes loading the same set
+    share the pages of the operating system cache and only the pages of
+    polygons actually touched are read. Stored properties are used instead
+    of recomputing them.
+
+    Args:
+      path: Directory
+      mmap_mode: See :py:func:`numpy.load`, None reads the arrays into memory
+
+    Example:
+      >>> import tempfile
+      >>> ps = PolygonSet.from_polygons([[[0, 0], [0, 1], [1, 1], [1, 0]]])
+      >>> with tempfile.TemporaryDirectory() as tmp:
+      ...   ps.save(tmp)
+      ...   PolygonSet.load(tmp)[0].area
+      1.0
+    """
+    path = pathlib.Path(path)
+    coords = np.load(path / 'coords.npy', mmap_mode=mmap_mode)
+    offsets = np.load(path / 'offsets.npy', mmap_mode=mmap_mode)
+    res = cls(coords, offsets, dtype=coords.dtype)
+    if (path / 'bounds.npy').exists():
+      res._cache['bounds'] = np.load(path / 'bounds.npy', mmap_mode=mmap_mode)
+    section = {
+      i.stem.removeprefix('section_'): np.load(i, mmap_mode=mmap_mode)
+      for i in sorted(path.glob('section_*.npy'))}
+    if section:
+      res._cache['section'] = section
+    return res
+
+  @property
+  def counts(self) -> npt.NDArray[np.int64]:
+    """Number of corners of each polygon."""
+    return np.diff(self.offsets)
+
+  def _index(self):
+    """Polygon id and index of the following corner for each corner."""
+    counts = self.counts
+    ids = np.repeat(np.arange(len(self)), counts)
+    nxt = np.arange(1, len(self.coords) + 1)
+    nonempty = counts > 0
+    nxt[self.offsets[1:][nonempty] - 1] = self.offsets[:-1][nonempty]
+    return ids, nxt
+
+  def _section(self) -> dict:
+    """Section properties of all polygons in one pass, cached."""
+    if 'section' not in self._cache:
+      ids, nxt = self._index()
+      n = len(self)
+      coords = self.coords.astype(np.float64)
+      origin = np.zeros((n, 2))
+      nonempty = self.counts > 0
+      origin[nonempty] = coords[self.offsets[:-1][nonempty]]
+      # shift to the first corner to limit cancellation for far off origins
+      coords -= origin[ids]
+      x, y = coords.T
+      sums = np.stack([
+        np.bincount(ids, weights=i, minlength=n)
+        for i in _green(x, y, x[nxt], y[nxt])])
+      counts = np.maximum(self.counts, 1)[:, None]
+      mean = np.stack([
+        np.bincount(ids, weights=i, minlength=n) for i in (x, y)], axis=-1)
+      self._cache['section'] = _section(sums, origin, mean / counts)
+    return self._cache['section']
+
+  @property
+  def areas(self) -> FloatArray:
+    r"""Areas of all polygons, see :py:attr:`Polygon.area`.
+
+    Example:
+      >>> ps = PolygonSet([[0, 0], [0, 1], [1, 1], [1, 0], [0, 0], [3, 0],
+      ...   [0, 1]], [0, 4, 7], dtype=np.float32)
+      >>> ps.areas
+      array([1. , 1.5])
+    """
+    return self._section()['area']
+
+  @property
+  def centroids(self) -> FloatArray:
+    """Centroids of all polygons, shape ``(n, 2)``, see
+    :py:attr:`Polygon.centroid`."""
+    return self._section()['centroid']
+
+  @property
+  def Ix(self) -> FloatArray:
+    """Second moments of area about the centroidal x axes, see
+    :py:attr:`Polygon.Ix`."""
+    return self._section()['Ix']
+
+  @property
+  def Iy(self) -> FloatArray:
+    """Second moments of area about the centroidal y axes, see
+    :py:attr:`Polygon.Iy`."""
+    return self._section()['Iy']
+
+  @property
+  def Ixy(self) -> FloatArray:
+    """Products of inertia about the centroidal axes, see
+    :py:attr:`Polygon.Ixy`."""
+    return self._section()['Ixy']
+
+  @property
+  def I1(self) -> FloatArray:
+    """Major principal second moments of area, see :py:attr:`Polygon.I1`."""
+    return self._section()['I1']
+
+  @property
+  def I2(self) -> FloatArray:
+    """Minor principal second moments of area, see :py:attr:`Polygon.I2`."""
+    return self._section()['I2']
+
+  @property
+  def Ip(self) -> FloatArray:
+    """Polar second moments of area, see :py:attr:`Polygon.Ip`."""
+    return self._section()['Ip']
+
+  @property
+  def bounds(self) -> FloatArray:
+    """Axis-aligned bounding boxes ``[xmin, ymin, xmax, ymax]``, shape
+    ``(n, 4)``, NaN for empty polygons, see :py:attr:`Polygon.bounds`."""
+    if 'bounds' not in self._cache:
+      bounds = np.full((len(self), 4), np.nan)
+      nonempty = self.counts > 0
+      if np.any(nonempty):
+        starts = self.offsets[:-1][nonempty]
+        coords = self.coords.astype(np.float64, copy=False)
+        bounds[nonempty, :2] = np.minimum.reduceat(coords, starts, axis=0)
+        bounds[nonempty, 2:] = np.maximum.reduceat(coords, starts, axis=0)
+      self._cache['bounds'] = bounds
+    return self._cache['bounds']
+
+  @property
+  def hulls(self) -> 'PolygonSet':
+    """Convex hulls of all polygons, see :py:attr:`Polygon.hull` for the
+    complexity."""
+    if 'hulls' not in self._cache:
+      self._cache['hulls'] = type(self)(
+        *_hull(self.coords.astype(np.float64, copy=False), self.offsets))
+    return self._cache['hulls']
+
+  @property
+  def obbs(self) -> FloatArray:
+    """Minimum-area oriented bounding boxes of all polygons, shape
+    ``(n, 4, 2)``, see :py:attr:`Polygon.obb`."""
+    if 'obbs' not in self._cache:
+      hulls = self.hulls
+      self._cache['obbs'] = _min_area_rectangle(hulls.coords, hulls.offsets)
+    return self._cache['obbs']
+
+  def contains(
+      self, points: FloatArray) -> tuple[npt.NDArray[np.int64], ...]:
+    r"""Find the polygons containing each point.
+
+    The points are sorted once by x, so the bounding box of each polygon
+    selects its candidate points with a binary search. Only those pairs run
+    the crossing number test of :py:meth:`Polygon.contains`.
+
+    Args:
+      points: Pairs of x and y: ``[[x1, y1], [x2, y2], ...]``
+
+    Returns:
+      Indices of polygons and points of all pairs with the point inside the
+      polygon, like :py:func:`numpy.nonzero` of the ``(polygons, points)``
+      containment matrix
+
+    Example:
+      >>> ps = PolygonSet.from_polygons([
+      ...   [[0, 0], [0, 2], [2, 2], [2, 0]],
+      ...   [[1, 1], [1, 3], [3, 3], [3, 1]]])
+      >>> ps.contains([[0.5, 0.5], [1.5, 1.5], [5, 5], [2.5, 2.5]])
+      (array([0, 0, 1, 1]), array([0, 1, 1, 3]))
+    """
+    points = _points(points)
+    order = np.argsort(points[:, 0], kind='stable')
+    xs = points[order, 0]
+    bounds = self.bounds
+    lo = np.searchsorted(xs, bounds[:, 0], side='left')
+    hi = np.searchsorted(xs, bounds[:, 2], side='right')
+    polygon_ids, point_ids = [], []
+    for i in np.flatnonzero(hi > lo):
+      candidates = order[lo[i]:hi[i]]
+      y = points[candidates, 1]
+      candidates = candidates[(y >= bounds[i, 1]) & (y <= bounds[i, 3])]
+      corners = self.coords[self.offsets[i]:self.offsets[i + 1]].astype(
+        np.float64, copy=False)
+      hits = np.sort(candidates[_inside(corners, points[candidates])])
+      polygon_ids.append(np.full(len(hits), i, dtype=np.int64))
+      point_ids.append(hits.astype(np.int64, copy=False))
+    if not polygon_ids:
+      return np.zeros(0, dtype=np.int64), np.zeros(0, dtype=np.int64)
+    return np.concatenate(polygon_ids), np.concatenate(point_ids)
+
+  def simplify(
+      self, tolerance: float, method: str = 'douglas-peucker',
+      closed: bool = True) -> tuple['PolygonSet', FloatArray]:
+    r"""Reduce the number of corners of all polygons.
+
+    Both algorithms run as NumPy kernels over the whole set, round by round
+    instead of recursing per corner.
+
+    Args:
+      tolerance: ``'douglas-peucker'``: largest distance of a removed corner
+        to the simplified outline. ``'visvalingam'``: smallest effective
+        triangle area of a kept corner.
+      method: ``'douglas-peucker'`` or ``'visvalingam'``
+      closed: Polygons, otherwise open polylines with fixed end points
+
+    Returns:
+      The simplified set and the achieved error bound, the largest distance
+      of each polygon's removed corners to the simplified outline. Polygons
+      keep at least 3 corners, polylines their end points.
+
+    Example:
+      >>> ps = PolygonSet.from_polygons([
+      ...   [[0, 0], [1, 0.01], [2, 0], [2, 1], [1, 1.2], [0, 1]]])
+      >>> res, error = ps.simplify(0.1)
+      >>> res.coords.tolist()
+      [[0.0, 0.0], [2.0, 0.0], [2.0, 1.0], [1.0, 1.2], [0.0, 1.0]]
+      >>> error
+      array([0.01])
+    """
+    coords = self.coords.astype(np.float64, copy=False)
+    if method == 'douglas-peucker':
+      keep = _douglas_peucker(coords, self.offsets, tolerance, closed)
+    elif method == 'visvalingam':
+      keep = _visvalingam(coords, self.offsets, tolerance, closed)
+    else:
+      raise ValueError(f"unknown method {method!r}.")
+    error = _deviation(coords, self.offsets, keep, closed)
+    offsets = np.zeros(len(self.offsets), dtype=np.int64)
+    np.cumsum(
+      np.bincount(np.repeat(np.arange(len(self)), self.counts)[keep],
+        minlength=len(self)), out=offsets[1:])
+    return type(self)(self.coords[keep], offsets,
+      dtype=self.coords.dtype), error
+
+def _intersects(boxes: FloatArray, window) -> npt.NDArray[np.bool_]:
+  """Test boxes ``[xmin, ymin, xmax, ymax]`` for overlap with the window."""
+  xmin, ymin, xmax, ymax = window
+  return ((boxes[:, 0] <= xmax) & (boxes[:, 2] >= xmin) &
+    (boxes[:, 1] <= ymax) & (boxes[:, 3] >= ymin))
+
+def _box_distances(boxes: FloatArray, x: float, y: float):
+  """Smallest and largest distance from a point to the area of each box."""
+  dx = np.maximum(np.maximum(boxes[:, 0] - x, x - boxes[:, 2]), 0)
+  dy = np.maximum(np.maximum(boxes[:, 1] - y, y - boxes[:, 3]), 0)
+  Dx = np.maximum(np.abs(x - boxes[:, 0]), np.abs(x - boxes[:, 2]))
+  Dy = np.maximum(np.abs(y - boxes[:, 1]), np.abs(y - boxes[:, 3]))
+  return np.hypot(dx, dy), np.hypot(Dx, Dy)
+
+def _distance(corners: FloatArray, x: float, y: float) -> float:
+  """Distance from a point to a polygon, zero inside."""
+  if len(corners) == 0:
+    return np.inf
+  p = np.array([[x, y]])
+  if _inside(corners, p)[0]:
+    return 0.0
+  return float(np.min(_segment_distance(
+    p, corners, np.roll(corners, -1, axis=0))))
+
+
+class _PackedTree:
+  r"""Static R-tree packed with the sort-tile-recursive (STR) algorithm.
+
+  All levels are arrays of node boxes. The children of node ``j`` are the
+  nodes ``j*capacity`` up to ``(j+1)*capacity-1`` of the level below, level
+  0 holds the item boxes. Queries descend level by level with one
+  vectorized test of all candidate nodes per level.
+  """
+
+  def __init__(self, boxes: FloatArray, ids: npt.NDArray[np.int64],
+      capacity: int = 16):
+    n = len(boxes)
+    self.capacity = capacity
+    leaves = -(-n // capacity)
+    slices = max(1, int(np.ceil(np.sqrt(leaves))))
+    cx = np.nan_to_num(boxes[:, 0] + boxes[:, 2], nan=np.inf)
+    cy = np.nan_to_num(boxes[:, 1] + boxes[:, 3], nan=np.inf)
+    tile = np.empty(n, dtype=np.int64)
+    tile[np.argsort(cx, kind='stable')] = np.arange(n) // (slices * capacity)
+    order = np.lexsort((cy, tile))
+    self.ids = ids[order]
+    self.levels = [boxes[order]]
+    self.counts = [np.ones(n, dtype=np.int64)]
+    while len(self.levels[-1]) > 1:
+      below = self.levels[-1]
+      starts = np.arange(0, len(below), capacity)
+      # fmin/fmax ignore the NaN boxes of empty polygons
+      self.levels.append(np.concatenate([
+        np.fmin.reduceat(below[:, :2], starts, axis=0),
+        np.fmax.reduceat(below[:, 2:], starts, axis=0)], axis=1))
+      self.counts.append(np.add.reduceat(self.counts[-1], starts))
+
+  def __len__(self) -> int:
+    return len(self.ids)
+
+  def _children(self, nodes, level: int):
+    children = (nodes[:, None] * self.capacity +
+      np.arange(self.capacity)).ravel()
+    return children[children < len(self.levels[level - 1])]
+
+  def window(self, window) -> npt.NDArray[np.int64]:
+    """Ids of the items with boxes overlapping the window."""
+    nodes = np.arange(len(self.levels[-1]))
+    for level in range(len(self.levels) - 1, -1, -1):
+      nodes = nodes[_intersects(self.levels[level][nodes], window)]
+      if level:
+        nodes = self._children(nodes, level)
+    return self.ids[nodes]
+
+  def nearest(self, x: float, y: float, k: int) -> npt.NDArray[np.int64]:
+    """Ids of the candidates for the ``k`` items nearest to the point.
+
+    A node contains ``counts`` items, all closer than the largest distance
+    to the node box. The ``k``-th smallest of these bounds limits the
+    smallest distance of nodes worth descending into.
+    """
+    nodes = np.arange(len(self.levels[-1]))
+    for level in range(len(self.levels) - 1, -1, -1):
+      dmin, dmax = _box_distances(self.levels[level][nodes], x, y)
+      order = np.argsort(dmax)
+      covered = np.cumsum(self.counts[level][nodes][order])
+      last = min(int(np.searchsorted(covered, k)), len(order) - 1)
+      bound = dmax[order[last]]
+      nodes = nodes[dmin <= bound]
+      if level:
+        nodes = self._children(nodes, level)
+    return self.ids[nodes]
+
+
+class PolygonIndex:
+  r"""Spatial index of polygons for window, point and nearest queries.
+
+  Polygons are referenced by the id of their insertion, starting with 0.
+  Inserted polygons are collected in a small buffer and packed into static
+  STR trees of growing size, merging trees of similar size (logarithmic
+  method). An insertion therefore rebuilds only small trees, while queries
+  visit :math:`O(\log n)` trees.
+
+  Example:
+    >>> idx = PolygonIndex([
+    ...   [[0, 0], [0, 1], [1, 1], [1, 0]],
+    ...   [[2, 2], [2, 3], [3, 3], [3, 2]]])
+    >>> idx.insert([[5, 5], [5, 6], [6, 6]])
+    2
+    >>> idx.window(0.5, 0.5, 2.5, 2.5)
+    array([0, 1])
+    >>> idx.point(5.2, 5.8)
+    array([2])
+    >>> idx.nearest(4, 4, k=2)
+    (array([1, 2]), array([1.41421356, 1.41421356]))
+  """
+
+  def __init__(self, polygons=(), capacity: int = 16):
+    r"""
+    Args:
+      polygons: Iterable of :py:class:`Polygon` objects or vertex lists, or
+        a :py:class:`PolygonSet`
+      capacity: Number of children of a tree node, at least 2
+
+    Raises:
+      ValueError: capacity below 2
+    """
+    if capacity < 2:
+      raise ValueError("capacity must be at least 2.")
+    self.capacity = capacity
+    self._corners: list[FloatArray] = []
+    self._boxes = np.empty((0, 4))
+    self._trees: list[_PackedTree] = []
+    self._pending = 0  # number of newest polygons not yet in a tree
+    self.insert_many(polygons)
+
+  def __len__(self) -> int:
+    return len(self._corners)
+
+  @property
+  def bounds(self) -> FloatArray:
+    """Bounding boxes of all polygons, shape ``(n, 4)``."""
+    return self._boxes[:len(self)]
+
+  def insert(self, polygon) -> int:
+    """Add one polygon.
+
+    Args:
+      polygon: :py:class:`Polygon` object or vertex list
+
+    Returns:
+      Id of the polygon
+    """
+    return int(self.insert_many([polygon])[0])
+
+  def insert_many(self, polygons) -> npt.NDArray[np.int64]:
+    """Add polygons, packed into one new tree.
+
+    Args:
+      polygons: Iterable of :py:class:`Polygon` objects or vertex lists, or
+        a :py:class:`PolygonSet`
+
+    Returns:
+      Ids of the polygons
+    """
+    if isinstance(polygons, PolygonSet):
+      boxes = polygons.bounds
+      polygons = list(polygons)
+    else:
+      polygons = [i if isinstance(i, Polygon) else Polygon(i)
+        for i in polygons]
+      boxes = np.array([i.bounds for i in polygons]).reshape(-1, 4)
+    start = len(self)
+    self._corners.extend(i._corners for i in polygons)
+    if len(self) > len(self._boxes):
+      grown = np.empty((max(2 * len(self._boxes), len(self)), 4))
+      grown[:start] = self._boxes[:start]
+      self._boxes = grown
+    self._boxes[start:len(self)] = boxes
+    self._pending += len(polygons)
+    if self._pending >= self.capacity:
+      self._pack(len(self) - self._pending, len(self))
+    return np.arange(start, len(self))
+
+  def _pack(self, start: int, stop: int):
+    """Pack the polygons ``start:stop`` into a tree and merge trees of
+    similar size, smaller trees are always newer."""
+    ids = np.arange(start, stop)
+    while self._trees and len(self._trees[-1]) <= len(ids):
+      ids = np.concatenate([self._trees.pop().ids, ids])
+    self._trees.append(
+      _PackedTree(self._boxes[ids], ids, capacity=self.capacity))
+    self._pending = 0
+
+  def _buffer(self) -> npt.NDArray[np.int64]:
+    return np.arange(len(self) - self._pending, len(self))
+
+  def window(
+      self, xmin: float, ymin: float, xmax: float,
+      ymax: float) -> npt.NDArray[np.int64]:
+    """Ids of the polygons with a bounding box overlapping the window."""
+    window = (xmin, ymin, xmax, ymax)
+    buffer = self._buffer()
+    ids = [tree.window(window) for tree in self._trees]
+    ids.append(buffer[_intersects(self._boxes[buffer], window)])
+    return np.sort(np.concatenate(ids))
+
+  def point(self, x: float, y: float) -> npt.NDArray[np.int64]:
+    """Ids of the polygons containing the point."""
+    ids = self.window(x, y, x, y)
+    p = np.array([[x, y]])
+    return ids[[_inside(self._corners[i], p)[0] for i in ids]].astype(
+      np.int64)
+
+  def nearest(self, x: float, y: float, k: int = 1):
+    """The ``k`` polygons nearest to a point.
+
+    Args:
+      x, y: Point
+      k: Number of polygons
+
+    Returns:
+      Ids and distances of the polygons, ordered by distance. Polygons
+      containing the point have distance 0.
+    """
+    candidates = [tree.nearest(x, y, k) for tree in self._trees]
+    candidates.append(self._buffer())
+    ids = np.concatenate(candidates).astype(np.int64)
+    dist = np.array([_distance(self._corners[i], x, y) for i in ids])
+    order = np.lexsort((ids, dist))[:k]
+    return ids[order], dist[order]
@@ -1,12 +1,277 @@
 """Structure :py:class:`Beam` and :py:class:`Tube` objects.
 """
+import concurrent.futures
+import hashlib
+import math
+from collections.abc import Iterable, Iterator
+import os
+import pathlib
+from multiprocessing.shared_memory import SharedMemory
 import numpy as np
+import numpy.typing as npt
+from fvr.typing import FloatArray
+
+def _sech(x: FloatArray) -> FloatArray:
+  """Hyperbolic secant without overflow for large arguments."""
+  e = np.exp(-np.abs(x))
+  return 2 * e / (1 + e * e)
+
+# Characteristic equations f(aL) = 0 divided by cosh(aL), which keeps them
+# bounded for high modes, their derivatives, and the bracket and asymptote
+# of root n as offsets to n*pi. Equations None have exact roots.
+_CHARACTERISTIC = {
+  # cos cosh + 1 = 0
+  'fixed-free': (
+    lambda b: np.cos(b) + _sech(b),
+    lambda b: -np.sin(b) - _sech(b) * np.tanh(b),
+    -np.pi, 0, -np.pi / 2),
+  # cos cosh - 1 = 0, without the rigid body modes of free-free
+  'fixed-fixed': (
+    lambda b: np.cos(b) - _sech(b),
+    lambda b: -np.sin(b) + _sech(b) * np.tanh(b),
+    0, np.pi, np.pi / 2),
+  # tan = tanh
+  'fixed-pinned': (
+    lambda b: np.sin(b) - np.cos(b) * np.tanh(b),
+    lambda b: np.cos(b) + np.sin(b) * np.tanh(b) - np.cos(b) * _sech(b)**2,
+    0, np.pi / 2, np.pi / 4),
+  # tan + tanh = 0
+  'fixed-guided': (
+    lambda b: np.sin(b) + np.cos(b) * np.tanh(b),
+    lambda b: np.cos(b) - np.sin(b) * np.tanh(b) + np.cos(b) * _sech(b)**2,
+    -np.pi / 2, 0, -np.pi / 4),
+  # sin = 0
+  'pinned-pinned': (None, None, 0, 0, 0),
+  # cos = 0
+  'pinned-guided': (None, None, -np.pi / 2, -np.pi / 2, -np.pi / 2),
+}
+_SUPPORTS = {
+  'fixed-free': 'fixed-free',
+  'fixed-fixed': 'fixed-fixed',
+  'free-free': 'fixed-fixed',
+  'fixed-pinned': 'fixed-pinned',
+  'pinned-free': 'fixed-pinned',
+  'fixed-guided': 'fixed-guided',
+  'free-guided': 'fixed-guided',
+  'pinned-pinned': 'pinned-pinned',
+  'guided-guided': 'pinned-pinned',
+  'pinned-guided': 'pinned-guided',
+}
+_ROOTS: dict[str, FloatArray] = {}  # memoized a_n L per equation
+
+def _support(support: str) -> str:
+  """Equation key of a support, the order of the beam ends is arbitrary."""
+  key = _SUPPORTS.get(support) or _SUPPORTS.get(
+    '-'.join(reversed(support.split('-'))))
+  if key is None:
+    raise ValueError(f"unknown support {support!r}.")
+  return key
+
+def _solve_roots(key: str, n: npt.NDArray[np.int64]) -> FloatArray:
+  """Roots ``n`` of a characteristic equation by safeguarded Newton steps.
+
+  Newton steps leaving the sign change bracket are replaced by bisection.
+  Beyond :math:`aL = 40` the equations equal their asymptotic form within
+  double precision, these roots are the asymptotes.
+  """
+  f, df, c_lo, c_hi, c_as = _CHARACTERISTIC[key]
+  x: FloatArray = n * np.pi + np.float64(c_as)
+  if f is None or df is None:
+    return x
+  solve = x < 40
+  lo, hi, x = n[solve] * np.pi + c_lo, n[solve] * np.pi + c_hi, x[solve]
+  flo = f(lo)
+  for _ in range(200):
+    fx = f(x)
+    left = np.sign(fx) == np.sign(flo)
+    lo, flo, hi = np.where(left, x, lo), np.where(left, fx, flo), \
+      np.where(left, hi, x)
+    with np.errstate(divide='ignore', invalid='ignore'):
+      xn = x - fx / df(x)
+    xn = np.where((xn > lo) & (xn < hi), xn, (lo + hi) / 2)
+    converged = np.all(np.abs(xn - x) <= 4 * np.finfo(float).eps * x)
+    x = xn
+    if converged:
+      break
+  res: FloatArray = n * np.pi + np.float64(c_as)
+  res[solve] = x
+  return res
+
+def characteristic_roots(
+    n: int | npt.ArrayLike, support: str = 'fixed-free') -> float | FloatArray:
+  r"""Roots :math:`a_n L` of the characteristic equation of a uniform beam.
+
+  Args:
+    n: Mode number (1 for first mode, ...), or array of mode numbers
+    support: Support of both beam ends, e.g. ``'fixed-free'``, see
+      :py:meth:`Beam.eigenfrequency`
+
+  The roots are computed once per equation for a table of modes, grown on
+  demand. Lookups are array indexing into the memoized table.
+
+  Example:
+    >>> characteristic_roots([1, 2, 3]).round(6)
+    array([1.875104, 4.694091, 7.854757])
+    >>> characteristic_roots(1, 'free-free').round(6)
+    np.float64(4.730041)
+  """
+  key = _support(support)
+  n = np.asarray(n, dtype=np.int64)
+  if np.any(n < 1):
+    raise ValueError("mode numbers start with 1.")
+  need = int(n.max()) if n.size else 0
+  table = _ROOTS.get(key, np.zeros(0))
+  if len(table) < need:
+    size = max(need, 2 * len(table), 16)
+    table = _ROOTS[key] = _solve_roots(key, np.arange(1, size + 1))
+  return table[n - 1]
+
+# derivatives d^m/dxi^m / (aL)^m, m = 0..3, of the basis cos, sin, e^(-aL xi),
+# e^(-aL (1-xi)) by the end conditions of a support
+_END_DERIVATIVES = {
+  'free': (2, 3), 'pinned': (0, 2), 'guided': (1, 3), 'fixed': (0, 1)}
+_SHAPES: dict[tuple, FloatArray] = {}  # memoized mode shapes
+_SHAPES_SIZE = 64
+
+def _basis(b: FloatArray, xi: float | FloatArray, m: int) -> FloatArray:
+  """Derivative ``m`` of the mode shape basis, shape ``b.shape + (4,)``."""
+  u = b * xi
+  # derivatives m of cos(u) and sin(u) are cos(u + m pi/2), sin(u + m pi/2)
+  trig = [np.cos(u), -np.sin(u), -np.cos(u), np.sin(u)]
+  return np.stack(np.broadcast_arrays(
+    trig[m % 4], trig[(m + 3) % 4], (-1)**m * np.exp(-u),
+    np.exp(-b * (1 - xi))), axis=-1)
+
+def _gram(b: FloatArray) -> FloatArray:
+  r"""Integrals :math:`\int_0^1 f_i f_j \,d\xi` of the basis, ``(..., 4, 4)``."""
+  c, s, e = np.cos(b), np.sin(b), np.exp(-b)
+  Ic = (1 + e * (s - c)) / (2 * b)  # int e^(-b xi) cos(b xi)
+  Is = (1 - e * (s + c)) / (2 * b)  # int e^(-b xi) sin(b xi)
+  Ee = -np.expm1(-2 * b) / (2 * b)
+  G = np.empty(b.shape + (4, 4))
+  G[..., 0, 0] = 0.5 + np.sin(2 * b) / (4 * b)
+  G[..., 1, 1] = 0.5 - np.sin(2 * b) / (4 * b)
+  G[..., 0, 1] = G[..., 1, 0] = s**2 / (2 * b)
+  G[..., 0, 2] = G[..., 2, 0] = Ic
+  G[..., 1, 2] = G[..., 2, 1] = Is
+  G[..., 0, 3] = G[..., 3, 0] = c * Ic + s * Is
+  G[..., 1, 3] = G[..., 3, 1] = s * Ic - c * Is
+  G[..., 2, 2] = G[..., 3, 3] = Ee
+  G[..., 2, 3] = G[..., 3, 2] = e
+  return G
+
+def mode_shapes(
+    n: int | npt.ArrayLike, xi: npt.ArrayLike,
+    support: str = 'fixed-free', derivative: int = 0) -> FloatArray:
+  r"""Normalized mode shapes :math:`\phi_n(\xi)` of a uniform beam.
+
+  The textbook form with :math:`\sinh` and :math:`\cosh` overflows and
+  cancels for high modes. The shapes are evaluated in the bounded basis
+
+  .. math::
+
+    \phi_n(\xi) = c_1 \cos{a_n L\xi} + c_2 \sin{a_n L\xi}
+      + c_3 e^{-a_n L\xi} + c_4 e^{-a_n L(1-\xi)}
+
+  with the coefficients from the null space of the end conditions. They
+  are normalized to :math:`\int_0^1 \phi_n^2 \,d\xi = 1` and signed so
+  that the largest of deflection, slope and curvature at :math:`\xi = 1`
+  is positive. The shapes are cached per support, modes and grid, the
+  returned arrays are read-only.
+
+  Args:
+    n: Mode number (1 for first mode, ...), or array of mode numbers
+    xi: Relative positions :math:`x/L` of the grid
+    support: Support of the beam ends at :math:`\xi = 0` and
+      :math:`\xi = 1`, e.g. ``'fixed-free'``
+    derivative: Order of the derivative
+      :math:`d^m\phi_n/d\xi^m`, e.g. 2 for the curvatures
+
+  Returns:
+    Mode shapes of shape ``n.shape + xi.shape``
+
+  Example:
+    >>> mode_shapes([1, 2], [0.25, 0.5, 1]).round(6)
+    array([[ 0.194572,  0.679046,  2.      ],
+           [-0.834518, -1.427332,  2.      ]])
+  """
+  n = np.asarray(n, dtype=np.int64)
+  xi = np.asarray(xi, dtype=np.float64)
+  key = (support, derivative, n.shape, n.tobytes(), xi.shape, xi.tobytes())
+  shapes = _SHAPES.get(key)
+  if shapes is not None:
+    return shapes
+  ends = support.split('-')
+  if len(ends) != 2 or not all(i in _END_DERIVATIVES for i in ends):
+    raise ValueError(f"unknown support {support!r}.")
+  b = np.asarray(characteristic_roots(n, support)).reshape(-1, 1)
+  A = np.stack([_basis(b, 0., m)[:, 0] for m in _END_DERIVATIVES[ends[0]]] +
+    [_basis(b, 1., m)[:, 0] for m in _END_DERIVATIVES[ends[1]]], axis=1)
+  c = np.linalg.svd(A)[2][:, -1]
+  c /= np.sqrt(np.einsum('ki,kij,kj->k', c, _gram(b[:, 0]), c))[:, None]
+  end = np.einsum('kmi,ki->km', np.stack(
+    [_basis(b, 1., m)[:, 0] for m in range(3)], axis=1), c)
+  c *= np.sign(end[np.arange(len(c)), np.argmax(np.abs(end), axis=1)])[:, None]
+  shapes = b**derivative * np.einsum(
+    'kgi,ki->kg', _basis(b, xi.reshape(1, -1), derivative), c)
+  shapes = shapes.reshape(n.shape + xi.shape)
+  shapes.flags.writeable = False
+  if len(_SHAPES) >= _SHAPES_SIZE:
+    del _SHAPES[next(iter(_SHAPES))]
+  _SHAPES[key] = shapes
+  return shapes
+
+
+class _Parameter:
+  """Parameter stored in a slot, setting it clears the cached properties.
+
+  The cached properties are the slots listed in ``_cached`` of the owner,
+  ``None`` marks a property to be computed on the next access. In-place
+  changes of array parameters are not tracked, assign the array again.
+  """
+
+  def __set_name__(self, owner: type, name: str):
+    self.slot = '_' + name
+
+  def __get__(self, obj, owner: type | None = None):
+    if obj is None:
+      return self
+    return getattr(obj, self.slot)
+
+  def __set__(self, obj, value):
+    setattr(obj, self.slot, value)
+    for i in obj._cached:
+      setattr(obj, i, None)
 
 class Beam:
   r"""Euler-Bernoulli beam.
+
+  The parameters may be NumPy arrays of designs, they are broadcast against
+  each other and the derived properties are arrays of the broadcast shape.
+
+  Example:
+    >>> beam = Beam(E=210e9, I=np.array([1e-8, 2e-8]), A=1e-4, L=1, rho=7850)
+    >>> beam.m
+    0.785
+    >>> beam.eigenfrequency([1, 2]).round(2)
+    array([[ 28.94,  40.93],
+           [181.38, 256.52]])
   """
+  __slots__ = ('_E', '_I', '_A', '_L', '_rho', '_V', '_mu', '_m')
+  _cached = ('_V', '_mu', '_m')
+  _V: float | FloatArray | None
+  _mu: float | FloatArray | None
+  _m: float | FloatArray | None
+  E = _Parameter()
+  I = _Parameter()
+  A = _Parameter()
+  L = _Parameter()
+  rho = _Parameter()
 
-  def __init__(self, E: float, I: float, A: float, L: float, rho: float):
+  def __init__(
+      self, E: float | FloatArray, I: float | FloatArray,
+      A: float | FloatArray, L: float | FloatArray,
+      rho: float | FloatArray):
     r"""
     Args:
       E: Elastic modulus / Young's modulus
@@ -26,29 +291,43 @@ class Beam:
     self.rho = rho
 
   @property
-  def V(self) -> float:
-    return self.A * self.L
+  def shape(self) -> tuple[int, ...]:
+    """Broadcast shape of the designs, ``()`` for a single beam."""
+    return np.broadcast_shapes(*map(np.shape, (
+      self.E, self.I, self.A, self.L, self.rho)))
 
   @property
-  def mu(self) -> float:
-    """Mass per unit length (or the product of density and cross-section)"""
-    return self.rho * self.A
+  def V(self) -> float | FloatArray:
+    if self._V is None:
+      self._V = self.A * self.L
+    return self._V
 
   @property
-  def m(self) -> float:
-    return self.mu * self.L
-    # return self.rho * self.V
+  def mu(self) -> float | FloatArray:
+    """Mass per unit length (or the product of density and cross-section)"""
+    if self._mu is None:
+      self._mu = self.rho * self.A
+    return self._mu
 
-  def eigenfrequency(self, n: int, support: str = 'fixed-free') -> float:
+  @property
+  def m(self) -> float | FloatArray:
+    if self._m is None:
+      self._m = self.mu * self.L
+      # self._m = self.rho * self.V
+    return self._m
+
+  def eigenfrequency(
+      self, n: int | npt.ArrayLike,
+      support: str = 'fixed-free') -> float | FloatArray:
     r"""Natural frequencies of the beam.
 
     Args:
-      n: Mode number (1 for first mode, ...)
-      support: only 'fixed-free' atm.
+      n: Mode number (1 for first mode, ...), or array of mode numbers
+      support: Support of both beam ends, see below
 
     Returns:
-      n-th natural frequencies of vibration
-      !!! Currently only the first four frequencies can be calculated.
+      n-th natural frequencies of vibration, shape ``n.shape + shape``, i.e.
+      modes x designs for array parameters
 
     Dynamic beam equation, the Euler-Lagrange equation, of an Euler-Bernoulli
     beam. The governing differential equation of motion, with :math:`\mu` the
@@ -101,7 +380,34 @@ class Beam:
 
     :math:`a_n` is a numerically solved value: :math:`a_1 L = 0.596864...\pi`,
     :math:`a_2 L = 1.49418...\pi`, :math:`a_3 L = 2.50025...\pi`, :math:`a_4 L =
-    3.49999...\pi`, ...
+    3.49999...\pi`, ..., :math:`a_n L \approx (2n-1)\pi/2`
+
+    Characteristic equations of the other supports, the order of the ends is
+    arbitrary. Rigid body modes of free and guided ends are excluded:
+
+    .. list-table::
+      :header-rows: 1
+
+      * - support
+        - equation
+        - :math:`a_n L \approx`
+      * - ``fixed-fixed``, ``free-free``
+        - :math:`\cos{aL}\,\cosh{aL}-1=0`
+        - :math:`(2n+1)\pi/2`
+      * - ``fixed-pinned``, ``pinned-free``
+        - :math:`\tan{aL}-\tanh{aL}=0`
+        - :math:`(4n+1)\pi/4`
+      * - ``fixed-guided``, ``free-guided``
+        - :math:`\tan{aL}+\tanh{aL}=0`
+        - :math:`(4n-1)\pi/4`
+      * - ``pinned-pinned``, ``guided-guided``
+        - :math:`\sin{aL}=0`
+        - :math:`n\pi`
+      * - ``pinned-guided``
+        - :math:`\cos{aL}=0`
+        - :math:`(2n-1)\pi/2`
+
+    See :py:func:`characteristic_roots`.
 
     .. math::
 
@@ -109,10 +415,393 @@ class Beam:
       f_n = \frac{a_n^2}{2\pi}\sqrt{\frac{E\,I}{\mu}}
 
     """
-    a2_n = [0.596864, 1.49418, 2.50025, 3.49999]  # a_n*L/pi
-    a_n = a2_n[n - 1] * np.pi / self.L if n < len(a2_n) else 0
+    aL_n = np.asarray(characteristic_roots(n, support))
+    # modes along the leading axes, designs along the trailing axes
+    aL_n = aL_n.reshape(aL_n.shape + (1,) * len(self.shape))
+    a_n = aL_n / self.L
     return a_n**2 * np.sqrt(self.E * self.I / self.mu) / (2 * np.pi)
 
+  def mode_shape(
+      self, n: int | npt.ArrayLike, xi: npt.ArrayLike,
+      support: str = 'fixed-free') -> FloatArray:
+    r"""Mass normalized mode shapes of the beam.
+
+    .. math::
+
+      \int_0^L \mu\,\phi_n^2 \,dx = 1
+
+    Args:
+      n: Mode number (1 for first mode, ...), or array of mode numbers
+      xi: Relative positions :math:`x/L` of the grid
+      support: Support of both beam ends
+
+    Returns:
+      Mode shapes of shape ``n.shape + xi.shape + self.shape``
+
+    See also:
+      :py:func:`mode_shapes`
+    """
+    shapes = mode_shapes(n, xi, support)
+    return shapes.reshape(shapes.shape + (1,) * len(self.shape)) / \
+      np.sqrt(self.m)
+
+  def transient(
+      self, load: npt.NDArray | Iterable[npt.ArrayLike], dt: float,
+      modes: int = 10, support: str = 'fixed-free', *,
+      zeta: float | npt.ArrayLike = 0.02, at: float = 1.,
+      deflection_at: npt.ArrayLike = (1.,), moment_at: npt.ArrayLike = (0.,),
+      chunk: int = 1 << 16) -> Iterator[tuple[FloatArray, FloatArray]]:
+    r"""Transient response to a point load history by modal superposition.
+
+    Each modal coordinate :math:`q_n` of the mass normalized modes
+    :math:`\phi_n`, see :py:meth:`mode_shape`, follows
+
+    .. math::
+
+      \ddot{q}_n + 2\zeta_n\omega_n\dot{q}_n + \omega_n^2 q_n =
+      \phi_n(x_F) F(t)
+
+    and is advanced by the exact recurrence of a load varying linearly
+    within each time step, applied as second order recursive filter. The
+    filter states are carried from chunk to chunk, so the load is consumed
+    and the response produced in chunks of bounded memory. The beam is at
+    rest and unloaded one time step before the first sample.
+
+    .. math::
+
+      w(x, t) = \sum_n \phi_n(x) q_n(t) \quad,\quad
+      M(x, t) = E I \sum_n \phi_n''(x) q_n(t)
+
+    Requires SciPy.
+
+    Args:
+      load: Force history :math:`F` sampled with ``dt``, an array, e.g. a
+        memory map, or an iterable of chunks
+      dt: Time step
+      modes: Number of modes
+      support: Support of both beam ends
+      zeta: Damping ratio, scalar or one per mode, :math:`0 \le \zeta < 1`
+      at: Relative position :math:`x_F/L` of the load
+      deflection_at: Relative positions of the deflections
+      moment_at: Relative positions of the bending moments
+      chunk: Chunk size of array loads
+
+    Yields:
+      Deflections, shape ``(samples, len(deflection_at))``, and bending
+      moments, shape ``(samples, len(moment_at))``, per chunk of the load
+
+    Example:
+      >>> beam = Beam(E=210e9, I=1e-8, A=1e-4, L=1, rho=7850)
+      >>> w, M = next(beam.transient(np.full(20000, 10.), dt=1e-3))
+      >>> (w[-1] * 1e3).round(3), M[-1].round(1)
+      (array([1.587]), array([10.]))
+    """
+    import scipy.signal
+    if self.shape:
+      raise ValueError("transient response of a single beam only.")
+    zeta = np.asarray(zeta, dtype=np.float64)
+    if not (0 <= np.min(zeta) and np.max(zeta) < 1):
+      raise ValueError("damping ratio has to be in [0, 1).")
+    n = np.arange(1, modes + 1)
+    omega = 2 * np.pi * np.asarray(self.eigenfrequency(n, support))
+    b, a = _modal_filter(omega, np.broadcast_to(zeta, omega.shape), dt)
+    force = self.mode_shape(n, at, support)
+    deflection = self.mode_shape(n, np.ravel(deflection_at), support)
+    moment = self.E * self.I / self.L**2 * mode_shapes(
+      n, np.ravel(moment_at), support, derivative=2) / np.sqrt(self.m)
+    zi = np.zeros((modes, 2))
+    if isinstance(load, np.ndarray):
+      chunks: Iterable[npt.ArrayLike] = (
+        load[i:i + chunk] for i in range(0, len(load), chunk))
+    else:
+      chunks = load
+    for F in chunks:
+      F = np.atleast_1d(np.asarray(F, dtype=np.float64))
+      q = np.empty((modes, len(F)))
+      for i in range(modes):
+        q[i], zi[i] = scipy.signal.lfilter(b[i], a[i], force[i] * F, zi=zi[i])
+      yield q.T @ deflection, q.T @ moment
+
+def _modal_filter(
+    omega: FloatArray, zeta: FloatArray,
+    dt: float) -> tuple[FloatArray, FloatArray]:
+  r"""Recursive filter coefficients of damped modal oscillators.
+
+  Exact recurrence of the displacement of a unit mass oscillator under a
+  force varying linearly within each time step,
+
+  .. math::
+
+    u_{i+1} = A u_i + B v_i + C p_i + D p_{i+1} \quad,\quad
+    v_{i+1} = A' u_i + B' v_i + C' p_i + D' p_{i+1}
+
+  eliminated to a second order filter of the force :math:`p`.
+
+  References:
+    - Chopra, Anil K. 2012. Dynamics of Structures. 4th ed. Upper Saddle
+      River: Prentice Hall. ch. 5.2.
+
+  Returns:
+    Numerator and denominator coefficients, shape ``(modes, 3)``
+  """
+  k = omega**2
+  r = np.sqrt(1 - zeta**2)
+  wd = omega * r
+  e = np.exp(-zeta * omega * dt)
+  s, c = np.sin(wd * dt), np.cos(wd * dt)
+  B = e * s / wd
+  C = (2 * zeta / (omega * dt) + e * (((1 - 2 * zeta**2) / (wd * dt) -
+    zeta / r) * s - (1 + 2 * zeta / (omega * dt)) * c)) / k
+  D = (1 - 2 * zeta / (omega * dt) + e * ((2 * zeta**2 - 1) / (wd * dt) * s +
+    2 * zeta / (omega * dt) * c)) / k
+  B_ = e * (c - zeta / r * s)
+  C_ = (-1 / dt + e * ((omega / r + zeta / (dt * r)) * s + c / dt)) / k
+  D_ = (1 - e * (zeta / r * s + c)) / (k * dt)
+  b = np.stack([D, C - B_ * D + B * D_, B * C_ - B_ * C], axis=-1)
+  a = np.stack([np.ones_like(e), -2 * e * c, e**2], axis=-1)
+  return b, a
+
+# degrees of freedom fixed by an end support: deflection w, slope theta
+_END_DOFS = {'free': (), 'pinned': (0,), 'guided': (1,), 'fixed': (0, 1)}
+
+class BeamFE:
+  r"""Euler-Bernoulli finite element model of a non-uniform beam.
+
+  Cubic Hermite elements with deflection :math:`w` and slope
+  :math:`\theta` at each node. Stiffness and consistent mass matrices are
+  assembled directly in symmetric banded storage (3 upper diagonals) and
+  solved with sparse factorizations, so memory and time grow linearly with
+  the number of elements.
+
+  Requires SciPy.
+
+  Example:
+    >>> fe = BeamFE(E=1, I=2, A=3, rho=5, L=4, n=100)
+    >>> fe.eigenfrequency(1).round(8)
+    np.float64(0.01277086)
+    >>> Beam(1, 2, 3, 4, 5).eigenfrequency(1).round(8)
+    np.float64(0.01277086)
+  """
+
+  def __init__(self, E, I, A, rho, L: float | FloatArray, n: int | None = None):
+    r"""
+    Args:
+      E: Elastic modulus / Young's modulus
+      I: Second moment of area of the beam's cross-section
+      A: Cross-section
+      rho: Density
+      L: Length of the beam or array of the element lengths
+      n: Number of elements, defaults to the length of the array arguments
+
+    ``E``, ``I``, ``A`` and ``rho`` are scalars, arrays with one value per
+    element or profile functions of the position :math:`x`, evaluated at
+    the element centers.
+    """
+    if n is None:
+      sizes = [np.size(i) for i in (E, I, A, rho, L)
+        if not callable(i) and np.ndim(i)]
+      if not sizes:
+        raise ValueError("n is not defined.")
+      n = sizes[0]
+    le = np.broadcast_to(np.asarray(L, dtype=np.float64), (n,)) \
+      if np.ndim(L) else np.full(n, L / n)
+    self.x = np.concatenate([[0], np.cumsum(le)])
+    self.le = le
+    xm = (self.x[:-1] + self.x[1:]) / 2
+    profile = lambda v: np.broadcast_to(
+      np.asarray(v(xm) if callable(v) else v, dtype=np.float64), (n,))
+    self.E, self.I, self.A, self.rho = map(profile, (E, I, A, rho))
+    self._K, self._M = self._assemble()
+    self._cache: dict = {}
+
+  @property
+  def L(self) -> float:
+    return float(self.x[-1])
+
+  @property
+  def m(self) -> float:
+    return float(np.sum(self.rho * self.A * self.le))
+
+  def _assemble(self) -> tuple[FloatArray, FloatArray]:
+    """Stiffness and mass matrix in upper banded storage ``(4, dofs)``."""
+    l = self.le
+    k = self.E * self.I / l**3
+    m = self.rho * self.A * l / 420
+    o = np.ones_like(l)
+    ke = k[:, None, None] * np.array([
+      [12 * o, 6 * l, -12 * o, 6 * l],
+      [6 * l, 4 * l**2, -6 * l, 2 * l**2],
+      [-12 * o, -6 * l, 12 * o, -6 * l],
+      [6 * l, 2 * l**2, -6 * l, 4 * l**2]]).transpose(2, 0, 1)
+    me = m[:, None, None] * np.array([
+      [156 * o, 22 * l, 54 * o, -13 * l],
+      [22 * l, 4 * l**2, 13 * l, -3 * l**2],
+      [54 * o, 13 * l, 156 * o, -22 * l],
+      [-13 * l, -3 * l**2, -22 * l, 4 * l**2]]).transpose(2, 0, 1)
+    dofs = 2 * len(l) + 2
+    K, M = np.zeros((4, dofs)), np.zeros((4, dofs))
+    for a in range(4):
+      for b in range(a, 4):
+        # element e couples the global dofs 2e+a and 2e+b
+        K[3 + a - b, b::2][:len(l)] += ke[:, a, b]
+        M[3 + a - b, b::2][:len(l)] += me[:, a, b]
+    return K, M
+
+  def _constrained(self, support: str):
+    """Free dofs and number of rigid body modes of a support."""
+    ends = support.split('-')
+    if len(ends) != 2 or not all(i in _END_DOFS for i in ends):
+      raise ValueError(f"unknown support {support!r}.")
+    dofs = self._K.shape[1]
+    fixed = [i for i in _END_DOFS[ends[0]]] + \
+      [dofs - 2 + i for i in _END_DOFS[ends[1]]]
+    fixed_w = sum(1 for i in ends if 0 in _END_DOFS[i])
+    fixed_theta = sum(1 for i in ends if 1 in _END_DOFS[i])
+    rigid = (fixed_w == 0) + (fixed_theta == 0 and fixed_w <= 1)
+    return np.setdiff1d(np.arange(dofs), fixed), int(rigid)
+
+  @staticmethod
+  def _sparse(B: FloatArray):
+    """Symmetric sparse matrix of upper banded storage."""
+    import scipy.sparse
+    u = len(B) - 1
+    diagonals = [B[u]] + [B[u - d, d:] for d in range(1, u + 1)] * 2
+    offsets = [0] + list(range(1, u + 1)) + [-d for d in range(1, u + 1)]
+    return scipy.sparse.diags_array(diagonals, offsets=offsets, format='csc')
+
+  def _solver(self, support: str, sigma: float = 0):
+    r"""Solver of :math:`(K - \sigma M) u = f` on the free dofs.
+
+    The stiffness is factored as :math:`K = G^T D G` with the end rotations
+    relative to the chord of each element, :math:`G u`, and the element
+    flexibilities :math:`D^{-1}`. The mixed system
+
+    .. math::
+
+      \begin{bmatrix} D^{-1} & G \\ G^T & \sigma M \end{bmatrix}
+      \begin{bmatrix} s \\ u \end{bmatrix} =
+      \begin{bmatrix} 0 \\ -f \end{bmatrix}
+
+    is sparse and its condition grows with :math:`n^2` instead of the
+    :math:`n^4` of :math:`K`, which keeps the lowest modes accurate for
+    :math:`10^5` elements.
+    """
+    import scipy.sparse
+    import scipy.sparse.linalg
+    free, _ = self._constrained(support)
+    n = len(self.le)
+    e = np.arange(n)
+    l = self.le
+    c = l / (6 * self.E * self.I)
+    G = scipy.sparse.csc_array((
+      np.concatenate([1 / l, np.ones(n), -1 / l, 1 / l, -1 / l, np.ones(n)]),
+      (np.concatenate([2 * e] * 3 + [2 * e + 1] * 3),
+       np.concatenate([2 * e, 2 * e + 1, 2 * e + 2, 2 * e, 2 * e + 2,
+         2 * e + 3]))), shape=(2 * n, 2 * n + 2))[:, free]
+    Dinv = scipy.sparse.csc_array((
+      np.concatenate([2 * c, -c, -c, 2 * c]),
+      (np.concatenate([2 * e, 2 * e, 2 * e + 1, 2 * e + 1]),
+       np.concatenate([2 * e, 2 * e + 1, 2 * e, 2 * e + 1]))),
+      shape=(2 * n, 2 * n))
+    M = self._sparse(self._M)[free][:, free]
+    lu = scipy.sparse.linalg.splu(scipy.sparse.block_array(
+      [[Dinv, G], [G.T, sigma * M]], format='csc'))
+    rhs = np.zeros(2 * n + len(free))
+    def solve(f):
+      rhs[2 * n:] = -f
+      return lu.solve(rhs)[2 * n:]
+    return solve, free, M
+
+  def modes(self, k: int = 1, support: str = 'fixed-free'):
+    r"""Lowest natural frequencies and mode shapes, cached per support.
+
+    Solves the generalized eigenproblem :math:`K\phi = \omega^2 M\phi` in
+    shift-invert mode with a sparse factorization, see :py:meth:`_solver`.
+    Rigid body modes of free and guided ends are excluded.
+
+    Args:
+      k: Number of modes
+      support: Support of both beam ends, e.g. ``'fixed-free'``, see
+        :py:meth:`Beam.eigenfrequency`
+
+    Returns:
+      Natural frequencies :math:`f_n`, shape ``(k,)``, and mass normalized
+      deflections at the nodes :py:attr:`x`, shape ``(k, n+1)``
+    """
+    cached = self._cache.get(support)
+    if cached is None or len(cached[0]) < k:
+      import scipy.sparse.linalg
+      _, rigid = self._constrained(support)
+      # a negative shift keeps the factorization regular with rigid modes
+      sigma = -np.mean(self.E * self.I) / (
+        np.mean(self.rho * self.A) * self.L**4)
+      solve, free, M = self._solver(support, sigma)
+      OPinv = scipy.sparse.linalg.LinearOperator(
+        M.shape, matvec=solve, dtype=np.float64)
+      lam, phi = scipy.sparse.linalg.eigsh(
+        self._sparse(self._K)[free][:, free],
+        k=min(k + rigid, len(free) - 1), M=M, sigma=sigma, which='LM',
+        OPinv=OPinv)
+      order = np.argsort(lam)[rigid:]
+      lam, phi = lam[order], phi[:, order]
+      f = np.sqrt(np.maximum(lam, 0)) / (2 * np.pi)
+      u = np.zeros((len(f), self._K.shape[1]))
+      u[:, free] = phi.T
+      w = u[:, 0::2]
+      # sign convention: largest deflection positive
+      w *= np.sign(w[np.arange(len(w)), np.argmax(np.abs(w), axis=1)])[:, None]
+      cached = self._cache[support] = (f, w)
+    return cached[0][:k], cached[1][:k]
+
+  def eigenfrequency(
+      self, n: int | npt.ArrayLike,
+      support: str = 'fixed-free') -> float | FloatArray:
+    """Natural frequencies of the beam, see :py:meth:`Beam.eigenfrequency`.
+
+    Args:
+      n: Mode number (1 for first mode, ...), or array of mode numbers
+      support: Support of both beam ends
+    """
+    n = np.asarray(n, dtype=np.int64)
+    if np.any(n < 1):
+      raise ValueError("mode numbers start with 1.")
+    f, _ = self.modes(int(n.max()) if n.size else 1, support)
+    return f[n - 1]
+
+  def deflection(
+      self, q: float | FloatArray | None = None,
+      support: str = 'fixed-free',
+      F: FloatArray | None = None) -> tuple[FloatArray, FloatArray]:
+    r"""Static deflection under distributed and nodal loads.
+
+    Solves :math:`K u = f`, see :py:meth:`_solver`.
+
+    Args:
+      q: Distributed load per unit length, scalar, one value per element or
+        profile function of :math:`x`
+      support: Support of both beam ends
+      F: Nodal forces, shape ``(n+1,)``
+
+    Returns:
+      Deflection :math:`w` and slope :math:`\theta` at the nodes
+    """
+    f = np.zeros(self._K.shape[1])
+    if q is not None:
+      l = self.le
+      xm = (self.x[:-1] + self.x[1:]) / 2
+      q = np.broadcast_to(np.asarray(
+        q(xm) if callable(q) else q, dtype=np.float64), l.shape)
+      # consistent load vector of a uniform load on each element
+      fe = np.stack([q * l / 2, q * l**2 / 12, q * l / 2, -q * l**2 / 12])
+      for a in range(4):
+        f[a::2][:len(l)] += fe[a]
+    if F is not None:
+      f[0::2] += F
+    solve, free, _ = self._solver(support)
+    u = np.zeros_like(f)
+    u[free] = solve(f[free])
+    return u[0::2], u[1::2]
+
 class TubeBuckling:
   r"""Long thin circular tube uniformly loaded with external pressure.
 
@@ -127,6 +816,7 @@ class TubeBuckling:
       Stability. 2nd ed. New York: McGraw-Hill Book. ch. 7.
 
   """
+  __slots__ = ('E', 'nu', 'r', 'h', 's', 'q')
 
   def __init__(
       self, E: float, nu: float, r: float, *, h: float | None = None,
@@ -273,9 +963,120 @@ class TubeBuckling:
       raise ValueError("s is not defined.")
     return np.sqrt(self.s * (1 - self.nu**2) / self.E) * (2 * self.r)
 
+class TubeBucklingSet:
+  r"""Batch of long thin circular tubes, see :py:class:`TubeBuckling`.
+
+  Struct of arrays: every parameter is stored as one float array broadcast
+  to a common shape, and missing values of ``h``, ``q`` and ``s`` are NaN.
+  All results are computed for every row in one vectorized pass and
+  returned as masked arrays, masked where an input of the row is missing
+  instead of raising a ``ValueError``.
+
+  Example:
+    >>> tubes = TubeBucklingSet(1, 0.2, 3, h=[4, np.nan], q=[np.nan, 0.5])
+    >>> tubes.pressure().round(4)
+    masked_array(data=[0.6173, --],
+                 mask=[False,  True],
+           fill_value=1e+20)
+    >>> tubes.thickness().round(4)
+    masked_array(data=[4.0, 3.7287],
+                 mask=[False, False],
+           fill_value=1e+20)
+  """
+
+  def __init__(
+      self, E: npt.ArrayLike, nu: npt.ArrayLike, r: npt.ArrayLike, *,
+      h: npt.ArrayLike | None = None, q: npt.ArrayLike | None = None,
+      s: npt.ArrayLike | None = None):
+    r"""
+    Args:
+      E: Young's modulus
+      nu: Poisson's ratio
+      r: mean radius (:math:`r_\text{a}` + :math:`r_\text{i}`)/2
+      h: thickness, NaN where not given
+      s: internal stress, NaN where not given
+      q: external pressure, NaN where not given
+    """
+    nan = lambda v: np.nan if v is None else v
+    self.E, self.nu, self.r, self.h, self.q, self.s = (
+      np.array(i, dtype=np.float64) for i in np.broadcast_arrays(
+        E, nu, r, nan(h), nan(q), nan(s)))
+
+  @classmethod
+  def from_tubes(cls, tubes) -> 'TubeBucklingSet':
+    """Batch of :py:class:`TubeBuckling` objects, ``None`` becomes NaN."""
+    tubes = list(tubes)
+    column = lambda name: np.array(
+      [np.nan if getattr(i, name) is None else getattr(i, name)
+        for i in tubes], dtype=np.float64)
+    return cls(*map(column, ('E', 'nu', 'r')),
+      **{i: column(i) for i in ('h', 'q', 's')})
+
+  def __len__(self) -> int:
+    return len(self.E)
+
+  @property
+  def shape(self) -> tuple[int, ...]:
+    return self.E.shape
+
+  @staticmethod
+  def _masked(values: FloatArray, *inputs: FloatArray) -> np.ma.MaskedArray:
+    """Results masked where one of the inputs is missing."""
+    mask = np.zeros(values.shape, dtype=bool)
+    for i in inputs:
+      mask |= np.isnan(i)
+    return np.ma.MaskedArray(values, mask=mask)
+
+  def force(self) -> np.ma.MaskedArray:
+    """Critical buckling force, see :py:meth:`TubeBuckling.force`."""
+    return self._masked(
+      self.E * self.h**3 / (4 * (1 - self.nu**2) * self.r**2), self.h)
+
+  def pressure(self) -> np.ma.MaskedArray:
+    """Critical buckling pressure, see :py:meth:`TubeBuckling.pressure`."""
+    return self._masked(
+      self.E / (4 * (1 - self.nu**2)) * (self.h / self.r)**3, self.h)
+
+  def stress(self) -> np.ma.MaskedArray:
+    """Critical buckling stress, see :py:meth:`TubeBuckling.stress`."""
+    return self._masked(
+      self.E / (1 - self.nu**2) * (self.h / (2 * self.r))**2, self.h)
+
+  def thickness(self) -> np.ma.MaskedArray:
+    """Critical buckling thickness, see :py:meth:`TubeBuckling.thickness`.
+
+    Per row the stress takes precedence over the pressure and the pressure
+    over the given thickness. Rows without any of them are masked.
+    """
+    h = np.where(np.isnan(self.s), np.where(
+      np.isnan(self.q), self.h, self.thickness_pressure().data),
+      self.thickness_stress().data)
+    return self._masked(h, h)
+
+  def thickness_pressure(self) -> np.ma.MaskedArray:
+    """Thickness regarding the external pressure, see
+    :py:meth:`TubeBuckling.thickness_pressure`."""
+    return self._masked(
+      np.cbrt(self.q * 4 * (1 - self.nu**2) / self.E) * self.r, self.q)
+
+  def thickness_stress(self) -> np.ma.MaskedArray:
+    """Thickness regarding the internal stress, see
+    :py:meth:`TubeBuckling.thickness_stress`."""
+    return self._masked(
+      np.sqrt(self.s * (1 - self.nu**2) / self.E) * (2 * self.r), self.s)
+
 class Plate:
   r"""Thin circular plate uniformly loaded with external pressure.
 
+  The parameters may be NumPy arrays of designs, see :py:class:`Beam`.
+  Radial fields are evaluated on a grid of radii along the trailing axes.
+
+  Example:
+    >>> plate = Plate(E=210e9, nu=0.3, ra=np.array([0.1, 0.2]), h=2e-3)
+    >>> (plate.deflection_field(1e5, [0, 0.05, 0.1]) * 1e3).round(3)
+    array([[ 1.016,  0.571,  0.   ],
+           [16.25 , 14.282,  9.141]])
+
   Important:
     Can be used as long as the corresponding stress does not exeed the
     proportional limit of the material.
@@ -285,6 +1086,13 @@ class Plate:
       and Shells. 2nd ed. New York: McGraw-Hill Book.
 
   """
+  __slots__ = ('_E', '_nu', '_ra', '_h', '_D')
+  _cached = ('_D',)
+  _D: float | None
+  E = _Parameter()
+  nu = _Parameter()
+  ra = _Parameter()
+  h = _Parameter()
 
   def __init__(self, E: float, nu: float, ra: float, h: float):
     """
@@ -300,6 +1108,12 @@ class Plate:
     self.ra = ra
     self.h = h
 
+  @property
+  def shape(self) -> tuple[int, ...]:
+    """Broadcast shape of the designs, ``()`` for a single plate."""
+    return np.broadcast_shapes(*map(np.shape, (
+      self.E, self.nu, self.ra, self.h)))
+
   @property
   def D(self) -> float:
     r"""Flexural rigidity of the plate.
@@ -308,7 +1122,9 @@ class Plate:
 
       D = \frac{E\,h^3}{12(1-\nu^2)}
     """
-    return self.E * self.h**3 / (12 * (1 - self.nu**2))
+    if self._D is None:
+      self._D = self.E * self.h**3 / (12 * (1 - self.nu**2))
+    return self._D
 
   def deflection(self, q, support: str = 'clamped') -> float | None:
     r"""Central deflection of a clamped supported circular plate.
@@ -357,3 +1173,497 @@ class Plate:
         and Shells. 2nd ed. New York: McGraw-Hill Book. p. 57.
     """
     return q * self.ra**4 / (64 * self.D) * (5 + self.nu) / (1 + self.nu)
+
+  def _field(
+      self, q, r: npt.ArrayLike) -> tuple[
+        FloatArray, FloatArray, FloatArray, FloatArray, FloatArray]:
+    """Designs broadcast against the radii along the trailing axes."""
+    radii = np.asarray(r, dtype=np.float64)
+    shape = np.broadcast_shapes(self.shape, np.shape(q))
+    def expand(v) -> FloatArray:
+      return np.reshape(
+        np.broadcast_to(np.asarray(v, dtype=np.float64), shape),
+        shape + (1,) * radii.ndim)
+    return (
+      expand(q), expand(self.ra), expand(self.nu), expand(self.D), radii)
+
+  def deflection_field(
+      self, q, r: npt.ArrayLike, support: str = 'clamped') -> FloatArray:
+    r"""Deflection :math:`w(r)` of a circular plate.
+
+    Args:
+      q: external pressure
+      r: radii, :math:`0 \le r \le r_\text{a}`
+      support: clamped, simple
+
+    Returns:
+      Deflection of shape ``designs + r.shape``
+
+    .. math::
+
+      w_\text{clamped} = \frac{q}{64D} \left(r_\text{a}^2 - r^2\right)^2
+
+    .. math::
+
+      w_\text{simple} = \frac{q \left(r_\text{a}^2 - r^2\right)}{64D}
+      \left(\frac{5+\nu}{1+\nu} r_\text{a}^2 - r^2\right)
+
+    References:
+      - Timoshenko, Stephen P., and S. Woinowsky-Krieger. 1959. Theory of Plates
+        and Shells. 2nd ed. New York: McGraw-Hill Book. p. 55-57.
+    """
+    q, a, nu, D, r = self._field(q, r)
+    if support == 'clamped':
+      return q * (a**2 - r**2)**2 / (64 * D)
+    if support == 'simple':
+      return q * (a**2 - r**2) / (64 * D) * (
+        (5 + nu) / (1 + nu) * a**2 - r**2)
+    raise ValueError(f"unknown support {support!r}.")
+
+  def moments(
+      self, q, r: npt.ArrayLike,
+      support: str = 'clamped') -> tuple[FloatArray, FloatArray]:
+    r"""Radial and tangential bending moments per unit length.
+
+    Args:
+      q: external pressure
+      r: radii, :math:`0 \le r \le r_\text{a}`
+      support: clamped, simple
+
+    Returns:
+      :math:`M_r` and :math:`M_t` of shape ``designs + r.shape``
+
+    .. math::
+
+      M_{r,\text{clamped}} = \frac{q}{16}
+      \left(r_\text{a}^2 (1+\nu) - r^2 (3+\nu)\right) \quad,\quad
+      M_{t,\text{clamped}} = \frac{q}{16}
+      \left(r_\text{a}^2 (1+\nu) - r^2 (1+3\nu)\right)
+
+    .. math::
+
+      M_{r,\text{simple}} = \frac{q}{16} (3+\nu) (r_\text{a}^2 - r^2)
+      \quad,\quad
+      M_{t,\text{simple}} = \frac{q}{16}
+      \left(r_\text{a}^2 (3+\nu) - r^2 (1+3\nu)\right)
+
+    References:
+      - Timoshenko, Stephen P., and S. Woinowsky-Krieger. 1959. Theory of Plates
+        and Shells. 2nd ed. New York: McGraw-Hill Book. p. 55-57.
+    """
+    q, a, nu, _, r = self._field(q, r)
+    if support == 'clamped':
+      Mr = q / 16 * (a**2 * (1 + nu) - r**2 * (3 + nu))
+      Mt = q / 16 * (a**2 * (1 + nu) - r**2 * (1 + 3 * nu))
+    elif support == 'simple':
+      Mr = q / 16 * (3 + nu) * (a**2 - r**2)
+      Mt = q / 16 * (a**2 * (3 + nu) - r**2 * (1 + 3 * nu))
+    else:
+      raise ValueError(f"unknown support {support!r}.")
+    return Mr, Mt
+
+  def stresses(
+      self, q, r: npt.ArrayLike,
+      support: str = 'clamped') -> tuple[FloatArray, FloatArray]:
+    r"""Radial and tangential stresses at the surface of the plate.
+
+    Tension at the lower surface, i.e. the side opposite to the pressure,
+    is positive.
+
+    Args:
+      q: external pressure
+      r: radii, :math:`0 \le r \le r_\text{a}`
+      support: clamped, simple
+
+    Returns:
+      :math:`\sigma_r` and :math:`\sigma_t` of shape ``designs + r.shape``
+
+    .. math::
+
+      \sigma = \frac{6 M}{h^2}
+
+    See also:
+      :py:meth:`moments`
+    """
+    Mr, Mt = self.moments(q, r, support)
+    shape = np.broadcast_shapes(self.shape, np.shape(q))
+    h = np.reshape(np.broadcast_to(self.h, shape),
+      shape + (1,) * (Mr.ndim - len(shape)))
+    return 6 * Mr / h**2, 6 * Mt / h**2
+
+def minimum_size(
+    margins, lo: npt.ArrayLike, hi: npt.ArrayLike, *, rtol: float = 1e-12,
+    maxiter: int = 200) -> FloatArray:
+  r"""Smallest size per design meeting all constraints.
+
+  Vectorized bracketing and bisection over all designs at once. The
+  margins are functions of the size array returning arrays of the designs,
+  a design is feasible where all margins are :math:`\ge 0`, and the
+  margins have to be increasing with the size. The upper bound is doubled
+  until it is feasible, the bisection is geometric for positive bounds.
+
+  Args:
+    margins: Margin function or sequence of margin functions
+    lo: Lower bound of the size, returned where it is already feasible
+    hi: Initial upper bound of the size
+    rtol: Relative tolerance of the size
+    maxiter: Maximum number of bisection steps
+
+  Returns:
+    Minimal size per design, NaN where no feasible size is found
+
+  Example:
+    >>> minimum_size(lambda x: x**2 - np.array([2, 9, 0.1]), 0.5, 1).round(6)
+    array([1.414214, 3.      , 0.5     ])
+  """
+  margins = [margins] if callable(margins) else list(margins)
+  feasible = lambda x: np.logical_and.reduce(
+    np.broadcast_arrays(*[m(x) >= 0 for m in margins]))
+  lo, hi = (np.array(i, dtype=np.float64) for i in np.broadcast_arrays(lo, hi))
+  lo, hi = np.broadcast_arrays(lo, hi, feasible(lo))[:2]
+  lo, hi = lo.copy(), hi.copy()
+  low = feasible(lo)
+  size = np.where(low, lo, np.nan)
+  active = ~low
+  for _ in range(64):
+    ok = feasible(hi)
+    expand = active & ~ok
+    if not expand.any():
+      break
+    lo = np.where(expand, hi, lo)
+    hi = np.where(expand, 2 * hi, hi)
+  active &= feasible(hi)
+  for _ in range(maxiter):
+    active &= hi - lo > rtol * hi
+    if not active.any():
+      break
+    mid = np.where(lo > 0, np.sqrt(lo * hi), (lo + hi) / 2)
+    ok = feasible(mid)
+    hi = np.where(active & ok, mid, hi)
+    lo = np.where(active & ~ok, mid, lo)
+  return np.where(low | np.isnan(size) & ~feasible(hi), size, hi)
+
+def size_beam(
+    beam: Beam, f1: npt.ArrayLike, n: int = 1, support: str = 'fixed-free',
+    exponent: float = 2, **kwargs) -> tuple[FloatArray, FloatArray]:
+  r"""Minimal scaling of a beam section meeting a natural frequency.
+
+  The section dimensions are scaled by :math:`c`, so that
+  :math:`A = c^2 A_0` and :math:`I = c^{2+\text{exponent}} I_0`, e.g.
+  exponent 2 for geometrically similar sections and 0 for scaled wall
+  thicknesses of thin-walled sections.
+
+  Args:
+    beam: Beam or array of beams of the reference section
+    f1: Minimal natural frequency of mode ``n``
+    n: Mode number
+    support: Support of both beam ends
+    kwargs: Bounds and tolerances of :py:func:`minimum_size`, the bounds
+      default to ``lo=1e-6`` and ``hi=1``
+
+  Returns:
+    Scaling :math:`c` and mass per design
+
+  Example:
+    >>> beam = Beam(E=210e9, I=1e-8, A=1e-4, L=1, rho=7850)
+    >>> c, m = size_beam(beam, [10, 100])
+    >>> c.round(6), m.round(6)
+    (array([0.345505, 3.45505 ]), array([0.093708, 9.370834]))
+  """
+  f1 = np.asarray(f1)
+  shape = np.broadcast_shapes(beam.shape, f1.shape)
+  def margin(c):
+    scaled = Beam(
+      beam.E, beam.I * c**(2 + exponent), beam.A * c**2, beam.L, beam.rho)
+    return scaled.eigenfrequency(n, support) - f1
+  kwargs = {'lo': 1e-6, 'hi': 1, **kwargs}
+  kwargs['lo'] = np.broadcast_to(kwargs['lo'], shape)
+  c = minimum_size(margin, **kwargs)
+  return c, beam.m * c**2
+
+def size_tube(
+    E: npt.ArrayLike, nu: npt.ArrayLike, rho: npt.ArrayLike,
+    r: npt.ArrayLike, L: npt.ArrayLike, *, f1: npt.ArrayLike | None = None,
+    q_cr: npt.ArrayLike | None = None, support: str = 'fixed-free',
+    **kwargs) -> tuple[FloatArray, FloatArray]:
+  r"""Minimal wall thickness of a tube meeting frequency and buckling limits.
+
+  The tube is a beam of annular section with the mean radius :math:`r`,
+
+  .. math::
+
+    A = 2\pi r h \quad,\quad I = \pi r h \left(r^2 + \frac{h^2}{4}\right)
+
+  and its buckling pressure is :py:meth:`TubeBuckling.pressure`.
+
+  Args:
+    E: Young's modulus
+    nu: Poisson's ratio
+    rho: Density
+    r: Mean radius
+    L: Length
+    f1: Minimal first natural frequency
+    q_cr: Minimal critical buckling pressure
+    support: Support of both beam ends
+    kwargs: Bounds and tolerances of :py:func:`minimum_size`, the bounds
+      default to ``lo=1e-6 * r`` and ``hi=r``
+
+  Returns:
+    Thickness :math:`h` and mass per design
+
+  Example:
+    >>> h, m = size_tube(210e9, 0.3, 7850, 0.05, 2, q_cr=[1e5, 1e6])
+    >>> h.round(6)
+    array([0.000601, 0.001294])
+    >>> TubeBuckling(210e9, 0.3, 0.05, q=1e6).thickness().round(6)
+    np.float64(0.001294)
+  """
+  E, nu, rho, r, L = map(np.asarray, (E, nu, rho, r, L))
+  margins = []
+  if f1 is not None:
+    f1 = np.asarray(f1)
+    margins.append(lambda h: Beam(
+      E, np.pi * r * h * (r**2 + h**2 / 4), 2 * np.pi * r * h, L,
+      rho).eigenfrequency(1, support) - f1)
+  if q_cr is not None:
+    q_cr = np.asarray(q_cr)
+    margins.append(lambda h: TubeBucklingSet(
+      E, nu, r, h=h).pressure().data - q_cr)
+  if not margins:
+    raise ValueError("f1 or q_cr is required.")
+  shape = np.broadcast_shapes(*(
+    np.shape(v) for v in (E, nu, rho, r, L, f1, q_cr) if v is not None))
+  kwargs = {'lo': 1e-6 * r, 'hi': r, **kwargs}
+  kwargs['lo'] = np.broadcast_to(kwargs['lo'], shape)
+  h = minimum_size(margins, **kwargs)
+  return h, rho * 2 * np.pi * r * h * L
+
+def size_plate(
+    E: npt.ArrayLike, nu: npt.ArrayLike, rho: npt.ArrayLike,
+    ra: npt.ArrayLike, q: npt.ArrayLike, w_max: npt.ArrayLike,
+    support: str = 'clamped', **kwargs) -> tuple[FloatArray, FloatArray]:
+  r"""Minimal thickness of a circular plate meeting a deflection limit.
+
+  Args:
+    E: Young's modulus
+    nu: Poisson's ratio
+    rho: Density
+    ra: Radius
+    q: External pressure
+    w_max: Maximal central deflection, see :py:meth:`Plate.deflection`
+    support: clamped, simple
+    kwargs: Bounds and tolerances of :py:func:`minimum_size`, the bounds
+      default to ``lo=1e-6 * ra`` and ``hi=ra``
+
+  Returns:
+    Thickness :math:`h` and mass per design
+
+  Example:
+    >>> h, m = size_plate(210e9, 0.3, 7850, 0.1, 1e5, [1e-4, 1e-3])
+    >>> (h * 1e3).round(4)
+    array([4.3312, 2.0104])
+  """
+  E, nu, rho, ra, q, w_max = map(np.asarray, (E, nu, rho, ra, q, w_max))
+  shape = np.broadcast_shapes(*map(np.shape, (E, nu, rho, ra, q, w_max)))
+  def margin(h):
+    w = Plate(E, nu, ra, h).deflection(q, support)
+    if w is None:
+      raise ValueError(f"unknown support {support!r}.")
+    return w_max - w
+  kwargs = {'lo': 1e-6 * ra, 'hi': ra, **kwargs}
+  kwargs['lo'] = np.broadcast_to(kwargs['lo'], shape)
+  h = minimum_size(margin, **kwargs)
+  return h, rho * np.pi * ra**2 * h
+
+# spec and output array of the sweep in a worker process
+_SWEEP: dict = {}
+
+def _fingerprint(h, value):
+  """Feed a sweep parameter into the hash ``h``, arrays by their bytes."""
+  if isinstance(value, dict):
+    h.update(b'{')
+    for k, v in value.items():
+      _fingerprint(h, k)
+      _fingerprint(h, v)
+    h.update(b'}')
+  elif isinstance(value, (tuple, list)):
+    h.update(b'(')
+    for v in value:
+      _fingerprint(h, v)
+    h.update(b')')
+  elif isinstance(value, (np.ndarray, np.generic)) and \
+      not np.asarray(value).dtype.hasobject:
+    value = np.ascontiguousarray(value)
+    h.update(f"array {value.dtype.str} {value.shape}:".encode())
+    h.update(value.tobytes())
+  elif isinstance(value, type):
+    h.update(f"type {value.__module__}.{value.__qualname__}".encode())
+  else:
+    h.update(f"{type(value).__name__} {value!r}".encode())
+  h.update(b'\0')
+
+def _sweep_init(spec: dict, shm: str | None):
+  """Attach a worker process to the output of :py:func:`sweep`."""
+  _SWEEP['spec'] = spec
+  if shm is None:
+    _SWEEP['out'] = np.load(
+      pathlib.Path(spec['path']) / 'result.npy', mmap_mode='r+').reshape(-1)
+  else:
+    _SWEEP['shm'] = SharedMemory(name=shm)
+    _SWEEP['out'] = np.ndarray(
+      (spec['size'],), dtype=np.float64, buffer=_SWEEP['shm'].buf)
+
+def _sweep_task(i: int) -> int:
+  _sweep_chunk(_SWEEP['spec'], _SWEEP['out'], i)
+  return i
+
+def _sweep_chunk(spec: dict, out: FloatArray, i: int):
+  """Evaluate one chunk of rows with the vectorized model."""
+  start = i * spec['chunk']
+  stop = min(start + spec['chunk'], spec['size'])
+  params = dict(spec['constants'])
+  if spec['table']:
+    params.update({k: v[start:stop] for k, v in spec['columns'].items()})
+  else:
+    index = np.unravel_index(np.arange(start, stop), spec['shape'])
+    params.update({k: v[j] for (k, v), j in zip(
+      spec['columns'].items(), index)})
+  value = getattr(spec['model'](**params), spec['method'])
+  if callable(value):
+    value = value(*spec['args'], **spec['kwargs'])
+  # masked rows of TubeBucklingSet become NaN
+  out[start:stop] = np.ma.filled(
+    np.ma.asarray(value, dtype=np.float64), np.nan)
+  if isinstance(out, np.memmap):
+    out.flush()
+
+def sweep(
+    model: type, method: str, grid: dict | None = None, *,
+    table: dict | None = None, args: tuple = (), kwargs: dict | None = None,
+    path: str | os.PathLike | None = None, chunk: int = 1 << 16,
+    processes: int | None = None) -> FloatArray:
+  r"""Parametric sweep of a structure model over a process pool.
+
+  The rows are split into chunks of ``chunk`` designs. Each chunk creates
+  one vectorized model of array parameters, e.g. :py:class:`Beam`,
+  :py:class:`TubeBucklingSet` or :py:class:`Plate`, and evaluates ``method``
+  for all its rows at once. The workers write into a shared output array,
+  so no results are pickled.
+
+  Without ``path`` the output lives in shared memory. With ``path`` it is a
+  memory-mapped ``result.npy`` in that directory, which may exceed the RAM,
+  and ``done.npy`` records the finished chunks. Calling the sweep again
+  with the same ``path`` resumes an interrupted run and only evaluates the
+  missing chunks. ``spec.sha256`` fingerprints the model, method, arguments,
+  parameter values and chunk size, a sweep with a different fingerprint is
+  not resumed.
+
+  Args:
+    model: Structure class taking the parameters as keyword arguments,
+      :py:class:`TubeBuckling` is evaluated as :py:class:`TubeBucklingSet`
+    method: Name of the method or property to evaluate, the result must be
+      one value per design
+    grid: Parameter values of a Cartesian sweep, one axis per 1D array in
+      the order of the dictionary, scalars are constants
+    table: Sample table of parameter columns of equal length, scalars are
+      constants
+    args: Positional arguments of ``method``
+    kwargs: Keyword arguments of ``method``
+    path: Directory of the result on disk
+    chunk: Number of designs per task
+    processes: Number of worker processes, defaults to the number of CPUs,
+      0 evaluates in the calling process
+
+  Returns:
+    Results of shape ``(len(v) for v in grid arrays)``, ``(1,)`` for a
+    grid of constants only, or ``(rows,)``. Missing values, e.g. masked
+    results, are NaN.
+
+  Example:
+    >>> f = sweep(Beam, 'eigenfrequency', dict(
+    ...   E=210e9, I=[1e-8, 2e-8], A=1e-4, L=[1, 2, 3], rho=7850),
+    ...   args=(1,), processes=0)
+    >>> f.round(2)
+    array([[28.94,  7.24,  3.22],
+           [40.93, 10.23,  4.55]])
+  """
+  if (grid is None) == (table is None):
+    raise ValueError("either grid or table is required.")
+  if model is TubeBuckling:
+    model = TubeBucklingSet
+  params = {k: np.asarray(v) for k, v in (grid or table or {}).items()}
+  constants = {k: v[()] for k, v in params.items() if v.ndim == 0}
+  columns = {k: v for k, v in params.items() if v.ndim}
+  if table is not None:
+    if len({len(v) for v in columns.values()}) > 1:
+      raise ValueError("table columns differ in length.")
+    shape: tuple[int, ...] = (
+      (len(next(iter(columns.values()))),) if columns else (1,))
+  else:
+    if any(v.ndim > 1 for v in columns.values()):
+      raise ValueError("grid values must be scalars or 1D arrays.")
+    # a grid of constants only is a single design
+    shape = tuple(len(v) for v in columns.values()) or (1,)
+  size = math.prod(shape)
+  spec = dict(
+    model=model, method=method, args=tuple(args), kwargs=kwargs or {},
+    constants=constants, columns=columns, table=table is not None,
+    shape=shape, size=size, chunk=chunk,
+    path=None if path is None else os.fspath(path))
+  chunks = -(-size // chunk)
+
+  shm = None
+  if path is None:
+    shm = SharedMemory(create=True, size=max(size, 1) * 8)
+    out = np.ndarray((size,), dtype=np.float64, buffer=shm.buf)
+    out[:] = np.nan
+    done = np.zeros(chunks, dtype=bool)
+  else:
+    path = pathlib.Path(path)
+    path.mkdir(parents=True, exist_ok=True)
+    h = hashlib.sha256()
+    _fingerprint(h, {k: v for k, v in spec.items() if k != 'path'})
+    fingerprint = h.hexdigest()
+    if (path / 'result.npy').exists():
+      result = np.load(path / 'result.npy', mmap_mode='r+')
+      done = np.load(path / 'done.npy', mmap_mode='r+')
+      stored = (path / 'spec.sha256').read_text() \
+        if (path / 'spec.sha256').exists() else None
+      if stored != fingerprint or result.shape != shape or \
+          len(done) != chunks:
+        raise ValueError(f"{path} holds a different sweep.")
+    else:
+      (path / 'spec.sha256').write_text(fingerprint)
+      result = np.lib.format.open_memmap(
+        path / 'result.npy', mode='w+', dtype=np.float64, shape=shape)
+      result[...] = np.nan
+      result.flush()
+      done = np.lib.format.open_memmap(
+        path / 'done.npy', mode='w+', dtype=bool, shape=(chunks,))
+    out = result.reshape(-1)
+
+  try:
+    todo = np.flatnonzero(~done).tolist()
+    if processes == 0 or len(todo) <= 1:
+      for i in todo:
+        _sweep_chunk(spec, out, i)
+        done[i] = True
+    else:
+      with concurrent.futures.ProcessPoolExecutor(
+          processes, initializer=_sweep_init,
+          initargs=(spec, None if shm is None else shm.name)) as pool:
+        for future in concurrent.futures.as_completed(
+            [pool.submit(_sweep_task, i) for i in todo]):
+          done[future.result()] = True
+          if isinstance(done, np.memmap):
+            done.flush()
+    if shm is None:
+      if isinstance(done, np.memmap):
+        done.flush()
+      return result
+    return out.reshape(shape).copy()
+  finally:
+    if shm is not None:
+      del out
+      shm.close()
+      shm.unlink()
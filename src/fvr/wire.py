@@ -1,4 +1,107 @@
 import math
+import numpy as np
+import numpy.typing as npt
+from fvr.typing import FloatArray
+
+# precomputed table of the gauges 0000 (-3) to 56 including half gauges
+_NUMBERS = np.arange(-3, 56.5, 0.5)
+_DIAMETERS = 0.127 * 92**((36 - _NUMBERS) / 39)  # mm
+_AREAS = np.pi / 4 * _DIAMETERS**2  # mm²
+_NAMES = {'0000': -3, '000': -2, '00': -1, '4/0': -3, '3/0': -2, '2/0': -1,
+  '1/0': 0}
+COPPER = 0.01724  # resistivity of annealed copper at 20 °C, Ω mm²/m
+
+def awg_number(gauges: int | str | npt.ArrayLike) -> FloatArray:
+  """Gauge numbers of gauges, ``'0000'`` is -3, ``'4/0'`` also.
+
+  Args:
+    gauges: Gauge numbers or names, also ``'00'``, ``'2/0'`` and half
+      gauges like ``'10.5'``
+
+  Example:
+    >>> awg_number(['0000', '2/0', 0, '10.5', 24])
+    array([-3. , -1. ,  0. , 10.5, 24. ])
+  """
+  gauges = np.asarray(gauges)
+  if gauges.dtype.kind in 'iuf':
+    return gauges.astype(np.float64)
+  parse = lambda i: _NAMES[i] if i in _NAMES else float(i)
+  try:
+    return np.array([parse(str(i)) for i in gauges.ravel()],
+      dtype=np.float64).reshape(gauges.shape)
+  except ValueError:
+    raise ValueError(f"{gauges} are not gauges.") from None
+
+def _index(gauges) -> npt.NDArray[np.intp]:
+  """Rows of the gauges in the table."""
+  i = (awg_number(gauges) - _NUMBERS[0]) * 2
+  if not np.all(np.isfinite(i)):
+    raise ValueError("gauges are not finite.")
+  index = np.rint(i).astype(np.intp)
+  if np.any((index != i) | (index < 0) | (index >= len(_NUMBERS))):
+    raise ValueError("gauges from 0000 to 56 in steps of 0.5 are tabulated.")
+  return index
+
+def awg_diameter(gauges: int | str | npt.ArrayLike) -> FloatArray:
+  """Diameters of the AWG wires, mm.
+
+  Example:
+    >>> awg_diameter([0, 10, 10.5]).round(4)
+    array([8.2515, 2.5882, 2.4424])
+  """
+  return _DIAMETERS[_index(gauges)]
+
+def awg_area(gauges: int | str | npt.ArrayLike) -> FloatArray:
+  """Cross-sections of the AWG wires, mm²."""
+  return _AREAS[_index(gauges)]
+
+def awg_resistance(
+    gauges: int | str | npt.ArrayLike,
+    resistivity: float = COPPER) -> FloatArray:
+  """Resistance per length of the AWG wires, Ω/m.
+
+  Args:
+    gauges: Gauges
+    resistivity: Resistivity, Ω mm²/m, default :py:data:`COPPER`
+
+  Example:
+    >>> (awg_resistance([10, 24]) * 1e3).round(2)
+    array([ 3.28, 84.21])
+  """
+  return resistivity / _AREAS[_index(gauges)]
+
+def awg_select(
+    area: npt.ArrayLike | None = None, *, current: npt.ArrayLike | None = None,
+    current_density: float = 3., half: bool = False) -> FloatArray:
+  """Smallest gauges, i.e. largest gauge numbers, meeting a requirement.
+
+  Bisection in the table of ascending cross-sections.
+
+  Args:
+    area: Minimal cross-section, mm²
+    current: Current, A, requires the cross-section
+      ``current / current_density``
+    current_density: Permissible current density, A/mm²
+    half: Also select half gauges
+
+  Returns:
+    Gauge numbers, NaN where even 0000 is too small
+
+  Example:
+    >>> awg_select([0.5, 1, 2.5, 200])
+    array([20., 17., 13., nan])
+    >>> awg_select(current=[1, 10], half=True)
+    array([21.5, 11.5])
+  """
+  if (area is None) == (current is None):
+    raise ValueError("either area or current is required.")
+  if area is None:
+    area = np.asarray(current, dtype=np.float64) / current_density
+  step = 1 if half else 2
+  numbers, areas = _NUMBERS[::-step], _AREAS[::-step]
+  i = np.searchsorted(areas, area, side='left')
+  return np.where(i < len(areas), numbers[np.minimum(i, len(areas) - 1)],
+    np.nan)
 
 class awg:
   """Parameters of an AWG wire.
@@ -10,6 +113,7 @@ class awg:
     """
     self.number = number
     self._number = self.num2int(number)
+    self._diameter = None
 
   @staticmethod
   def num2int(number: int|str):
@@ -27,7 +131,11 @@ class awg:
   @property
   def diameter(self):
     """The diameter of the AWG wire, mm"""
-    return 0.127 * 92**((36-self._number)/39)
+    if self._diameter is None:
+      i = (self._number - _NUMBERS[0]) * 2
+      self._diameter = float(_DIAMETERS[int(i)]) if i == int(i) and \
+        0 <= i < len(_NUMBERS) else 0.127 * 92**((36-self._number)/39)
+    return self._diameter
 
   @property
   def area(self):
@@ -40,3 +148,221 @@ class awg:
       'A = %.4g' % self.area + ' mm²\n' +
       'd = %.4g' % self.diameter + ' mm\n')
     return res
+
+class Harness:
+  r"""DC network of a wire harness.
+
+  Branches of AWG wires connect the nodes, supply nodes have a fixed
+  voltage and loads draw currents from the other nodes. The node voltages
+  follow from the sparse conductance matrix
+
+  .. math::
+
+    G = B^T \operatorname{diag}(g) B \quad,\quad
+    g = \frac{A}{\rho_{20} (1 + \alpha (T - 20)) \, l}
+
+  with the incidence matrix :math:`B` of the branches. The matrix of the
+  free nodes is factorized once and reused for all load cases. Changed
+  gauges are low-rank updates, applied to the solves by the Woodbury
+  identity until the factorization is renewed.
+
+  Requires SciPy.
+
+  Example:
+    >>> net = Harness(3, [[0, 1], [1, 2]], gauges=[16, 20], lengths=[2, 1])
+    >>> v, i = net.solve([0, 2, 1])
+    >>> v.round(3), i.round(3)
+    (array([12.   , 11.921, 11.888]), array([3., 1.]))
+  """
+
+  def __init__(
+      self, nodes: int, branches: npt.ArrayLike,
+      gauges: int | str | npt.ArrayLike, lengths: npt.ArrayLike,
+      temperatures: npt.ArrayLike = 20., *,
+      supply: int | npt.ArrayLike = 0, voltage: npt.ArrayLike = 12.,
+      resistivity: float = COPPER, alpha: float = 0.00393,
+      refactor: int = 32):
+    """
+    Args:
+      nodes: Number of nodes
+      branches: Node pairs of the branches, shape ``(branches, 2)``
+      gauges: AWG gauges of the branches
+      lengths: Lengths of the branches, m
+      temperatures: Temperatures of the branches, °C
+      supply: Supply nodes
+      voltage: Voltages of the supply nodes, V
+      resistivity: Resistivity at 20 °C, Ω mm²/m
+      alpha: Temperature coefficient of the resistivity, 1/K
+      refactor: Number of low-rank updates before a new factorization
+    """
+    self.nodes = nodes
+    self.branches = np.asarray(branches, dtype=np.intp).reshape(-1, 2)
+    m = len(self.branches)
+    self._gauges = np.broadcast_to(awg_number(gauges), (m,)).copy()
+    self.lengths = np.broadcast_to(np.asarray(lengths, dtype=np.float64), (m,))
+    self.temperatures = np.broadcast_to(
+      np.asarray(temperatures, dtype=np.float64), (m,))
+    self.supply = np.atleast_1d(np.asarray(supply, dtype=np.intp))
+    self.voltage = np.broadcast_to(
+      np.asarray(voltage, dtype=np.float64), self.supply.shape)
+    self.resistivity = resistivity
+    self.alpha = alpha
+    self.refactor = refactor
+    self._free = np.setdiff1d(np.arange(nodes), self.supply)
+    # free index of each node, -1 for supply nodes
+    self._position = np.full(nodes, -1)
+    self._position[self._free] = np.arange(len(self._free))
+    self._factorize()
+
+  @property
+  def gauges(self) -> FloatArray:
+    return self._gauges
+
+  @gauges.setter
+  def gauges(self, gauges):
+    gauges = np.broadcast_to(awg_number(gauges), self._gauges.shape)
+    changed = np.flatnonzero(gauges != self._gauges)
+    self._update(changed, gauges[changed])
+
+  @property
+  def resistances(self) -> FloatArray:
+    """Resistances of the branches, Ω."""
+    return self.resistivity * (1 + self.alpha * (self.temperatures - 20)) * \
+      self.lengths / awg_area(self._gauges)
+
+  def _laplacian(self, g: FloatArray):
+    """Conductance matrix of the nodes."""
+    import scipy.sparse
+    a, b = self.branches.T
+    return scipy.sparse.coo_array((np.concatenate([g, g, -g, -g]), (
+      np.concatenate([a, b, a, b]), np.concatenate([a, b, b, a]))),
+      shape=(self.nodes, self.nodes)).tocsr()
+
+  def _factorize(self):
+    """Factorization of the conductance matrix of the free nodes."""
+    import scipy.sparse.linalg
+    self._g = 1 / self.resistances
+    G = self._laplacian(self._g)
+    self._Gfs = G[self._free][:, self.supply]
+    self._lu = scipy.sparse.linalg.splu(
+      G[self._free][:, self._free].tocsc())
+    # low-rank updates: branches, conductance changes, G^-1 U
+    self._updates = np.zeros(0, dtype=np.intp)
+    self._dg = np.zeros(0)
+    self._W = np.zeros((len(self._free), 0))
+
+  def _project(self, branches: npt.NDArray[np.intp], x: FloatArray):
+    """:math:`U^T x`, the free voltage differences over branches."""
+    a, b = self._position[self.branches[branches]].T
+    xa = np.where((a >= 0)[:, None], x[np.maximum(a, 0)], 0)
+    xb = np.where((b >= 0)[:, None], x[np.maximum(b, 0)], 0)
+    return xa - xb
+
+  def _columns(self, branches: npt.NDArray[np.intp]) -> FloatArray:
+    """Dense columns :math:`U` of branches in the free nodes."""
+    U = np.zeros((len(self._free), len(branches)))
+    a, b = self._position[self.branches[branches]].T
+    k = np.arange(len(branches))
+    U[a[a >= 0], k[a >= 0]] = 1
+    U[b[b >= 0], k[b >= 0]] = -1
+    return U
+
+  def _update(self, branches: npt.NDArray[np.intp], gauges: FloatArray):
+    """Change gauges, a low-rank update of the factorization."""
+    self._gauges[branches] = gauges
+    if len(self._updates) + len(branches) > self.refactor:
+      self._factorize()
+      return
+    g = 1 / self.resistances[branches]
+    self._updates = np.concatenate([self._updates, branches])
+    self._dg = np.concatenate([self._dg, g - self._g[branches]])
+    self._g[branches] = g
+    self._W = np.hstack([self._W, self._lu.solve(self._columns(branches))])
+    if np.isin(self.branches[branches], self.supply).any():
+      # coupling of the free to the supply nodes, right-hand side of solve
+      self._Gfs = self._laplacian(self._g)[self._free][:, self.supply]
+
+  def _solve(self, f: FloatArray) -> FloatArray:
+    """Solve the updated conductance matrix of the free nodes, ``f`` 2D."""
+    x = self._lu.solve(f)
+    if len(self._updates):
+      C = np.diag(1 / self._dg) + self._project(self._updates, self._W)
+      x = x - self._W @ np.linalg.solve(C, self._project(self._updates, x))
+    return x
+
+  def solve(self, loads: npt.ArrayLike) -> tuple[FloatArray, FloatArray]:
+    """Node voltages and branch currents of load cases.
+
+    Args:
+      loads: Currents drawn from the nodes, A, shape ``(nodes,)`` or
+        ``(nodes, cases)``, loads of supply nodes are ignored
+
+    Returns:
+      Voltages of the nodes, V, and currents of the branches from their
+      first to their second node, A, with the load cases along the last axis
+    """
+    loads = np.asarray(loads, dtype=np.float64)
+    f = -loads.reshape(self.nodes, -1)[self._free] - \
+      (self._Gfs @ self.voltage)[:, None]
+    v = np.empty((self.nodes, f.shape[1]))
+    v[self.supply] = self.voltage[:, None]
+    v[self._free] = self._solve(f)
+    a, b = self.branches.T
+    i = self._g[:, None] * (v[a] - v[b])
+    shape = loads.shape[1:]
+    return v.reshape((self.nodes,) + shape), i.reshape((len(a),) + shape)
+
+  def resize(
+      self, loads: npt.ArrayLike, budget: float, half: bool = False,
+      maxiter: int = 1000) -> FloatArray:
+    r"""Enlarge branches until the voltage drops meet a budget.
+
+    Each iteration enlarges the branch with the largest rise of the worst
+    node voltage per added copper volume by one gauge. The rise follows
+    from the adjoint solution :math:`\psi = G^{-1} e_j` of the worst node
+    :math:`j`,
+
+    .. math::
+
+      \frac{\partial v_j}{\partial g_b} = -(\psi_a - \psi_b)(v_a - v_b)
+
+    and the gauge changes are low-rank updates of the factorization.
+
+    Args:
+      loads: Load cases, see :py:meth:`solve`
+      budget: Maximal drop from the lowest supply voltage, V
+      half: Step half gauges
+      maxiter: Maximal number of enlarged branches
+
+    Returns:
+      Gauges of the branches
+    """
+    step = 0.5 if half else 1
+    limit = self.voltage.min() - budget
+    a, b = self.branches.T
+    for _ in range(maxiter):
+      v, _ = self.solve(loads)
+      v = v.reshape(self.nodes, -1)
+      j, case = np.unravel_index(np.argmin(v), v.shape)
+      if v[j, case] >= limit:
+        break
+      e = np.zeros((len(self._free), 1))
+      e[self._position[j]] = 1
+      psi = np.zeros(self.nodes)
+      psi[self._free] = self._solve(e)[:, 0]
+      thicker = self._gauges - step
+      valid = thicker >= _NUMBERS[0]
+      thicker = np.maximum(thicker, _NUMBERS[0])
+      g = 1 / (self.resistivity * (1 + self.alpha * (self.temperatures - 20))
+        * self.lengths / awg_area(thicker))
+      rise = -(g - self._g) * (psi[a] - psi[b]) * (v[a, case] - v[b, case])
+      cost = (awg_area(thicker) - awg_area(self._gauges)) * self.lengths
+      gain = np.full(len(rise), -np.inf)
+      gain[valid] = rise[valid] / cost[valid]
+      best = np.argmax(gain)
+      if not gain[best] > 0:
+        raise ValueError("budget can not be met.")
+      self._update(np.array([best]), thicker[[best]])
+    else:
+      raise ValueError("budget not met within maxiter.")
+    return self.gauges
@@ -0,0 +1,158 @@
+"""Test of cad module.
+
+"""
+import io
+import xml.etree.ElementTree as ET
+import numpy as np
+import pytest
+import fvr.cad
+import fvr.geom2d
+
+class TestBulk:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.obj = fvr.cad.doc(sc=2)
+    self.ref = fvr.cad.doc(sc=2)
+
+  def entities(self, doc, dxftype):
+    return [i for i in doc.msp if i.dxftype() == dxftype]
+
+  def test_lines(self):
+    segments = np.random.default_rng(0).random((50, 2, 2))
+    self.obj.lines(segments, color=1, shift=(1, 2))
+    for p1, p2 in segments:
+      self.ref.line(p1, p2, color=1, shift=(1, 2))
+    lines = self.entities(self.obj, 'LINE')
+    assert len(lines) == 50
+    for a, b in zip(lines, self.entities(self.ref, 'LINE')):
+      assert a.dxf.start.isclose(b.dxf.start)
+      assert a.dxf.end.isclose(b.dxf.end)
+      assert (a.dxf.color, a.dxf.layer) == (1, 'con')
+
+  def test_polylines(self):
+    pts = np.random.default_rng(1).random((12, 2))
+    offsets = [0, 3, 3, 7, 12]
+    self.obj.polylines(pts, offsets, layer='dim')
+    for start, stop in zip(offsets[:-1], offsets[1:]):
+      self.ref.polyline(pts[start:stop], layer='dim')
+    polylines = self.entities(self.obj, 'LWPOLYLINE')
+    assert len(polylines) == 4
+    for a, b in zip(polylines, self.entities(self.ref, 'LWPOLYLINE')):
+      np.testing.assert_allclose(
+        np.reshape(a.get_points('xy'), (-1, 2)),
+        np.reshape(b.get_points('xy'), (-1, 2)))
+      assert not a.closed
+      assert a.dxf.layer == 'dim'
+
+  def test_polygon_set(self):
+    ps = fvr.geom2d.PolygonSet([[0, 0], [1, 0], [0, 1], [2, 2], [3, 2],
+      [3, 3], [2, 3]], [0, 3, 7])
+    self.obj.polylines(ps, close=True)
+    self.obj.polylines(ps)
+    polylines = self.entities(self.obj, 'LWPOLYLINE')
+    assert [len(i) for i in polylines] == [3, 4, 3, 4]
+    assert [i.closed for i in polylines] == [True, True, False, False]
+    np.testing.assert_allclose(polylines[1].get_points('xy')[2], (6, 6))
+
+  def test_single(self):
+    pts = [[0, 0], [1, 0], [1, 1]]
+    self.obj.polylines(pts, close=True)
+    self.ref.polyline(pts, close=True)
+    a, = self.entities(self.obj, 'LWPOLYLINE')
+    b, = self.entities(self.ref, 'LWPOLYLINE')
+    np.testing.assert_allclose(
+      np.reshape(a.get_points('xy'), (-1, 2)),
+      np.reshape(b.get_points('xy'), (-1, 2)))
+    assert a.closed
+
+  def test_circles(self):
+    circles = [[0, 0, 1], [1, 2, 3]]
+    self.obj.circles(circles, shift=(1, 0))
+    circles = self.entities(self.obj, 'CIRCLE')
+    assert [i.dxf.radius for i in circles] == [2, 6]
+    assert circles[1].dxf.center.isclose((4, 4))
+
+class TestRenderDims:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.obj = fvr.cad.doc()
+    self.obj.line((0, 0), (10, 0))
+    self.obj.linear_dim((0, 2), (0, 0), (10, 0), '<>')
+    self.obj.aligned_dim((0, 0), (10, 0), 3, '<>')
+
+  def blocks(self):
+    return sorted(i.name for i in self.obj.doc.blocks if i.name.startswith('*D'))
+
+  def test_incremental(self):
+    assert self.obj.render_dims() == 2
+    blocks = self.blocks()
+    assert len(blocks) == 2
+    assert self.obj.render_dims() == 0
+    self.obj.linear_dim((0, 4), (0, 0), (5, 0), '<>')
+    assert self.obj.render_dims() == 1
+    assert self.blocks()[:2] == blocks
+
+  def test_changed(self):
+    self.obj.render_dims()
+    blocks = self.blocks()
+    self.obj.dims[1].shift_text(dh=1, dv=0)
+    assert self.obj.render_dims() == 1
+    assert len(self.blocks()) == 2
+    assert self.blocks() != blocks
+    assert self.obj.render_dims() == 0
+
+  def test_save(self, tmp_path):
+    self.obj.save_dxf(tmp_path / 'a.dxf')
+    self.obj.export_svg_string()
+    assert len(self.blocks()) == 2
+
+class TestWriteSvg:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.obj = fvr.cad.doc()
+    self.obj.line((0, 0), (10, 0))
+    self.obj.polyline([(0, 0), (3, 0), (3, 3)], close=True)
+    self.obj.circle((5, 1), 1)
+    self.obj.linear_dim((0, -2), (0, 0), (10, 0), '<>')
+
+  def svg(self, **kwargs):
+    fh = io.StringIO()
+    self.obj.write_svg(fh, **kwargs)
+    return ET.fromstring(fh.getvalue())
+
+  def tags(self, root, tag):
+    return root.findall(f'.//{{http://www.w3.org/2000/svg}}{tag}')
+
+  def test_page(self):
+    root = self.svg()
+    ref = ET.fromstring(self.obj.export_svg_string().encode())
+    assert root.get('width') == ref.get('width') == '204mm'
+    assert root.get('height') == ref.get('height')
+    assert root.get('viewBox') == '0 0 204 107'
+
+  def test_elements(self):
+    root = self.svg()
+    paths = self.tags(root, 'path')
+    assert [i.get('class') for i in paths] == (
+      ['con']*3 + ['dim']*2 + ['dim fill']*2 + ['dim'])
+    assert paths[0].get('d') == 'M 2 62 L 202 62'
+    assert paths[2].get('d').count('A') == 2
+    text, = self.tags(root, 'text')
+    assert text.text == '10'
+    assert text.get('text-anchor') == 'middle'
+    style = self.tags(root, 'style')[0].text
+    assert '.con {color: #ffffff;' in style
+    assert 'stroke-width: 0.8;' in style
+    assert '.dim {color: #ff00ff;' in style
+
+  def test_bulge(self):
+    self.obj.msp.add_lwpolyline([(0, 0, 1), (2, 0)], format='xyb')
+    d = self.tags(self.svg(), 'path')[-1].get('d')
+    assert d == 'M 2 62 A 20 20 0 0 0 42 62'
+
+  def test_export(self, tmp_path):
+    self.obj.export_svg(tmp_path / 'a.svg')
+    self.obj.export_svg(tmp_path / 'b.svg', native=True)
+    assert ET.parse(tmp_path / 'a.svg').getroot().get('width') == '204mm'
+    root = ET.parse(tmp_path / 'b.svg').getroot()
+    assert len(self.tags(root, 'path')) == 8
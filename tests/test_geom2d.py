@@ -2,6 +2,7 @@
 
 """
 import numpy as np
+import pytest
 import fvr.geom2d
 
 def test_vertex_obj():
@@ -20,3 +21,344 @@ def test_vertex_y():
 def test_vertex_w():
   np.testing.assert_equal(
     fvr.geom2d.Vertex(1, 2).w, 1, 'incorrect w after creation')
+
+def test_polygon_area_offset():
+  np.testing.assert_allclose(
+    fvr.geom2d.Polygon([[1e8, 1e8], [1e8, 1e8+1], [1e8+1, 1e8+1],
+      [1e8+1, 1e8]]).area, 1.0, err_msg='incorrect area far off origin')
+
+def test_polygonset_areas():
+  polygons = [
+    [[0, 0], [0, 1], [1, 1], [1, 0]],
+    [],
+    [[0, 0], [2, 0], [2, 3]],
+    [[1, 1], [2, 2]]]
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  np.testing.assert_equal(len(ps), 4)
+  np.testing.assert_allclose(
+    ps.areas, [fvr.geom2d.Polygon(i).area for i in polygons],
+    err_msg='incorrect areas')
+
+def test_polygonset_float32():
+  ps = fvr.geom2d.PolygonSet.from_polygons(
+    [[[0, 0], [0, 1], [1, 1], [1, 0]]], dtype=np.float32)
+  np.testing.assert_equal(ps.coords.dtype, np.float32)
+  np.testing.assert_equal(ps.areas.dtype, np.float64)
+  np.testing.assert_equal(ps[0].area, 1.0)
+
+def test_polygon_section():
+  # L-section, clockwise, away from the origin
+  obj = fvr.geom2d.Polygon(
+    np.array([[0, 0], [0, 4], [1, 4], [1, 1], [3, 1], [3, 0]]) + 10)
+  np.testing.assert_allclose(obj.area, 6)
+  np.testing.assert_allclose(obj.centroid, [11, 11.5])
+  np.testing.assert_allclose(obj.Ix, 8.5)
+  np.testing.assert_allclose(obj.Iy, 4)
+  np.testing.assert_allclose(obj.Ixy, -3)
+  np.testing.assert_allclose([obj.I1, obj.I2], [10, 2.5])
+  np.testing.assert_allclose(obj.I1 + obj.I2, obj.Ip)
+  np.testing.assert_allclose(obj.I1 * obj.I2, obj.Ix * obj.Iy - obj.Ixy**2)
+
+def test_polygon_cache_invalidation():
+  obj = fvr.geom2d.Polygon([[0, 0], [0, 1], [1, 1], [1, 0]])
+  np.testing.assert_allclose(obj.Ix, 1 / 12)
+  obj.vertices = [[0, 0], [0, 2], [1, 2], [1, 0]]
+  np.testing.assert_allclose(obj.area, 2)
+  np.testing.assert_allclose(obj.Ix, 8 / 12)
+
+def test_polygonset_section():
+  polygons = [
+    [[0, 0], [0, 4], [1, 4], [1, 1], [3, 1], [3, 0]],
+    [],
+    [[5, 5], [7, 5], [7, 8]]]
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  for attr in ['Ix', 'Iy', 'Ixy', 'I1', 'I2', 'Ip']:
+    np.testing.assert_allclose(
+      getattr(ps, attr),
+      [getattr(fvr.geom2d.Polygon(i), attr) for i in polygons],
+      atol=1e-12, err_msg=f'incorrect {attr}')
+  np.testing.assert_allclose(
+    ps.centroids[[0, 2]], [fvr.geom2d.Polygon(polygons[i]).centroid
+      for i in [0, 2]])
+
+def test_parse_vertices_formats():
+  expected = [[0, 0], [0, 1], [1, 1], [1, 0]]
+  for text in [
+      '[[0, 0], [0, 1], [1, 1], [1, 0]]',
+      '((0, 0), (0, 1), (1, 1), (1, 0))',
+      'POLYGON ((0 0, 0 1, 1 1, 1 0, 0 0))',
+      'polygon((0 0,0 1,1 1,1 0))',
+      '0 0\n0 1\n1 1\n1 0\n',
+      '0,0;0,1;1,1;1,0',
+      '0.0e0 0 0 1e0 1 +1 1 -0']:
+    np.testing.assert_equal(
+      fvr.geom2d.parse_vertices(text), expected, f'incorrect for {text!r}')
+
+def test_parse_vertices_empty():
+  for text in ['', '  ', '[]', '[[]]\n', 'POLYGON(())']:
+    assert fvr.geom2d.parse_vertices(text).shape == (0, 2), repr(text)
+  np.testing.assert_equal(fvr.geom2d.Polygon('[]').area, 0)
+
+def test_parse_vertices_invalid():
+  for text in [
+      "__import__('os').system('true')",
+      '[[0, 0], [0, 1], [1]]',
+      '1 2 3..4',
+      'POLYGON((0 0, 0 1, 1 1), (0.2 0.2, 0.2 0.4, 0.4 0.4))']:
+    with pytest.raises(ValueError):
+      fvr.geom2d.parse_vertices(text)
+
+def test_polygon_str():
+  np.testing.assert_equal(fvr.geom2d.Polygon('').area, 0)
+  np.testing.assert_equal(
+    fvr.geom2d.Polygon('POLYGON((0 0, 0 1, 1 1, 1 0, 0 0))').area, 1)
+
+def test_parse_polygons_stream():
+  lines = ['[[0, 0], [0, 1], [1, 1], [1, 0]]\n'] * 700 + ['\n', '0 0 2 0 0 2\n']
+  ps = fvr.geom2d.parse_polygons(iter(lines), dtype=np.float32)
+  np.testing.assert_equal(len(ps), 701)
+  np.testing.assert_equal(ps.coords.dtype, np.float32)
+  np.testing.assert_equal(ps.areas[[0, -1]], [1, 2])
+  np.testing.assert_equal(len(fvr.geom2d.parse_polygons('')), 0)
+
+def test_vertexarray_transform():
+  pts = np.array([[1., 2.], [3., -1.], [0., 0.]])
+  va = fvr.geom2d.VertexArray(pts)
+  va.translate(1, 2).rotate(np.pi / 2, center=(1, 1)).scale(2, 3).mirror()
+  # same steps point by point
+  expected = []
+  for x, y in pts:
+    x, y = x + 1, y + 2
+    x, y = 1 - (y - 1), 1 + (x - 1)
+    x, y = 2 * x, 3 * y
+    expected.append([x, -y])
+  np.testing.assert_allclose(va.xy, expected, atol=1e-12)
+  np.testing.assert_allclose(va.w, 1)
+  np.testing.assert_equal(va.matrix, np.eye(3), 'pending matrix not reset')
+
+def test_vertexarray_mirror_line():
+  va = fvr.geom2d.VertexArray([[2, 0], [0, 1]]).mirror(np.pi / 4)
+  np.testing.assert_allclose(va.xy, [[0, 2], [1, 0]], atol=1e-12)
+  va = fvr.geom2d.VertexArray([[3, 5]]).mirror(np.pi / 2, center=(1, 0))
+  np.testing.assert_allclose(va.xy, [[-1, 5]], atol=1e-12)
+
+def test_vertexarray_blocks():
+  va = fvr.geom2d.VertexArray(np.arange(20000.).reshape(-1, 2))
+  va.translate(1, -1)
+  np.testing.assert_equal(va.x, np.arange(0., 20000., 2) + 1)
+  np.testing.assert_equal(va[-1], fvr.geom2d.Vertex(19999, 19998))
+  np.testing.assert_equal(fvr.geom2d.Polygon(va).vertices, va.data)
+
+def test_polygon_contains():
+  # U-shape, concave
+  obj = fvr.geom2d.Polygon(
+    [[0, 0], [3, 0], [3, 3], [2, 3], [2, 1], [1, 1], [1, 3], [0, 3]])
+  points = [[0.5, 2], [1.5, 2], [2.5, 2], [1.5, 0.5], [-1, 0.5], [4, 4]]
+  np.testing.assert_equal(
+    obj.contains(points), [True, False, True, True, False, False])
+  np.testing.assert_equal(obj.contains([1.5, 0.5]), [True])
+  np.testing.assert_equal(fvr.geom2d.Polygon([]).contains(points), [False]*6)
+
+def test_polygonset_contains():
+  rng = np.random.default_rng(1)
+  polygons = [
+    [[0, 0], [3, 0], [3, 3], [2, 3], [2, 1], [1, 1], [1, 3], [0, 3]],
+    [],
+    [[2, 2], [5, 2], [2, 4]],
+    [[10, 10], [11, 10], [11, 11]]]
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  points = rng.uniform(-1, 6, (1000, 2))
+  expected = np.nonzero(
+    [fvr.geom2d.Polygon(i).contains(points) for i in polygons])
+  np.testing.assert_equal(ps.contains(points), expected)
+
+class TestPolygonIndex:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    rng = np.random.default_rng(2)
+    self.polygons = [
+      np.array([[0, 0], [1, 0], [0.5, 1]]) * rng.uniform(0.1, 2) +
+      rng.uniform(-50, 50, 2) for _ in range(300)]
+    self.obj = fvr.geom2d.PolygonIndex(self.polygons[:200], capacity=4)
+    for i in self.polygons[200:]:
+      self.obj.insert(i)
+
+  def test_trees(self):
+    assert len(self.obj) == 300
+    assert len(self.obj._trees) < 10
+
+  def test_capacity(self):
+    with pytest.raises(ValueError):
+      fvr.geom2d.PolygonIndex(self.polygons, capacity=1)
+    idx = fvr.geom2d.PolygonIndex(self.polygons, capacity=2)
+    np.testing.assert_equal(
+      idx.window(-10, -5, 20, 15), self.obj.window(-10, -5, 20, 15))
+
+  def test_window(self):
+    window = (-10, -5, 20, 15)
+    bounds = fvr.geom2d.PolygonSet.from_polygons(self.polygons).bounds
+    expected = np.flatnonzero(
+      (bounds[:, 0] <= 20) & (bounds[:, 2] >= -10) &
+      (bounds[:, 1] <= 15) & (bounds[:, 3] >= -5))
+    np.testing.assert_equal(self.obj.window(*window), expected)
+
+  def test_point(self):
+    x, y = self.polygons[250].mean(axis=0)
+    assert 250 in self.obj.point(x, y)
+
+  def test_nearest(self):
+    x, y = 3.3, -7.1
+    dist = [fvr.geom2d._distance(i, x, y) for i in self.polygons]
+    ids, d = self.obj.nearest(x, y, k=5)
+    np.testing.assert_equal(ids, np.argsort(dist, kind='stable')[:5])
+    np.testing.assert_allclose(d, np.sort(dist)[:5])
+
+def test_polygonset_take():
+  polygons = [
+    [[0, 0], [0, 1], [1, 1], [1, 0]], [], [[0, 0], [2, 0], [0, 2]]]
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  sub = ps.take([2, 0])
+  np.testing.assert_equal(sub.offsets, [0, 3, 7])
+  np.testing.assert_equal(sub.areas, [2, 1])
+  ps.areas
+  np.testing.assert_equal(ps.take([2, 1]).areas, [2, 0])
+
+@pytest.mark.parametrize('properties', [True, False])
+def test_polygonset_save_load(tmp_path, properties):
+  polygons = [
+    [[0, 0], [0, 1], [1, 1], [1, 0]], [], [[0, 0], [2, 0], [0, 2]]]
+  fvr.geom2d.PolygonSet.from_polygons(polygons, dtype=np.float32).save(
+    tmp_path, properties=properties)
+  ps = fvr.geom2d.PolygonSet.load(tmp_path)
+  assert not ps.coords.flags.writeable, 'coordinates not memory-mapped'
+  np.testing.assert_equal(ps.coords.dtype, np.float32)
+  assert ('section' in ps._cache) == properties
+  np.testing.assert_equal(ps[2].area, 2)
+  np.testing.assert_equal(ps[2].bounds, [0, 0, 2, 2])
+  np.testing.assert_equal(ps.areas, [1, 0, 2])
+  np.testing.assert_allclose(ps.Ix[0], 1 / 12)
+
+def _douglas_peucker(points, tolerance):
+  """Recursive reference of an open polyline."""
+  if len(points) < 3:
+    return list(range(len(points)))
+  dist = fvr.geom2d._segment_distance(points[1:-1], points[0], points[-1])
+  i = np.argmax(dist) + 1
+  if dist[i - 1] <= tolerance:
+    return [0, len(points) - 1]
+  left = _douglas_peucker(points[:i + 1], tolerance)
+  right = _douglas_peucker(points[i:], tolerance)
+  return left + [j + i for j in right[1:]]
+
+def _random_polygons(rng, n):
+  polygons = []
+  for _ in range(n):
+    m = rng.integers(0, 60)
+    phi = np.sort(rng.uniform(0, 2 * np.pi, m))
+    r = rng.uniform(0.8, 1.2, m)
+    polygons.append(np.stack([r * np.cos(phi), r * np.sin(phi)], axis=-1))
+  return polygons
+
+def test_simplify_douglas_peucker_open():
+  rng = np.random.default_rng(3)
+  polygons = _random_polygons(rng, 40)
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  res, error = ps.simplify(0.05, closed=False)
+  for i, (p, e) in enumerate(zip(polygons, error)):
+    np.testing.assert_equal(res[i].vertices, p[_douglas_peucker(p, 0.05)])
+    assert e <= 0.05
+
+def test_simplify_closed():
+  rng = np.random.default_rng(4)
+  polygons = _random_polygons(rng, 40)
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  for method, tolerance in [('douglas-peucker', 0.1), ('visvalingam', 0.01)]:
+    res, error = ps.simplify(tolerance, method=method)
+    assert len(res.coords) < len(ps.coords)
+    for i, p in enumerate(polygons):
+      q = res[i].vertices
+      assert len(q) >= min(len(p), 3)
+      # corners kept in order
+      rows = [np.flatnonzero((p == j).all(axis=1))[0] for j in q]
+      assert rows == sorted(rows)
+      if len(p) == len(q):
+        expected = 0
+      else:
+        expected = max(
+          np.min(fvr.geom2d._segment_distance(
+            j, q, np.roll(q, -1, axis=0))) for j in p)
+      assert error[i] >= expected - 1e-12
+      if method == 'douglas-peucker':
+        assert error[i] <= tolerance
+      elif len(q) > 3:
+        u, v = np.roll(q, -1, axis=0) - q, np.roll(q, 1, axis=0) - q
+        area = np.abs(u[:, 0] * v[:, 1] - u[:, 1] * v[:, 0]) / 2
+        assert area.min() >= tolerance
+
+def test_polygon_simplify():
+  obj = fvr.geom2d.Polygon([[0, 0], [1, 0.01], [2, 0], [2, 1], [0, 1]])
+  res, error = obj.simplify(0.1)
+  np.testing.assert_equal(res.vertices, [[0, 0], [2, 0], [2, 1], [0, 1]])
+  np.testing.assert_allclose(error, 0.01)
+  with pytest.raises(ValueError):
+    obj.simplify(0.1, method='unknown')
+
+def _monotone_chain(points):
+  """Sequential reference of the convex hull."""
+  points = sorted(map(tuple, points))
+  if len(points) <= 1:
+    return points
+  cross = lambda o, a, b: \
+    (a[0] - o[0]) * (b[1] - o[1]) - (a[1] - o[1]) * (b[0] - o[0])
+  lower, upper = [], []
+  for p in points:
+    while len(lower) >= 2 and cross(lower[-2], lower[-1], p) <= 0:
+      lower.pop()
+    lower.append(p)
+  for p in reversed(points):
+    while len(upper) >= 2 and cross(upper[-2], upper[-1], p) <= 0:
+      upper.pop()
+    upper.append(p)
+  return lower[:-1] + upper[:-1]
+
+def test_hull():
+  rng = np.random.default_rng(5)
+  polygons = [rng.integers(0, 10, (rng.integers(0, 30), 2)).astype(float)
+    for _ in range(50)] + [np.array([[1., 2.]])]
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  for i, p in enumerate(polygons):
+    expected = _monotone_chain(p)
+    np.testing.assert_equal(ps.hulls[i].vertices.reshape(-1, 2),
+      np.reshape(expected, (-1, 2)), f'incorrect hull {i}')
+    np.testing.assert_equal(fvr.geom2d.Polygon(p).hull.vertices.reshape(-1, 2),
+      np.reshape(expected, (-1, 2)), f'incorrect hull {i}')
+
+def test_obb():
+  rng = np.random.default_rng(6)
+  polygons = [rng.normal(size=(rng.integers(3, 40), 2)) * [3, 1]
+    for _ in range(50)]
+  ps = fvr.geom2d.PolygonSet.from_polygons(polygons)
+  obbs = ps.obbs
+  for p, obb in zip(polygons, obbs):
+    hull = fvr.geom2d.Polygon(p).hull.vertices
+    edges = np.roll(hull, -1, axis=0) - hull
+    u = edges / np.hypot(*edges.T)[:, None]
+    v = np.stack([-u[:, 1], u[:, 0]], axis=-1)
+    pu, pv = u @ hull.T, v @ hull.T
+    area = np.ptp(pu, axis=1) * np.ptp(pv, axis=1)
+    np.testing.assert_allclose(fvr.geom2d.Polygon(obb).area, area.min())
+    # all corners inside or on the rectangle
+    side = np.roll(obb, -1, axis=0) - obb
+    rel = p[:, None] - obb
+    assert np.all(side[:, 0] * rel[..., 1] - side[:, 1] * rel[..., 0] > -1e-9)
+  np.testing.assert_equal(
+    fvr.geom2d.Polygon(polygons[0]).obb.round(9), obbs[0].round(9))
+
+def test_hull_cache_invalidation():
+  obj = fvr.geom2d.Polygon([[0, 0], [1, 0], [0, 1]])
+  np.testing.assert_equal(obj.bounds, [0, 0, 1, 1])
+  np.testing.assert_equal(len(obj.hull.vertices), 3)
+  obj.vertices = [[0, 0], [2, 0], [2, 2], [0, 2]]
+  np.testing.assert_equal(obj.bounds, [0, 0, 2, 2])
+  np.testing.assert_equal(len(obj.hull.vertices), 4)
+  np.testing.assert_allclose(fvr.geom2d.Polygon(obj.obb).area, 4)
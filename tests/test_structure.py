@@ -1,6 +1,7 @@
 """Test of structure module.
 
 """
+import numpy as np
 import pytest
 import fvr.structure
 
@@ -26,8 +27,24 @@ class TestBeam:
   def test_m(self):
     assert self.obj.m == 60
 
+  def test_m_rho(self):
+    assert self.obj.m == 60
+    self.obj.rho = 10
+    assert self.obj.mu == 30
+    assert self.obj.m == 120
+
+  def test_slots(self):
+    with pytest.raises(AttributeError):
+      self.obj.h = 1
+
   def test_eigenfrequency(self):
-    assert self.obj.eigenfrequency(1) == 0.012770856732837836
+    # exact root a_1 L = 1.87510406871196... instead of 0.596864*pi
+    assert self.obj.eigenfrequency(1) == \
+      pytest.approx(0.01277086369505375, rel=1e-12)
+
+  def test_eigenfrequency_n4(self):
+    assert self.obj.eigenfrequency(4) == pytest.approx(
+      self.obj.eigenfrequency(1) * (10.995540734875467 / 1.8751040687119611)**2)
 
 class TestTubeBuckling:
   @pytest.fixture(autouse=True)
@@ -42,3 +59,435 @@ class TestTubeBuckling:
 
   def test_stress(self):
     assert self.obj.stress() == 0.46296296296296297
+
+@pytest.mark.parametrize('support, roots', [
+  ('fixed-free', [1.8751040687119611, 4.6940911329741745, 7.8547574382376126]),
+  ('free-fixed', [1.8751040687119611, 4.6940911329741745, 7.8547574382376126]),
+  ('fixed-fixed', [4.7300407448627040, 7.8532046240958376, 10.995607838001671]),
+  ('free-free', [4.7300407448627040, 7.8532046240958376, 10.995607838001671]),
+  ('fixed-pinned', [3.9266023120479187, 7.0685827456287260, 10.210176122813031]),
+  ('fixed-guided', [2.3650203724313520, 5.4978039190008360, 8.6393798286997420]),
+  ('pinned-pinned', [np.pi, 2 * np.pi, 3 * np.pi]),
+  ('pinned-guided', [np.pi / 2, 3 * np.pi / 2, 5 * np.pi / 2]),
+])
+def test_characteristic_roots(support, roots):
+  np.testing.assert_allclose(
+    fvr.structure.characteristic_roots([1, 2, 3], support), roots, rtol=1e-13)
+
+def test_characteristic_roots_high_modes():
+  n = np.arange(1, 201)
+  roots = fvr.structure.characteristic_roots(n)
+  assert np.all(np.isfinite(roots))
+  np.testing.assert_allclose(roots[10:], (2 * n[10:] - 1) * np.pi / 2,
+    rtol=1e-15)
+  np.testing.assert_allclose(
+    np.cos(roots) + 1 / np.cosh(np.minimum(roots, 700)), 0, atol=1e-12)
+
+def test_characteristic_roots_invalid():
+  with pytest.raises(ValueError):
+    fvr.structure.characteristic_roots(1, 'fixed-floating')
+  with pytest.raises(ValueError):
+    fvr.structure.characteristic_roots(0)
+
+class TestBeamArray:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.E = np.array([1, 2, 3])
+    self.L = np.array([[4], [5]])
+    self.obj = fvr.structure.Beam(self.E, 2, 3, self.L, 5)
+
+  def test_shape(self):
+    assert self.obj.shape == (2, 3)
+
+  def test_m(self):
+    np.testing.assert_equal(self.obj.m, 15 * self.L)
+
+  def test_eigenfrequency(self):
+    n = np.array([1, 2, 3])
+    res = self.obj.eigenfrequency(n)
+    assert res.shape == (3, 2, 3)
+    for i in n:
+      for j, L in enumerate(self.L[:, 0]):
+        for k, E in enumerate(self.E):
+          np.testing.assert_allclose(
+            res[i - 1, j, k],
+            fvr.structure.Beam(E, 2, 3, L, 5).eigenfrequency(i))
+
+class TestBeamFE:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.beam = fvr.structure.Beam(210e9, 1e-8, 1e-4, 2, 7850)
+    self.obj = fvr.structure.BeamFE(210e9, 1e-8, 1e-4, 7850, 2, n=200)
+
+  @pytest.mark.parametrize('support', [
+    'fixed-free', 'fixed-fixed', 'free-free', 'fixed-pinned', 'pinned-free',
+    'fixed-guided', 'pinned-pinned', 'guided-guided', 'pinned-guided'])
+  def test_eigenfrequency(self, support):
+    n = np.arange(1, 5)
+    np.testing.assert_allclose(
+      self.obj.eigenfrequency(n, support),
+      self.beam.eigenfrequency(n, support), rtol=1e-7)
+
+  def test_modes(self):
+    f, w = self.obj.modes(3)
+    assert w.shape == (3, 201)
+    np.testing.assert_equal(w[:, 0], 0)
+    assert np.all(w[:, -1] > 0)
+
+  def test_deflection(self):
+    E, I, L, q, F = 210e9, 1e-8, 2, 10, 3
+    w, theta = self.obj.deflection(q)
+    np.testing.assert_allclose(w[-1], q * L**4 / (8 * E * I))
+    np.testing.assert_allclose(theta[-1], q * L**3 / (6 * E * I))
+    Fn = np.zeros(201)
+    Fn[-1] = F
+    w, _ = self.obj.deflection(F=Fn)
+    np.testing.assert_allclose(w[-1], F * L**3 / (3 * E * I))
+    w, _ = self.obj.deflection(q, support='pinned-pinned')
+    np.testing.assert_allclose(w[100], 5 * q * L**4 / (384 * E * I))
+
+  def test_profile(self):
+    # stepped beam, profile function and per element arrays agree
+    I = lambda x: np.where(x < 1, 2e-8, 1e-8)
+    fe = fvr.structure.BeamFE(210e9, I, 1e-4, 7850, 2, n=200)
+    Ie = I((fe.x[:-1] + fe.x[1:]) / 2)
+    fe2 = fvr.structure.BeamFE(210e9, Ie, 1e-4, 7850, fe.le)
+    np.testing.assert_allclose(
+      fe.eigenfrequency([1, 2]), fe2.eigenfrequency([1, 2]), rtol=1e-12)
+    f1 = self.obj.eigenfrequency(1)
+    assert f1 < fe.eigenfrequency(1) < f1 * np.sqrt(2)
+
+  def test_fine_mesh(self):
+    fe = fvr.structure.BeamFE(210e9, 1e-8, 1e-4, 7850, 2, n=20000)
+    np.testing.assert_allclose(
+      fe.eigenfrequency([1, 2, 3]), self.beam.eigenfrequency([1, 2, 3]),
+      rtol=1e-7)
+
+class TestTubeBucklingSet:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.tubes = [
+      fvr.structure.TubeBuckling(1, 0.2, 3, h=4),
+      fvr.structure.TubeBuckling(2, 0.3, 5, q=0.5),
+      fvr.structure.TubeBuckling(3, 0.25, 2, s=0.1, h=1),
+      fvr.structure.TubeBuckling(1, 0.3, 1)]
+    self.obj = fvr.structure.TubeBucklingSet.from_tubes(self.tubes)
+
+  @pytest.mark.parametrize('method', ['force', 'pressure', 'stress'])
+  def test_h(self, method):
+    result = getattr(self.obj, method)()
+    np.testing.assert_equal(result.mask, [False, True, False, True])
+    for tube, value, masked in zip(self.tubes, result.data, result.mask):
+      if not masked:
+        assert value == pytest.approx(getattr(tube, method)(), rel=1e-15)
+
+  def test_thickness(self):
+    h = self.obj.thickness()
+    np.testing.assert_equal(h.mask, [False, False, False, True])
+    np.testing.assert_allclose(
+      h.compressed(), [i.thickness() for i in self.tubes[:3]], rtol=1e-15)
+
+  def test_inverse(self):
+    tubes = fvr.structure.TubeBucklingSet(
+      [1, 2], 0.3, [3, 4], h=[0.5, 0.1])
+    q = fvr.structure.TubeBucklingSet(
+      tubes.E, tubes.nu, tubes.r, q=tubes.pressure()).thickness_pressure()
+    s = fvr.structure.TubeBucklingSet(
+      tubes.E, tubes.nu, tubes.r, s=tubes.stress()).thickness_stress()
+    np.testing.assert_allclose(q, tubes.h, rtol=1e-14)
+    np.testing.assert_allclose(s, tubes.h, rtol=1e-14)
+
+  def test_broadcast(self):
+    tubes = fvr.structure.TubeBucklingSet(1, 0.2, [[3], [6]], h=[1, 2, 4])
+    assert tubes.shape == (2, 3)
+    assert not tubes.force().mask.any()
+
+class TestPlateSlots:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.obj = fvr.structure.Plate(12, 0.5, 2, 1)
+
+  def test_D(self):
+    assert self.obj.D == pytest.approx(4 / 3)
+    self.obj.h = 2
+    assert self.obj.D == pytest.approx(32 / 3)
+    self.obj.nu = 0
+    assert self.obj.D == pytest.approx(8)
+    with pytest.raises(AttributeError):
+      self.obj.r = 1
+
+class TestPlate:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.obj = fvr.structure.Plate(
+      210e9, np.array([0.25, 0.3]), np.array([[0.1], [0.2]]), 2e-3)
+
+  @pytest.mark.parametrize('support', ['clamped', 'simple'])
+  def test_deflection_field(self, support):
+    r = np.linspace(0, 0.1, 5)
+    w = self.obj.deflection_field(1e5, r, support)
+    assert w.shape == (2, 2, 5)
+    np.testing.assert_allclose(
+      w[..., 0], self.obj.deflection(1e5, support), rtol=1e-14)
+    np.testing.assert_allclose(w[0, :, -1], 0, atol=1e-18)
+
+  def test_batch(self):
+    q = np.array([[1e5], [2e5]])
+    r = np.linspace(0, 0.1, 4)
+    w = self.obj.deflection_field(q, r, 'simple')
+    for i in range(2):
+      for j in range(2):
+        plate = fvr.structure.Plate(
+          210e9, self.obj.nu[j], self.obj.ra[i, 0], 2e-3)
+        np.testing.assert_allclose(
+          w[i, j], plate.deflection_field(q[i, 0], r, 'simple'), rtol=1e-14)
+
+  @pytest.mark.parametrize('support', ['clamped', 'simple'])
+  def test_moments(self, support):
+    # moments are consistent with the curvatures of the deflection
+    r = np.linspace(0.01, 0.09, 9)
+    plate = fvr.structure.Plate(210e9, 0.3, 0.1, 2e-3)
+    D, nu, q = plate.D, 0.3, 1e5
+    dr = 1e-6
+    w = lambda r: plate.deflection_field(q, r, support)
+    dw = (w(r + dr) - w(r - dr)) / (2 * dr)
+    d2w = (w(r + dr) - 2 * w(r) + w(r - dr)) / dr**2
+    Mr, Mt = plate.moments(q, r, support)
+    np.testing.assert_allclose(Mr, -D * (d2w + nu * dw / r), rtol=1e-4)
+    np.testing.assert_allclose(Mt, -D * (dw / r + nu * d2w), rtol=1e-4)
+    if support == 'clamped':
+      np.testing.assert_allclose(
+        plate.moments(q, 0.1, support)[0], -q * 0.1**2 / 8)
+    else:
+      np.testing.assert_allclose(
+        plate.moments(q, 0.1, support)[0], 0, atol=1e-12)
+
+  def test_stresses(self):
+    sr, st = self.obj.stresses(1e5, [0], 'simple')
+    np.testing.assert_allclose(
+      sr[..., 0], 3 * (3 + self.obj.nu) * 1e5 * self.obj.ra**2 / (8 * 2e-3**2))
+    np.testing.assert_allclose(sr, st)
+    with pytest.raises(ValueError):
+      self.obj.stresses(1e5, [0], 'free')
+
+  def test_stresses_batched(self):
+    plate = fvr.structure.Plate(210e9, 0.3, np.array([0.1, 0.2]), 2e-3)
+    q = np.array([[1e5], [2e5], [3e5]])
+    r = [0, 0.05, 0.1]
+    sr, st = plate.stresses(q, r)
+    assert sr.shape == st.shape == (3, 2, 3)
+    for k in range(3):
+      np.testing.assert_allclose(sr[k], plate.stresses(q[k, 0], r)[0])
+      np.testing.assert_allclose(st[k], plate.stresses(q[k, 0], r)[1])
+
+class TestSweep:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.grid = dict(E=210e9, I=np.linspace(1e-8, 4e-8, 7), A=1e-4,
+      L=np.linspace(0.5, 2, 11), rho=[7800, 7850])
+    beam = fvr.structure.Beam(
+      210e9, self.grid['I'][:, None, None], 1e-4,
+      self.grid['L'][:, None], np.array(self.grid['rho']))
+    self.expected = beam.eigenfrequency(2)
+
+  @pytest.mark.parametrize('processes', [0, 2])
+  def test_grid(self, processes):
+    f = fvr.structure.sweep(fvr.structure.Beam, 'eigenfrequency', self.grid,
+      args=(2,), chunk=10, processes=processes)
+    assert f.shape == (7, 11, 2)
+    np.testing.assert_allclose(f, self.expected, rtol=1e-14)
+
+  def test_constants(self):
+    f = fvr.structure.sweep(fvr.structure.Beam, 'eigenfrequency',
+      dict(E=210e9, I=1e-8, A=1e-4, L=1, rho=7800), args=(2,), processes=0)
+    assert f.shape == (1,)
+    np.testing.assert_allclose(
+      f, fvr.structure.Beam(210e9, 1e-8, 1e-4, 1, 7800).eigenfrequency(2))
+
+  def test_table(self):
+    table = dict(E=1, nu=0.2, r=3, h=[4, np.nan], q=[np.nan, 0.5])
+    h = fvr.structure.sweep(
+      fvr.structure.TubeBuckling, 'thickness', table=table, processes=0)
+    np.testing.assert_allclose(
+      h, fvr.structure.TubeBucklingSet(**table).thickness())
+    q = fvr.structure.sweep(
+      fvr.structure.TubeBuckling, 'pressure', table=table, processes=0)
+    np.testing.assert_equal(np.isnan(q), [False, True])
+    m = fvr.structure.sweep(
+      fvr.structure.Beam, 'm', table=dict(E=1, I=1, A=[1, 2], L=3, rho=4),
+      processes=0)
+    np.testing.assert_equal(m, [12, 24])
+
+  def test_resume(self, tmp_path):
+    kwargs = dict(args=(2,), chunk=10, path=tmp_path, processes=2)
+    f = fvr.structure.sweep(
+      fvr.structure.Beam, 'eigenfrequency', self.grid, **kwargs)
+    np.testing.assert_allclose(f, self.expected, rtol=1e-14)
+    # interrupted run: chunk 3 unfinished, finished chunks are not repeated
+    done = np.load(tmp_path / 'done.npy', mmap_mode='r+')
+    done[3] = False
+    done.flush()
+    f.reshape(-1)[:] = -1
+    f.flush()
+    del done, f
+    f = fvr.structure.sweep(
+      fvr.structure.Beam, 'eigenfrequency', self.grid, **kwargs)
+    np.testing.assert_allclose(
+      f.reshape(-1)[30:40], self.expected.reshape(-1)[30:40], rtol=1e-14)
+    np.testing.assert_equal(f.reshape(-1)[:30], -1)
+    assert np.load(tmp_path / 'done.npy').all()
+    with pytest.raises(ValueError):
+      fvr.structure.sweep(
+        fvr.structure.Beam, 'eigenfrequency', dict(self.grid, A=[1, 2]),
+        **kwargs)
+
+  @pytest.mark.parametrize('change', [
+    dict(grid=dict(A=2e-4)), dict(grid=dict(rho=[7800, 7900])),
+    dict(args=(3,)), dict(chunk=20), dict(method='m', args=())])
+  def test_resume_other(self, tmp_path, change):
+    kwargs = dict(
+      method='eigenfrequency', args=(2,), chunk=10, path=tmp_path,
+      processes=0)
+    fvr.structure.sweep(fvr.structure.Beam, grid=self.grid, **kwargs)
+    # same shape, other values
+    grid = dict(self.grid, **change.pop('grid', {}))
+    with pytest.raises(ValueError):
+      fvr.structure.sweep(
+        fvr.structure.Beam, grid=grid, **dict(kwargs, **change))
+
+class TestSizing:
+  def test_minimum_size(self):
+    target = np.array([[0.5, 2, 100], [1e-9, 3, -1]])
+    x = fvr.structure.minimum_size(
+      [lambda x: x**3 - target, lambda x: x - 1], 0.01, 1)
+    np.testing.assert_allclose(
+      x, np.maximum(np.cbrt(np.maximum(target, 1e-6)), 1), rtol=1e-11)
+    x = fvr.structure.minimum_size(lambda x: -np.ones_like(x), 1, 2)
+    assert np.isnan(x)
+
+  def test_beam(self):
+    beam = fvr.structure.Beam(210e9, 1e-8, 1e-4, np.array([[1], [2]]), 7850)
+    f1 = np.array([10, 50, 200])
+    c, m = fvr.structure.size_beam(beam, f1, support='pinned-pinned')
+    assert c.shape == (2, 3)
+    # f1 grows linear with the scaling of similar sections
+    np.testing.assert_allclose(
+      c, f1 / beam.eigenfrequency(1, 'pinned-pinned'), rtol=1e-11)
+    np.testing.assert_allclose(m, beam.m * c**2)
+
+  def test_tube(self):
+    q_cr = np.array([1e5, 1e6, 1e7])
+    h, m = fvr.structure.size_tube(210e9, 0.3, 7850, 0.05, 2, q_cr=q_cr)
+    np.testing.assert_allclose(
+      h, fvr.structure.TubeBucklingSet(210e9, 0.3, 0.05, q=q_cr).thickness(),
+      rtol=1e-11)
+    h, _ = fvr.structure.size_tube(
+      210e9, 0.3, 7850, 0.05, 2, f1=[1, 30], q_cr=1e5)
+    assert h[0] == pytest.approx(fvr.structure.size_tube(
+      210e9, 0.3, 7850, 0.05, 2, q_cr=1e5)[0])
+    beam = fvr.structure.Beam(210e9, np.pi * 0.05 * h[1] * (0.05**2 +
+      h[1]**2 / 4), 2 * np.pi * 0.05 * h[1], 2, 7850)
+    assert beam.eigenfrequency(1) == pytest.approx(30, rel=1e-10)
+    with pytest.raises(ValueError):
+      fvr.structure.size_tube(210e9, 0.3, 7850, 0.05, 2)
+
+  @pytest.mark.parametrize('support', ['clamped', 'simple'])
+  def test_plate(self, support):
+    w_max = np.array([1e-4, 1e-3])
+    h, m = fvr.structure.size_plate(
+      210e9, 0.3, 7850, [[0.1], [0.2]], 1e5, w_max, support)
+    plate = fvr.structure.Plate(210e9, 0.3, np.array([[0.1], [0.2]]), h)
+    np.testing.assert_allclose(
+      plate.deflection(1e5, support), np.broadcast_to(w_max, (2, 2)),
+      rtol=1e-11)
+
+@pytest.mark.parametrize('support', [
+  'fixed-free', 'free-fixed', 'fixed-fixed', 'free-free', 'fixed-pinned',
+  'pinned-free', 'fixed-guided', 'free-guided', 'pinned-pinned',
+  'guided-guided', 'pinned-guided'])
+def test_mode_shapes(support):
+  # orthonormal by Gauss-Legendre quadrature on 64 panels
+  n = np.array([1, 2, 3, 10, 40])
+  t, w = np.polynomial.legendre.leggauss(32)
+  edges = np.linspace(0, 1, 65)
+  xi = ((edges[:-1, None] + edges[1:, None]) / 2 + t / 128).ravel()
+  weights = np.tile(w / 128, 64)
+  phi = fvr.structure.mode_shapes(n, xi, support)
+  np.testing.assert_allclose((phi * weights) @ phi.T, np.eye(5), atol=1e-10)
+  # end conditions
+  ends = fvr.structure.mode_shapes(n, [0, 1], support)
+  for end, value in zip(support.split('-'), ends.T):
+    if end in ('fixed', 'pinned'):
+      np.testing.assert_allclose(value, 0, atol=1e-12)
+    if end == 'free':
+      np.testing.assert_allclose(np.abs(value), 2, rtol=1e-12)
+
+def test_mode_shapes_high_modes():
+  xi = np.linspace(0, 1, 101)
+  phi = fvr.structure.mode_shapes(np.arange(1, 501), xi)
+  assert np.all(np.isfinite(phi))
+  assert np.abs(phi).max() == pytest.approx(2)
+  # far from the ends the shapes are +-(sin(b xi) - cos(b xi))
+  b = fvr.structure.characteristic_roots(500)
+  inner = np.sin(b * xi[10:91]) - np.cos(b * xi[10:91])
+  np.testing.assert_allclose(
+    np.abs(phi[-1, 10:91] @ inner) / (inner @ inner), 1, rtol=1e-12)
+  np.testing.assert_allclose(np.abs(phi[-1, 10:91]), np.abs(inner), atol=1e-12)
+
+def test_mode_shapes_cache():
+  xi = np.linspace(0, 1, 11)
+  phi = fvr.structure.mode_shapes([1, 2], xi, 'fixed-fixed')
+  assert fvr.structure.mode_shapes([1, 2], xi.copy(), 'fixed-fixed') is phi
+  assert not phi.flags.writeable
+  assert fvr.structure.mode_shapes([1, 2], xi, 'fixed-free') is not phi
+  with pytest.raises(ValueError):
+    fvr.structure.mode_shapes(1, xi, 'fixed-clamped')
+
+def test_mode_shape_fe():
+  fe = fvr.structure.BeamFE(210e9, 1e-8, 1e-4, 7850, 2, n=200)
+  beam = fvr.structure.Beam(210e9, 1e-8, 1e-4, 2, 7850)
+  _, w = fe.modes(4)
+  np.testing.assert_allclose(
+    beam.mode_shape(np.arange(1, 5), fe.x / fe.L), w, atol=1e-6)
+
+class TestTransient:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.obj = fvr.structure.Beam(210e9, 1e-8, 1e-4, 1, 7850)
+
+  @pytest.mark.parametrize('zeta', [0, 0.05])
+  def test_ramp(self, zeta):
+    # exact response of one mode to a linear load
+    t = np.arange(1000) * 1e-3
+    w, _ = next(self.obj.transient(t, 1e-3, modes=1, zeta=zeta))
+    omega = 2 * np.pi * self.obj.eigenfrequency(1)
+    wd = omega * np.sqrt(1 - zeta**2)
+    phi = self.obj.mode_shape(1, 1.)
+    expected = phi**2 / omega**2 * (t - 2 * zeta / omega + np.exp(
+      -zeta * omega * t) * (2 * zeta / omega * np.cos(wd * t) -
+      (1 - 2 * zeta**2) / wd * np.sin(wd * t)))
+    np.testing.assert_allclose(w[:, 0], expected, atol=1e-15)
+
+  def test_static(self):
+    F = 10
+    w, M = next(self.obj.transient(
+      np.full(20000, F), 1e-3, zeta=0.1, deflection_at=[0.5, 1],
+      moment_at=[0, 0.5]))
+    x = np.array([0.5, 1])
+    np.testing.assert_allclose(
+      w[-1], F * x**2 * (3 - x) / (6 * 210e9 * 1e-8), rtol=1e-4)
+    # moments converge slower with the number of modes
+    np.testing.assert_allclose(M[-1], F * (1 - np.array([0, 0.5])), rtol=5e-3)
+
+  def test_chunks(self):
+    rng = np.random.default_rng(0)
+    F = rng.normal(size=5000)
+    w, M = map(np.concatenate, zip(*self.obj.transient(F, 1e-4, chunk=777)))
+    bounds = np.sort(rng.choice(5000, 20, replace=False))
+    w2, M2 = map(np.concatenate, zip(*self.obj.transient(
+      iter(np.split(F, bounds)), 1e-4)))
+    w1, M1 = next(self.obj.transient(F, 1e-4, chunk=5000))
+    assert w.shape == (5000, 1)
+    np.testing.assert_allclose(w, w1, rtol=1e-12, atol=1e-20)
+    np.testing.assert_allclose(w2, w1, rtol=1e-12, atol=1e-20)
+    np.testing.assert_allclose(M2, M1, rtol=1e-12, atol=1e-12)
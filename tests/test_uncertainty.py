@@ -0,0 +1,96 @@
+"""Test of uncertainty module.
+
+"""
+import numpy as np
+import pytest
+import fvr.structure
+import fvr.uncertainty
+
+def test_ndtri():
+  p = np.array([1e-12, 1e-6, 0.001, 0.02425, 0.3, 0.5, 0.9, 0.99, 1 - 1e-9])
+  x = fvr.uncertainty.ndtri(p)
+  np.testing.assert_allclose(
+    x, [-7.034483825301131, -4.753424308822899, -3.090232306167814,
+      -1.972961048, -0.524400512708041, 0, 1.281551565544601,
+      2.326347874040841, 5.997807015007882], rtol=1e-5, atol=1e-12)
+  # central region
+  np.testing.assert_allclose(
+    x[3:7], [-1.972961048, -0.524400513, 0, 1.281551566], rtol=2e-9)
+  p = np.linspace(1e-6, 1, 10001)[:-1]
+  assert np.all(np.diff(fvr.uncertainty.ndtri(p)) > 0)
+
+@pytest.mark.parametrize('method', ['mc', 'lhs'])
+def test_sample(method):
+  u = fvr.uncertainty.sample(1000, 3, method, np.random.default_rng(0))
+  assert u.shape == (3, 1000)
+  assert np.all((u >= 0) & (u < 1))
+  if method == 'lhs':
+    np.testing.assert_equal(
+      np.sort(np.floor(u * 1000), axis=1), np.tile(np.arange(1000), (3, 1)))
+  with pytest.raises(ValueError):
+    fvr.uncertainty.sample(10, 1, 'sobol')
+
+def test_moments():
+  rng = np.random.default_rng(1)
+  values = rng.normal(1e9, 1, 100_000)
+  moments = fvr.uncertainty.Moments()
+  for chunk in np.array_split(values, 37):
+    moments.update(chunk)
+  assert moments.count == 100_000
+  assert moments.mean == pytest.approx(values.mean(), rel=1e-15)
+  assert moments.var == pytest.approx(values.var(ddof=1), rel=1e-8)
+  assert (moments.min, moments.max) == (values.min(), values.max())
+
+def test_quantile_sketch():
+  rng = np.random.default_rng(2)
+  values = rng.lognormal(size=1_000_000)
+  sketch = fvr.uncertainty.QuantileSketch()
+  for chunk in np.array_split(values, 100):
+    sketch.update(chunk)
+  assert len(sketch.means) <= 200
+  assert sketch.weights.sum() == len(values)
+  q = np.array([1e-4, 0.01, 0.1, 0.5, 0.9, 0.99, 0.9999])
+  # rank error
+  ranks = np.searchsorted(np.sort(values), sketch.quantile(q)) / len(values)
+  np.testing.assert_allclose(ranks, q, rtol=0.02, atol=2e-5)
+
+class TestPropagate:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    self.parameters = dict(
+      a=fvr.uncertainty.Normal(1, 1), b=fvr.uncertainty.Normal(0, 2),
+      c=fvr.uncertainty.Uniform(0, 1), d=3.)
+
+  @pytest.mark.parametrize('method', ['mc', 'lhs'])
+  def test_linear(self, method):
+    res = fvr.uncertainty.propagate(
+      lambda a, b, c, d: a + b + d, self.parameters, 400_000, method=method,
+      chunk=30_000, failure=lambda y: y < 0, seed=3)
+    assert res.count == 400_000
+    assert res.mean == pytest.approx(4, abs=0.02)
+    assert res.std == pytest.approx(np.sqrt(5), rel=0.01)
+    # P(N(4, 5) < 0)
+    assert res.pf == pytest.approx(0.036819135, abs=4 * res.pf_error)
+    np.testing.assert_allclose(
+      res.quantile([0.05, 0.5, 0.95]), 4 + np.sqrt(5) * np.array(
+        [-1.644853627, 0, 1.644853627]), atol=0.03)
+    s = res.sensitivity
+    assert list(s) == ['a', 'b', 'c']
+    np.testing.assert_allclose([s['a'], s['b'], s['c']], [0.2, 0.8, 0],
+      atol=0.01)
+
+  def test_masked(self):
+    res = fvr.uncertainty.propagate(
+      lambda E, r, h: fvr.structure.TubeBucklingSet(
+        E, 0.3, r, h=np.where(h < 0, np.nan, h)).pressure(),
+      dict(E=210e9, r=0.05, h=fvr.uncertainty.Normal(1e-3, 1e-3)), 10_000,
+      seed=4)
+    assert res.invalid == pytest.approx(1587, abs=150)
+    assert res.moments.count == res.count - res.invalid
+    assert res.moments.min > 0
+
+  def test_lognormal(self):
+    u = np.linspace(0.0005, 0.9995, 1000)
+    x = fvr.uncertainty.LogNormal(10, 2).ppf(u)
+    assert x.mean() == pytest.approx(10, rel=1e-3)
+    assert x.std() == pytest.approx(2, rel=2e-2)
@@ -0,0 +1,138 @@
+"""Test of wire module.
+
+"""
+import numpy as np
+import pytest
+import fvr.wire
+
+def test_awg_number():
+  np.testing.assert_equal(
+    fvr.wire.awg_number(['0000', '000', '00', '0', '1/0', '4/0', '36', '0.5']),
+    [-3, -2, -1, 0, 0, -3, 36, 0.5])
+  np.testing.assert_equal(fvr.wire.awg_number([[1, 2]]), [[1, 2]])
+  with pytest.raises(ValueError):
+    fvr.wire.awg_number(['12', 'AWG'])
+
+def test_awg_table():
+  gauges = ['0000', '00', 0, 10, 24, 36, 56]
+  np.testing.assert_allclose(
+    fvr.wire.awg_diameter(gauges),
+    [fvr.wire.awg(i).diameter for i in gauges],
+    rtol=1e-15)
+  np.testing.assert_allclose(fvr.wire.awg_diameter(36), 0.127)
+  np.testing.assert_allclose(fvr.wire.awg_diameter('0000'), 0.46 * 25.4,
+    rtol=1e-15)
+  np.testing.assert_allclose(
+    fvr.wire.awg_area(gauges), np.pi / 4 * fvr.wire.awg_diameter(gauges)**2)
+  np.testing.assert_allclose(
+    fvr.wire.awg_resistance(gauges, 0.02), 0.02 / fvr.wire.awg_area(gauges))
+  for i in [57, -4, 10.25, np.nan]:
+    with pytest.raises(ValueError):
+      fvr.wire.awg_diameter(i)
+
+def test_awg_select():
+  rng = np.random.default_rng(0)
+  area = 10**rng.uniform(-4, 2.5, 10000)
+  for half in (False, True):
+    gauges = fvr.wire.awg_select(area, half=half)
+    ok = ~np.isnan(gauges)
+    assert np.all(fvr.wire.awg_area(gauges[ok]) >= area[ok])
+    # the next thinner gauge is too small
+    thinner = gauges[ok] + (0.5 if half else 1)
+    assert np.all(
+      (thinner > 56) | (fvr.wire.awg_area(np.minimum(thinner, 56)) < area[ok]))
+    assert np.all(area[~ok] > fvr.wire.awg_area('0000'))
+  np.testing.assert_equal(fvr.wire.awg_select(fvr.wire.awg_area(12)), 12)
+  np.testing.assert_equal(
+    fvr.wire.awg_select(current=[3, 30], current_density=3),
+    fvr.wire.awg_select([1, 10]))
+  with pytest.raises(ValueError):
+    fvr.wire.awg_select()
+
+class TestHarness:
+  @pytest.fixture(autouse=True)
+  def obj(self):
+    # random tree with a few loops, supply at node 0
+    rng = np.random.default_rng(1)
+    n = 300
+    tree = np.stack([rng.integers(0, np.arange(1, n)), np.arange(1, n)], 1)
+    loops = rng.integers(0, n, (20, 2))
+    loops = loops[loops[:, 0] != loops[:, 1]]
+    self.branches = np.concatenate([tree, loops])
+    m = len(self.branches)
+    self.gauges = rng.choice([14, 16, 18, 20, 22], m).astype(float)
+    self.lengths = rng.uniform(0.1, 3, m)
+    self.temperatures = rng.uniform(-20, 80, m)
+    self.loads = rng.uniform(0, 0.5, (n, 6)) * (rng.random((n, 1)) < 0.3)
+    self.obj = fvr.wire.Harness(
+      n, self.branches, self.gauges, self.lengths, self.temperatures,
+      voltage=13.5)
+
+  def check(self, net, loads):
+    # Kirchhoff's current law at every node
+    v, i = net.solve(loads)
+    a, b = self.branches.T
+    balance = np.zeros_like(loads)
+    np.add.at(balance, a, -i)
+    np.add.at(balance, b, i)
+    np.testing.assert_allclose(balance[1:], loads[1:], atol=1e-9)
+    np.testing.assert_allclose(v[0], 13.5)
+    np.testing.assert_allclose(i, (v[a] - v[b]) / net.resistances[:, None])
+    return v, i
+
+  def test_series(self):
+    net = fvr.wire.Harness(
+      3, [[0, 1], [1, 2]], [10, 10], [1, 3], [20, 70], voltage=24)
+    r = fvr.wire.COPPER / fvr.wire.awg_area(10) * np.array(
+      [1, 3 * (1 + 0.00393 * 50)])
+    v, i = net.solve([0, 0, 5])
+    np.testing.assert_allclose(v, 24 - 5 * np.cumsum([0, *r]))
+    np.testing.assert_allclose(i, [5, 5])
+
+  def test_cases(self):
+    v, i = self.check(self.obj, self.loads)
+    assert v.shape == self.loads.shape
+    for k in range(self.loads.shape[1]):
+      vk, ik = self.obj.solve(self.loads[:, k])
+      np.testing.assert_allclose(vk, v[:, k])
+
+  def test_update(self):
+    gauges = self.gauges.copy()
+    # branch 0 connects the supply node 0
+    assert self.branches[0, 0] == 0
+    gauges[[0, 3, 50, 100, 200]] = [8, 10, 12, 24, 26]
+    self.obj.gauges = gauges
+    assert len(self.obj._updates) == 5
+    fresh = fvr.wire.Harness(
+      300, self.branches, gauges, self.lengths, self.temperatures,
+      voltage=13.5)
+    np.testing.assert_allclose(
+      self.obj.solve(self.loads)[0], fresh.solve(self.loads)[0], rtol=1e-12)
+    self.check(self.obj, self.loads)
+
+  @pytest.mark.parametrize('half', [False, True])
+  def test_resize(self, half):
+    budget = 0.5
+    v, _ = self.obj.solve(self.loads)
+    assert 13.5 - v.min() > budget
+    gauges = self.obj.resize(self.loads, budget, half=half)
+    assert np.all(gauges <= self.gauges)
+    fresh = fvr.wire.Harness(
+      300, self.branches, gauges, self.lengths, self.temperatures,
+      voltage=13.5)
+    v, _ = self.check(fresh, self.loads)
+    assert 13.5 - v.min() <= budget
+    np.testing.assert_allclose(self.obj.solve(self.loads)[0], v, rtol=1e-12)
+
+  @pytest.mark.parametrize('refactor', [1, 4, 1000])
+  def test_resize_refactor(self, refactor):
+    # enlarges the branch of the supply node
+    net = fvr.wire.Harness(
+      3, [[0, 1], [1, 2]], [26, 26], [5, 1], voltage=12, refactor=refactor)
+    gauges = net.resize([0, 0, 2], 0.5)
+    assert gauges[0] < 26
+    fresh = fvr.wire.Harness(3, [[0, 1], [1, 2]], gauges, [5, 1], voltage=12)
+    v, i = fresh.solve([0, 0, 2])
+    assert 0.4 < 12 - v[2] <= 0.5
+    np.testing.assert_allclose(net.solve([0, 0, 2])[0], v, rtol=1e-12)
+    np.testing.assert_allclose(i, [2, 2])